@@ -0,0 +1,252 @@
+"""End-to-end benchmark: the whole viewer, headless, against a local fake YouTube.
+
+Usage:
+    python benchmarks/bench_app.py [--sizes 100,1000,10000] [--latency 30] [--failure-rate 0.01] [--warm]
+
+For each size a synthetic library is generated, and a fresh viewer process
+(QT_QPA_PLATFORM=offscreen, empty caches) loads it from the stand-in server
+in fake_youtube.py. Reported per run: scan time, time to first thumbnail,
+full-load time, search keystroke latency, resize tick / settle latency and
+peak RSS. With --warm each library is loaded a second time on the same
+caches; --instrument adds the per-stage histograms of instrumentation.py.
+Results are written to benchmarks/results/<timestamp>-<commit>.json.
+"""
+import argparse
+import json
+import os
+import resource
+import shutil
+import subprocess
+import sys
+import tempfile
+import time
+from datetime import datetime
+
+BENCH_DIR = os.path.dirname(os.path.abspath(__file__))
+REPO_DIR = os.path.dirname(BENCH_DIR)
+sys.path.insert(0, REPO_DIR)
+sys.path.insert(0, BENCH_DIR)
+
+RESULTS_DIR = os.path.join(BENCH_DIR, "results")
+SEARCH_TEXT = "テスト動画 第12"
+RESIZE_WIDTHS = list(range(200, 401, 10))
+
+def percentiles(samples):
+    samples = sorted(samples)
+    if not samples:
+        return {"p50_ms": 0.0, "p95_ms": 0.0, "max_ms": 0.0}
+    pick = lambda fraction: samples[min(len(samples) - 1, int(fraction * len(samples)))]
+    return {
+        "p50_ms": round(pick(0.5) * 1000, 2),
+        "p95_ms": round(pick(0.95) * 1000, 2),
+        "max_ms": round(samples[-1] * 1000, 2),
+    }
+
+def peak_rss_bytes():
+    peak = resource.getrusage(resource.RUSAGE_SELF).ru_maxrss
+    return peak if sys.platform == "darwin" else peak * 1024
+
+def wait_until(predicate, timeout):
+    """Runs the event loop until predicate() holds; False on timeout."""
+    from PyQt5.QtCore import QEventLoop, QTimer
+
+    if predicate():
+        return True
+    loop = QEventLoop()
+    poll = QTimer()
+    poll.setInterval(2)
+    poll.timeout.connect(lambda: predicate() and loop.quit())
+    deadline = QTimer()
+    deadline.setSingleShot(True)
+    deadline.timeout.connect(loop.quit)
+    poll.start()
+    deadline.start(int(timeout * 1000))
+    loop.exec_()
+    poll.stop()
+    return predicate()
+
+def run_child(folder, timeout):
+    """Measures one load of folder in this process; returns the result dict."""
+    from PyQt5.QtWidgets import QApplication
+    import instrumentation
+    from subtitle_viewer import SubtitleViewer
+    from theme import get_black_white_theme
+    from utils import load_subtitle_files
+    from video_catalog import LOADING, LOADED, FAILED
+
+    result = {}
+    started = time.perf_counter()
+    result["files"] = len(load_subtitle_files(folder))
+    result["scan_seconds"] = round(time.perf_counter() - started, 4)
+
+    app = QApplication([sys.argv[0]])
+    app.setStyleSheet(get_black_white_theme())
+    viewer = SubtitleViewer()
+    viewer.resize(800, 1000)
+    viewer.show()
+    app.processEvents()
+    viewer.watch_checkbox.setChecked(False)
+
+    first_thumbnail = []
+    viewer.model.dataChanged.connect(
+        lambda *_: first_thumbnail or first_thumbnail.append(time.perf_counter()))
+    catalog = viewer.catalog
+
+    def loaded():
+        return (not viewer.scan_in_progress and len(catalog) > 0 and not catalog.count(LOADING)
+                and not viewer.pending_results)
+
+    started = time.perf_counter()
+    viewer.load_folder_contents(folder)
+    completed = wait_until(loaded, timeout)
+    result["load_completed"] = completed
+    result["first_thumbnail_seconds"] = round(first_thumbnail[0] - started, 4) if first_thumbnail else None
+    result["full_load_seconds"] = round(time.perf_counter() - started, 4)
+    result["loaded"] = catalog.count(LOADED)
+    result["failed"] = catalog.count(FAILED)
+    result["still_loading"] = catalog.count(LOADING)
+    wait_until(lambda: not viewer.pending_images, 5)
+
+    # One filter pass and repaint per keystroke, as if typed with no debounce
+    samples = []
+    for length in range(1, len(SEARCH_TEXT) + 1):
+        started = time.perf_counter()
+        viewer.search_input.setText(SEARCH_TEXT[:length])
+        viewer.filter_videos()
+        viewer.list_view.viewport().repaint()
+        samples.append(time.perf_counter() - started)
+    viewer.search_timer.stop()
+    result["search_keystroke"] = percentiles(samples)
+    viewer.search_input.clear()
+    viewer.filter_videos()
+
+    # Slider ticks repaint at once; the settle pass runs once per drag
+    samples = []
+    for width in RESIZE_WIDTHS:
+        started = time.perf_counter()
+        viewer.size_slider.setValue(width)
+        viewer.list_view.viewport().repaint()
+        samples.append(time.perf_counter() - started)
+    result["resize_tick"] = percentiles(samples)
+    viewer.resize_timer.stop()
+    started = time.perf_counter()
+    viewer._update_sizes()
+    wait_until(lambda: viewer.thumbnail_rescaler is None or viewer.thumbnail_rescaler.isFinished(), 30)
+    app.processEvents()
+    viewer.list_view.viewport().repaint()
+    result["resize_settle_seconds"] = round(time.perf_counter() - started, 4)
+
+    result["pixmap_cache"] = viewer.pixmap_cache.stats()
+    if instrumentation.enabled:
+        result["instrumentation"] = instrumentation.snapshot()
+    result["peak_rss_bytes"] = peak_rss_bytes()
+    viewer.close()
+    return result
+
+def git_commit():
+    try:
+        return subprocess.run(["git", "rev-parse", "--short", "HEAD"], cwd=REPO_DIR,
+                              capture_output=True, text=True, check=True).stdout.strip()
+    except (OSError, subprocess.CalledProcessError):
+        return "unknown"
+
+def spawn(folder, cache_dir, base_url, timeout, instrument=False):
+    env = dict(os.environ,
+               SRT_VIEWER_INSTRUMENTATION="1" if instrument else "0",
+               QT_QPA_PLATFORM="offscreen",
+               SRT_VIEWER_CACHE_DIR=cache_dir,
+               SRT_VIEWER_YOUTUBE_BASE_URL=base_url,
+               SRT_VIEWER_THUMBNAIL_BASE_URL=base_url,
+               SRT_VIEWER_WATCH_FOLDERS="0",
+               SRT_VIEWER_FETCH_RATE_PER_HOST=os.environ.get("SRT_VIEWER_FETCH_RATE_PER_HOST", "100000"))
+    completed = subprocess.run(
+        [sys.executable, os.path.abspath(__file__), "--child", folder, "--timeout", str(timeout)],
+        env=env, capture_output=True, text=True)
+    for line in completed.stdout.splitlines():
+        if line.startswith("RESULT "):
+            return json.loads(line[len("RESULT "):])
+    raise RuntimeError(f"benchmark child failed ({completed.returncode}):\n{completed.stderr[-2000:]}")
+
+def print_run(run):
+    print(f"{run['size']:>7} {run['cache']:<4} scan {run['scan_seconds']:.3f}s"
+          f" | first {run['first_thumbnail_seconds'] or 0:.3f}s"
+          f" | full {run['full_load_seconds']:.2f}s ({run['loaded']} ok, {run['failed']} failed)"
+          f" | search p95 {run['search_keystroke']['p95_ms']:.1f}ms"
+          f" | resize p95 {run['resize_tick']['p95_ms']:.1f}ms, settle {run['resize_settle_seconds'] * 1000:.0f}ms"
+          f" | rss {run['peak_rss_bytes'] / 1048576:.0f}MB")
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--sizes", default="100,1000,10000", help="comma separated library sizes")
+    parser.add_argument("--per-folder", type=int, default=None, help="files per subfolder")
+    parser.add_argument("--latency", type=float, default=30, help="server ms per request")
+    parser.add_argument("--jitter", type=float, default=20, help="extra random server ms per request")
+    parser.add_argument("--failure-rate", type=float, default=0.0)
+    parser.add_argument("--missing-rate", type=float, default=0.0)
+    parser.add_argument("--rate-limit", type=int, default=0, help="server requests per second before 429s")
+    parser.add_argument("--warm", action="store_true", help="load every library again on warm caches")
+    parser.add_argument("--timeout", type=float, default=600, help="seconds allowed per load")
+    parser.add_argument("--instrument", action="store_true",
+                        help="record per-stage latencies and counters in the results (adds overhead)")
+    parser.add_argument("--output", default=RESULTS_DIR)
+    parser.add_argument("--json", action="store_true", help="print the results as JSON")
+    parser.add_argument("--child", metavar="FOLDER", help=argparse.SUPPRESS)
+    args = parser.parse_args()
+
+    if args.child:
+        print("RESULT " + json.dumps(run_child(args.child, args.timeout), ensure_ascii=False))
+        return
+
+    from fake_youtube import FakeYouTube
+    from synthetic_library import generate
+
+    server = FakeYouTube(latency=args.latency / 1000, jitter=args.jitter / 1000,
+                         failure_rate=args.failure_rate, missing_rate=args.missing_rate,
+                         rate_limit=args.rate_limit).start()
+    runs = []
+    try:
+        for size in (int(s) for s in args.sizes.split(",")):
+            work_dir = tempfile.mkdtemp(prefix=f"srt-bench-{size}-")
+            try:
+                folder = os.path.join(work_dir, "library")
+                generate(folder, size, args.per_folder)
+                cache_dir = os.path.join(work_dir, "cache")
+                for cache in ("cold", "warm") if args.warm else ("cold",):
+                    server.reset_stats()
+                    run = spawn(folder, cache_dir, server.base_url, args.timeout, args.instrument)
+                    run.update(size=size, cache=cache, server_responses={str(k): v for k, v in server.stats.items()})
+                    runs.append(run)
+                    if not args.json:
+                        print_run(run)
+            finally:
+                shutil.rmtree(work_dir, ignore_errors=True)
+    finally:
+        server.stop()
+
+    commit = git_commit()
+    report = {
+        "commit": commit,
+        "timestamp": datetime.now().isoformat(timespec="seconds"),
+        "python": sys.version.split()[0],
+        "platform": sys.platform,
+        "server": {
+            "latency_ms": args.latency,
+            "jitter_ms": args.jitter,
+            "failure_rate": args.failure_rate,
+            "missing_rate": args.missing_rate,
+            "rate_limit": args.rate_limit,
+        },
+        "runs": runs,
+    }
+    os.makedirs(args.output, exist_ok=True)
+    path = os.path.join(args.output, f"{datetime.now():%Y%m%d-%H%M%S}-{commit}.json")
+    with open(path, "w", encoding="utf-8") as f:
+        json.dump(report, f, ensure_ascii=False, indent=2)
+    if args.json:
+        json.dump(report, sys.stdout, ensure_ascii=False, indent=2)
+        print()
+    else:
+        print(f"Saved {path}")
+
+if __name__ == "__main__":
+    main()
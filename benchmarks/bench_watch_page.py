@@ -0,0 +1,141 @@
+"""Microbenchmark: streaming watch-page extractor vs. the old BeautifulSoup path.
+
+Usage:
+    pip install -r benchmarks/requirements.txt
+    python benchmarks/bench_watch_page.py [--fixtures DIR] [--repeat N]
+
+DIR holds saved watch pages (*.html), e.g.
+    curl -s "https://www.youtube.com/watch?v=R8gcRB0MoJQ" > benchmarks/fixtures/R8gcRB0MoJQ.html
+When it has none, representative synthetic pages are generated into it first.
+"""
+import argparse
+import io
+import json
+import os
+import random
+import re
+import string
+import sys
+import time
+from datetime import datetime
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from bs4 import BeautifulSoup
+from watch_page import CHUNK_SIZE, scan_watch_page
+
+DEFAULT_FIXTURES = os.path.join(os.path.dirname(os.path.abspath(__file__)), "fixtures")
+
+def legacy_extract(text):
+    """The pre-streaming implementation, kept verbatim as the baseline."""
+    soup = BeautifulSoup(text, "html.parser")
+
+    title_tag = soup.find("title")
+    title = title_tag.text.replace(" - YouTube", "").strip() if title_tag else "Unknown Title"
+
+    upload_date = "Unknown Date"
+    scripts = soup.find_all("script")
+    for script in scripts:
+        if script.string and '"uploadDate":' in script.string:
+            date_match = re.search(r'"uploadDate":"([^"]+)"', script.string)
+            if date_match:
+                upload_date = date_match.group(1)
+                try:
+                    dt = datetime.fromisoformat(upload_date)
+                    upload_date = dt.strftime('%Y-%m-%d')
+                except ValueError:
+                    pass
+                break
+    return title, upload_date
+
+def synthetic_page(video_id, title, upload_date, size=1_200_000):
+    """Roughly the shape of a real watch page: a short head, a large
+    ytInitialPlayerResponse carrying uploadDate, then an even larger
+    ytInitialData blob and a tail of inline scripts."""
+    rng = random.Random(video_id)
+
+    def blob(n):
+        words = ["".join(rng.choices(string.ascii_letters, k=8)) for _ in range(64)]
+        parts = []
+        total = 0
+        while total < n:
+            part = '"%s":"%s",' % (rng.choice(words), rng.choice(words))
+            parts.append(part)
+            total += len(part)
+        return "".join(parts)
+
+    player = "{%s\"microformat\":{\"uploadDate\":\"%s\",\"title\":\"x\"}}" % (
+        blob(int(size * 0.3)), upload_date)
+    data = "{%s\"end\":1}" % blob(int(size * 0.6))
+    return (
+        "<!DOCTYPE html><html><head><meta charset=\"utf-8\">"
+        f"<title>{title} - YouTube</title>"
+        "<link rel=\"stylesheet\" href=\"/s/style.css\"></head><body>"
+        f"<script>var ytInitialPlayerResponse = {player};</script>"
+        f"<script>var ytInitialData = {data};</script>"
+        + "".join(f"<script>window.x{i}={{}};</script>" for i in range(200))
+        + "</body></html>"
+    )
+
+def ensure_fixtures(directory, count=5):
+    os.makedirs(directory, exist_ok=True)
+    pages = [f for f in os.listdir(directory) if f.endswith(".html")]
+    if pages:
+        return
+    print(f"No fixtures in {directory}, generating {count} synthetic pages")
+    for i in range(count):
+        video_id = f"synthetic{i:02d}"
+        page = synthetic_page(video_id, f"【テスト】動画 {i}", f"2023-0{i + 1}-15T05:00:00-07:00")
+        with open(os.path.join(directory, video_id + ".html"), "w", encoding="utf-8") as f:
+            f.write(page)
+
+def streaming_extract(data):
+    stream = io.BytesIO(data)
+    return scan_watch_page(iter(lambda: stream.read(CHUNK_SIZE), b""))
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--fixtures", default=DEFAULT_FIXTURES)
+    parser.add_argument("--repeat", type=int, default=5)
+    parser.add_argument("--json", action="store_true", help="print the report as JSON")
+    args = parser.parse_args()
+
+    ensure_fixtures(args.fixtures)
+    report = []
+    for name in sorted(os.listdir(args.fixtures)):
+        if not name.endswith(".html"):
+            continue
+        with open(os.path.join(args.fixtures, name), "rb") as f:
+            data = f.read()
+
+        start = time.perf_counter()
+        for _ in range(args.repeat):
+            legacy = legacy_extract(data.decode("utf-8", errors="replace"))
+        legacy_ms = (time.perf_counter() - start) * 1000 / args.repeat
+
+        start = time.perf_counter()
+        for _ in range(args.repeat):
+            title, upload_date, bytes_read = streaming_extract(data)
+        streaming_ms = (time.perf_counter() - start) * 1000 / args.repeat
+
+        report.append({
+            "fixture": name,
+            "page_bytes": len(data),
+            "streaming_bytes_read": bytes_read,
+            "legacy_ms": round(legacy_ms, 2),
+            "streaming_ms": round(streaming_ms, 2),
+            "speedup": round(legacy_ms / streaming_ms, 1) if streaming_ms else None,
+            "results_match": legacy == (title or "Unknown Title", upload_date or "Unknown Date"),
+        })
+
+    if args.json:
+        print(json.dumps(report, indent=2, ensure_ascii=False))
+        return
+    for row in report:
+        print(f"{row['fixture']}: {row['page_bytes'] / 1024:.0f} KiB page, "
+              f"read {row['streaming_bytes_read'] / 1024:.0f} KiB | "
+              f"bs4 {row['legacy_ms']:.1f} ms, streaming {row['streaming_ms']:.2f} ms "
+              f"({row['speedup']}x) | match={row['results_match']}")
+
+if __name__ == "__main__":
+    main()
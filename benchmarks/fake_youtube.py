@@ -0,0 +1,213 @@
+"""Local stand-in for youtube.com and img.youtube.com.
+
+Serves watch pages, oEmbed JSON and thumbnail JPEGs with configurable
+latency, failures and throttling. Point the viewer at it with
+SRT_VIEWER_YOUTUBE_BASE_URL and SRT_VIEWER_THUMBNAIL_BASE_URL.
+
+Usage:
+    python benchmarks/fake_youtube.py [--port 8765] [--latency 50] [--failure-rate 0.02] [--rate-limit 100]
+"""
+import argparse
+import hashlib
+import json
+import random
+import re
+import sys
+import threading
+import time
+from datetime import date, timedelta
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+from urllib.parse import parse_qs, urlsplit
+
+THUMBNAIL_SIZES = {
+    "default": (120, 90),
+    "mqdefault": (320, 180),
+    "hqdefault": (480, 360),
+    "sddefault": (640, 480),
+    "maxresdefault": (1280, 720),
+}
+THUMBNAIL_PATH = re.compile(r"^/vi/([\w-]{11})/(\w+)\.jpg$")
+# Padding that makes a fake watch page about the size of a real one
+PAGE_PADDING = "<script>var ytInitialData = {" + ",".join(f'"k{i}":"{"x" * 80}"' for i in range(4000)) + "};</script>"
+
+def make_jpeg(width, height, seed=0):
+    """A JPEG of smoothed noise, about the size of a real thumbnail (needs PyQt5)."""
+    from PyQt5.QtCore import QBuffer, QByteArray, Qt
+    from PyQt5.QtGui import QImage
+
+    rng = random.Random(seed)
+    small_width, small_height = max(1, width // 4), max(1, height // 4)
+    pixels = rng.randbytes(small_width * small_height * 3)
+    noise = QImage(pixels, small_width, small_height, small_width * 3, QImage.Format_RGB888)
+    image = noise.scaled(width, height, Qt.IgnoreAspectRatio, Qt.SmoothTransformation)
+    data = QByteArray()
+    buffer = QBuffer(data)
+    buffer.open(QBuffer.WriteOnly)
+    image.save(buffer, "JPG", 80)
+    return bytes(data)
+
+class QuietHTTPServer(ThreadingHTTPServer):
+    """Streaming clients hang up once they have what they need; those
+    disconnects are expected, not worth a traceback each."""
+
+    def handle_error(self, request, client_address):
+        if isinstance(sys.exc_info()[1], ConnectionError):
+            return
+        super().handle_error(request, client_address)
+
+def video_hash(video_id):
+    return int.from_bytes(hashlib.sha1(video_id.encode()).digest()[:8], "big")
+
+class FakeYouTube:
+    """Threaded HTTP server answering like YouTube for any 11-character ID.
+
+    latency / jitter are in seconds per request. failure_rate answers 503,
+    missing_rate marks a stable fraction of IDs as deleted (404 oEmbed and a
+    page titled "YouTube"), and rate_limit answers 429 with Retry-After
+    once more than that many requests per second arrive.
+    """
+
+    def __init__(self, host="127.0.0.1", port=0, latency=0.0, jitter=0.0, failure_rate=0.0,
+                 missing_rate=0.0, rate_limit=0, seed=0, thumbnails=None):
+        self.latency = latency
+        self.jitter = jitter
+        self.failure_rate = failure_rate
+        self.missing_rate = missing_rate
+        self.rate_limit = rate_limit
+        self.rng = random.Random(seed)
+        self.thumbnails = thumbnails if thumbnails is not None else {
+            variant: make_jpeg(*size, seed=seed) for variant, size in THUMBNAIL_SIZES.items()
+        }
+        self.stats = {}
+        self._lock = threading.Lock()
+        self._window = (0, 0)
+        self.server = QuietHTTPServer((host, port), self._handler())
+        self.server.daemon_threads = True
+        self._thread = None
+
+    @property
+    def base_url(self):
+        host, port = self.server.server_address[:2]
+        return f"http://{host}:{port}"
+
+    def start(self):
+        self._thread = threading.Thread(target=self.server.serve_forever, daemon=True)
+        self._thread.start()
+        return self
+
+    def stop(self):
+        self.server.shutdown()
+        self.server.server_close()
+
+    def reset_stats(self):
+        with self._lock:
+            self.stats = {}
+
+    def count(self, key):
+        with self._lock:
+            self.stats[key] = self.stats.get(key, 0) + 1
+
+    def throttled(self):
+        if not self.rate_limit:
+            return False
+        with self._lock:
+            second, requests = self._window
+            now = int(time.monotonic())
+            if now != second:
+                second, requests = now, 0
+            requests += 1
+            self._window = (second, requests)
+            return requests > self.rate_limit
+
+    def missing(self, video_id):
+        return video_hash(video_id) % 10000 < self.missing_rate * 10000
+
+    def title(self, video_id):
+        return f"テスト動画 {video_id} 第{video_hash(video_id) % 500}回"
+
+    def upload_date(self, video_id):
+        return (date(2010, 1, 1) + timedelta(days=video_hash(video_id) % 5000)).isoformat()
+
+    def watch_page(self, video_id):
+        if self.missing(video_id):
+            return "<html><head><title>YouTube</title></head><body></body></html>"
+        return (
+            f"<html><head><title>{self.title(video_id)} - YouTube</title>"
+            f'<meta itemprop="uploadDate" content="{self.upload_date(video_id)}"></head>'
+            f"<body>{PAGE_PADDING}</body></html>"
+        )
+
+    def _handler(self):
+        fake = self
+
+        class Handler(BaseHTTPRequestHandler):
+            protocol_version = "HTTP/1.1"
+
+            def log_message(self, format, *args):
+                pass
+
+            def send(self, status, body=b"", content_type="text/plain", headers=()):
+                # Counted before answering, so a client that has its reply sees it counted
+                fake.count(status)
+                self.send_response(status)
+                self.send_header("Content-Type", content_type)
+                self.send_header("Content-Length", str(len(body)))
+                for name, value in headers:
+                    self.send_header(name, value)
+                self.end_headers()
+                self.wfile.write(body)
+
+            def do_GET(self):
+                delay = fake.latency + (fake.rng.uniform(0, fake.jitter) if fake.jitter else 0)
+                if delay:
+                    time.sleep(delay)
+                if fake.throttled():
+                    return self.send(429, headers=[("Retry-After", "1")])
+                if fake.failure_rate and fake.rng.random() < fake.failure_rate:
+                    return self.send(503)
+
+                url = urlsplit(self.path)
+                query = parse_qs(url.query)
+                match = THUMBNAIL_PATH.match(url.path)
+                if match:
+                    data = fake.thumbnails.get(match.group(2))
+                    if data is None or fake.missing(match.group(1)):
+                        return self.send(404)
+                    etag = f'"{match.group(2)}"'
+                    if self.headers.get("If-None-Match") == etag:
+                        return self.send(304, headers=[("ETag", etag)])
+                    return self.send(200, data, "image/jpeg", [("ETag", etag)])
+                if url.path == "/watch" and "v" in query:
+                    page = fake.watch_page(query["v"][0]).encode("utf-8")
+                    return self.send(200, page, "text/html; charset=utf-8")
+                if url.path == "/oembed" and "url" in query:
+                    video_id = parse_qs(urlsplit(query["url"][0]).query).get("v", [""])[0]
+                    if fake.missing(video_id):
+                        return self.send(404)
+                    body = json.dumps({"title": fake.title(video_id)}, ensure_ascii=False).encode("utf-8")
+                    return self.send(200, body, "application/json")
+                self.send(404)
+
+        return Handler
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--port", type=int, default=8765)
+    parser.add_argument("--latency", type=float, default=0, help="ms per request")
+    parser.add_argument("--jitter", type=float, default=0, help="extra random ms per request")
+    parser.add_argument("--failure-rate", type=float, default=0)
+    parser.add_argument("--missing-rate", type=float, default=0)
+    parser.add_argument("--rate-limit", type=int, default=0, help="requests per second before 429s")
+    args = parser.parse_args()
+    fake = FakeYouTube(port=args.port, latency=args.latency / 1000, jitter=args.jitter / 1000,
+                       failure_rate=args.failure_rate, missing_rate=args.missing_rate,
+                       rate_limit=args.rate_limit)
+    print(f"Serving on {fake.base_url}")
+    print(f"  SRT_VIEWER_YOUTUBE_BASE_URL={fake.base_url} SRT_VIEWER_THUMBNAIL_BASE_URL={fake.base_url}")
+    try:
+        fake.server.serve_forever()
+    except KeyboardInterrupt:
+        pass
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,76 @@
+"""Generates folders of synthetic `[videoid].srt` files for benchmarking.
+
+Usage:
+    python benchmarks/synthetic_library.py DIR --count 10000 [--per-folder 500] [--seed 0]
+
+Video IDs are random but reproducible for a seed. Every file holds a few
+Japanese cues so subtitle indexing and analytics have real work to do.
+"""
+import argparse
+import os
+import random
+import string
+
+ID_ALPHABET = string.ascii_letters + string.digits + "-_"
+LINES = [
+    "今日はいい天気ですね",
+    "それではさっそく始めましょう",
+    "この料理はとても美味しいです",
+    "ちょっと待ってください",
+    "ゲームの続きをやっていきます",
+    "コメントありがとうございます",
+    "東京駅から電車で三十分くらい",
+    "じゃあまた次の動画で会いましょう",
+]
+
+def video_id(rng):
+    return "".join(rng.choice(ID_ALPHABET) for _ in range(11))
+
+def timestamp(ms):
+    hours, ms = divmod(ms, 3600000)
+    minutes, ms = divmod(ms, 60000)
+    seconds, ms = divmod(ms, 1000)
+    return f"{hours:02d}:{minutes:02d}:{seconds:02d},{ms:03d}"
+
+def srt_text(rng, cues):
+    blocks = []
+    start = 0
+    for number in range(1, cues + 1):
+        start += rng.randint(500, 4000)
+        end = start + rng.randint(800, 3500)
+        blocks.append(f"{number}\n{timestamp(start)} --> {timestamp(end)}\n{rng.choice(LINES)}\n")
+        start = end
+    return "\n".join(blocks)
+
+def generate(directory, count, per_folder=None, seed=0, cues=(5, 40)):
+    """Writes `count` SRT files under directory, `per_folder` per subfolder
+    (all in directory when None); returns the video IDs in creation order."""
+    rng = random.Random(seed)
+    ids = []
+    seen = set()
+    for index in range(count):
+        folder = directory if not per_folder else os.path.join(directory, f"folder{index // per_folder:04d}")
+        if index == 0 or (per_folder and index % per_folder == 0):
+            os.makedirs(folder, exist_ok=True)
+        vid = video_id(rng)
+        while vid in seen:
+            vid = video_id(rng)
+        seen.add(vid)
+        ids.append(vid)
+        with open(os.path.join(folder, f"[{vid}].srt"), "w", encoding="utf-8") as f:
+            f.write(srt_text(rng, rng.randint(*cues)))
+    return ids
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("directory")
+    parser.add_argument("--count", type=int, default=1000)
+    parser.add_argument("--per-folder", type=int, default=None)
+    parser.add_argument("--seed", type=int, default=0)
+    args = parser.parse_args()
+    os.makedirs(args.directory, exist_ok=True)
+    generate(args.directory, args.count, args.per_folder, args.seed)
+    print(f"Wrote {args.count} SRT files to {args.directory}")
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,139 @@
+import time
+from PyQt5.QtWidgets import (
+    QDialog, QVBoxLayout, QHBoxLayout, QCheckBox, QPushButton, QLabel,
+    QTableWidget, QTableWidgetItem, QHeaderView, QFileDialog)
+from PyQt5.QtCore import Qt, QObject, QTimer
+
+import instrumentation
+import settings
+
+class EventLoopMonitor(QObject):
+    """Flags GUI-thread stalls: a precise timer that fires late by more than
+    the threshold means the event loop was blocked for that long."""
+
+    def __init__(self, interval_ms=10, threshold_ms=None, parent=None):
+        super().__init__(parent)
+        self.interval_ns = interval_ms * 1_000_000
+        threshold_ms = settings.STALL_THRESHOLD_MS if threshold_ms is None else threshold_ms
+        self.threshold_ns = int(threshold_ms * 1_000_000)
+        self.timer = QTimer(self)
+        self.timer.setTimerType(Qt.PreciseTimer)
+        self.timer.setInterval(interval_ms)
+        self.timer.timeout.connect(self.tick)
+        self.last_ns = 0
+
+    def start(self):
+        self.last_ns = time.perf_counter_ns()
+        self.timer.start()
+
+    def stop(self):
+        self.timer.stop()
+
+    def tick(self):
+        now = time.perf_counter_ns()
+        lag = now - self.last_ns - self.interval_ns
+        if lag > self.threshold_ns:
+            instrumentation.record(instrumentation.STALL_STAGE, self.last_ns + self.interval_ns, lag)
+        self.last_ns = now
+
+class DiagnosticsPanel(QDialog):
+    """Live per-stage latencies, cache counters and GUI stalls, with export
+    to JSON or a Chrome trace. Enabling it here turns recording on."""
+    COLUMNS = ("ステージ", "回数", "平均 ms", "p50 ms", "p95 ms", "最大 ms", "合計 ms")
+
+    def __init__(self, font, monitor, parent=None):
+        super().__init__(parent)
+        self.setWindowTitle("診断")
+        self.resize(720, 520)
+        self.monitor = monitor
+
+        layout = QVBoxLayout(self)
+        controls = QHBoxLayout()
+        self.enabled_checkbox = QCheckBox("計測")
+        self.enabled_checkbox.setFont(font)
+        self.enabled_checkbox.setChecked(instrumentation.enabled)
+        self.enabled_checkbox.toggled.connect(self.set_recording)
+        controls.addWidget(self.enabled_checkbox)
+        for label, slot in (("リセット", self.reset),
+                            ("JSON書き出し", self.export_json),
+                            ("トレース書き出し", self.export_trace)):
+            button = QPushButton(label)
+            button.setFont(font)
+            button.clicked.connect(slot)
+            controls.addWidget(button)
+        controls.addStretch()
+        layout.addLayout(controls)
+
+        self.table = QTableWidget(0, len(self.COLUMNS))
+        self.table.setFont(font)
+        self.table.setHorizontalHeaderLabels(self.COLUMNS)
+        self.table.horizontalHeader().setSectionResizeMode(0, QHeaderView.Stretch)
+        self.table.verticalHeader().hide()
+        self.table.setEditTriggers(QTableWidget.NoEditTriggers)
+        layout.addWidget(self.table)
+
+        self.summary_label = QLabel("")
+        self.summary_label.setFont(font)
+        self.summary_label.setWordWrap(True)
+        self.summary_label.setTextInteractionFlags(Qt.TextSelectableByMouse)
+        layout.addWidget(self.summary_label)
+
+        # Refreshed only while shown
+        self.refresh_timer = QTimer(self)
+        self.refresh_timer.setInterval(500)
+        self.refresh_timer.timeout.connect(self.refresh)
+
+    def set_recording(self, on):
+        instrumentation.set_enabled(on)
+        if on:
+            self.monitor.start()
+        else:
+            self.monitor.stop()
+        self.refresh()
+
+    def reset(self):
+        instrumentation.reset()
+        self.refresh()
+
+    def refresh(self):
+        snapshot = instrumentation.snapshot()
+        stages = snapshot["stages"]
+        self.table.setRowCount(len(stages))
+        for row, (stage, summary) in enumerate(stages.items()):
+            values = (stage, summary["count"], summary["mean_ms"], summary["p50_ms"],
+                      summary["p95_ms"], summary["max_ms"], summary["total_ms"])
+            for column, value in enumerate(values):
+                item = QTableWidgetItem(value if isinstance(value, str) else f"{value:g}")
+                if column:
+                    item.setTextAlignment(Qt.AlignRight | Qt.AlignVCenter)
+                self.table.setItem(row, column, item)
+
+        lines = [f"GUI停止 (>{settings.STALL_THRESHOLD_MS:g} ms): {snapshot['stalls']}"
+                 f" | 記録: {snapshot['events_recorded']}"]
+        if snapshot["counters"]:
+            lines.append(" | ".join(f"{name}: {value}" for name, value in snapshot["counters"].items()))
+        for name, values in snapshot["gauges"].items():
+            lines.append(f"{name}: " + ", ".join(
+                f"{key} {value:.2f}" if isinstance(value, float) else f"{key} {value}"
+                for key, value in values.items()))
+        self.summary_label.setText("\n".join(lines))
+
+    def export_json(self):
+        path, _ = QFileDialog.getSaveFileName(self, "JSON書き出し", "diagnostics.json", "JSON (*.json)")
+        if path:
+            instrumentation.export_json(path)
+
+    def export_trace(self):
+        path, _ = QFileDialog.getSaveFileName(
+            self, "トレース書き出し", "trace.json", "Chrome trace (*.json)")
+        if path:
+            instrumentation.export_chrome_trace(path)
+
+    def showEvent(self, event):
+        self.refresh()
+        self.refresh_timer.start()
+        super().showEvent(event)
+
+    def hideEvent(self, event):
+        self.refresh_timer.stop()
+        super().hideEvent(event)
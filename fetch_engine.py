@@ -0,0 +1,115 @@
+import random
+import threading
+import time
+from urllib.parse import urlsplit
+
+import requests
+from requests.adapters import HTTPAdapter
+
+import instrumentation
+import settings
+
+RETRY_STATUSES = {429, 500, 502, 503, 504}
+
+class FetchCancelled(Exception):
+    """Raised by FetchEngine.get once the engine has been cancelled."""
+
+class RateLimiter:
+    """Token bucket shared by every thread talking to one host."""
+
+    def __init__(self, rate, burst=None):
+        self.rate = rate
+        self.capacity = burst if burst is not None else max(1.0, rate)
+        self.tokens = self.capacity
+        self.updated = time.monotonic()
+        self._lock = threading.Lock()
+
+    def acquire(self, cancel_event=None):
+        while True:
+            with self._lock:
+                now = time.monotonic()
+                self.tokens = min(self.capacity, self.tokens + (now - self.updated) * self.rate)
+                self.updated = now
+                if self.tokens >= 1:
+                    self.tokens -= 1
+                    return
+                wait = (1 - self.tokens) / self.rate
+            if cancel_event is not None:
+                if cancel_event.wait(wait):
+                    raise FetchCancelled()
+            else:
+                time.sleep(wait)
+
+class FetchEngine:
+    """Pooled HTTP session with per-host rate limiting, retries and cancellation.
+
+    One engine is shared by all worker threads of a load so connections to
+    youtube.com and img.youtube.com are kept alive and reused.
+    """
+
+    def __init__(self, jobs=None, rate_per_host=None, retries=None, backoff=None, timeout=None):
+        self.jobs = settings.FETCH_JOBS if jobs is None else jobs
+        self.rate_per_host = settings.FETCH_RATE_PER_HOST if rate_per_host is None else rate_per_host
+        self.retries = settings.FETCH_RETRIES if retries is None else retries
+        self.backoff = settings.FETCH_BACKOFF if backoff is None else backoff
+        self.timeout = settings.FETCH_TIMEOUT if timeout is None else timeout
+        self.cancel_event = threading.Event()
+
+        self.session = requests.Session()
+        adapter = HTTPAdapter(pool_connections=4, pool_maxsize=max(self.jobs, 10))
+        self.session.mount("https://", adapter)
+        self.session.mount("http://", adapter)
+
+        self._limiters = {}
+        self._limiters_lock = threading.Lock()
+
+    def _limiter(self, host):
+        with self._limiters_lock:
+            limiter = self._limiters.get(host)
+            if limiter is None:
+                limiter = self._limiters[host] = RateLimiter(self.rate_per_host)
+            return limiter
+
+    def cancel(self):
+        self.cancel_event.set()
+
+    @property
+    def cancelled(self):
+        return self.cancel_event.is_set()
+
+    def get(self, url, **kwargs):
+        """GET url, retrying connection errors, 429 and 5xx with jittered backoff."""
+        kwargs.setdefault("timeout", self.timeout)
+        host = urlsplit(url).netloc
+        limiter = self._limiter(host)
+        attempt = 0
+        while True:
+            if self.cancelled:
+                raise FetchCancelled()
+            with instrumentation.span("fetch.throttle", host=host):
+                limiter.acquire(self.cancel_event)
+            try:
+                # Connect (DNS included) until the headers arrive; streamed
+                # bodies are timed by whoever reads them
+                with instrumentation.span("fetch", host=host):
+                    response = self.session.get(url, **kwargs)
+            except (requests.ConnectionError, requests.Timeout):
+                if attempt >= self.retries:
+                    raise
+                retry_after = None
+            else:
+                if response.status_code not in RETRY_STATUSES or attempt >= self.retries:
+                    return response
+                retry_after = response.headers.get("Retry-After")
+                response.close()
+
+            delay = random.uniform(0, self.backoff * (2 ** attempt))
+            if retry_after and retry_after.isdigit():
+                delay = max(delay, float(retry_after))
+            attempt += 1
+            instrumentation.count("fetch.retries")
+            if self.cancel_event.wait(delay):
+                raise FetchCancelled()
+
+    def close(self):
+        self.session.close()
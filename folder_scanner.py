@@ -0,0 +1,40 @@
+from PyQt5.QtCore import QThread, pyqtSignal
+import instrumentation
+
+class LibraryScanner(QThread):
+    """Loads the library off the GUI thread.
+
+    Everything already in the library index is handed over first, so a
+    known library paints immediately; then the index is refreshed against
+    the disk and only the differences follow.
+    """
+    batch_found = pyqtSignal(list)
+    files_removed = pyqtSignal(list)
+    scan_finished = pyqtSignal(list)
+
+    def __init__(self, library, batch_size=500):
+        super().__init__()
+        self.library = library
+        self.batch_size = batch_size
+        self._cancelled = False
+
+    def cancel(self):
+        self._cancelled = True
+
+    def run(self):
+        with instrumentation.span("scan.index"):
+            records = self.library.records()
+        for start in range(0, len(records), self.batch_size):
+            if self._cancelled:
+                return
+            self.batch_found.emit(records[start:start + self.batch_size])
+
+        with instrumentation.span("scan.refresh"):
+            for kind, changed in self.library.refresh(lambda: self._cancelled):
+                if kind == "added":
+                    for start in range(0, len(changed), self.batch_size):
+                        self.batch_found.emit(changed[start:start + self.batch_size])
+                else:
+                    self.files_removed.emit(changed)
+        if not self._cancelled:
+            self.scan_finished.emit(self.library.directories())
@@ -0,0 +1,96 @@
+import os
+from PyQt5.QtCore import QObject, QFileSystemWatcher, QTimer, pyqtSignal
+from utils import list_subtitle_directory
+
+class FolderWatcher(QObject):
+    """Watches the loaded directories and reports only what changed.
+
+    QFileSystemWatcher tells us which directory changed; that directory is
+    re-listed (one scandir, no recursion) and diffed against the records
+    we already know for it. Bursts of events are coalesced per directory.
+    """
+    files_added = pyqtSignal(list)
+    files_removed = pyqtSignal(list)
+    files_changed = pyqtSignal(list)
+
+    def __init__(self, recursive_roots=(), parent=None):
+        super().__init__(parent)
+        self.recursive_roots = [os.path.join(root, "") for root in recursive_roots]
+        self.known = {}
+        self.watcher = QFileSystemWatcher(self)
+        self.watcher.directoryChanged.connect(self.directory_changed)
+        self.dirty = set()
+        self.timer = QTimer(self)
+        self.timer.setSingleShot(True)
+        self.timer.setInterval(300)
+        self.timer.timeout.connect(self.rescan_dirty)
+
+    def watch(self, directories, records):
+        """Starts watching after the initial scan found `records` in `directories`."""
+        for directory in directories:
+            self.known.setdefault(directory, {})
+        for record in records:
+            self.known.setdefault(record["directory"], {})[record["path"]] = record
+        if self.known:
+            self.watcher.addPaths(list(self.known))
+
+    def stop(self):
+        self.timer.stop()
+        directories = self.watcher.directories()
+        if directories:
+            self.watcher.removePaths(directories)
+        self.known.clear()
+        self.dirty.clear()
+
+    def is_recursive(self, directory):
+        directory = os.path.join(directory, "")
+        return any(directory.startswith(root) for root in self.recursive_roots)
+
+    def directory_changed(self, directory):
+        self.dirty.add(directory)
+        self.timer.start()
+
+    def rescan_dirty(self):
+        added, removed, changed = [], [], []
+        dirty, self.dirty = self.dirty, set()
+        for directory in dirty:
+            self.rescan(directory, added, removed, changed)
+        if removed:
+            self.files_removed.emit(removed)
+        if added:
+            self.files_added.emit(added)
+        if changed:
+            self.files_changed.emit(changed)
+
+    def rescan(self, directory, added, removed, changed):
+        known = self.known.get(directory)
+        if known is None:
+            return
+        try:
+            records, subdirectories = list_subtitle_directory(directory)
+        except OSError:
+            # The directory itself is gone, along with everything below it
+            for gone in [d for d in self.known if d == directory or d.startswith(os.path.join(directory, ""))]:
+                removed.extend(self.known.pop(gone).values())
+                self.watcher.removePath(gone)
+            return
+
+        current = {record["path"]: record for record in records}
+        for path, record in known.items():
+            if path not in current:
+                removed.append(record)
+        for path, record in current.items():
+            previous = known.get(path)
+            if previous is None:
+                added.append(record)
+            elif previous["mtime"] != record["mtime"]:
+                changed.append(record)
+        self.known[directory] = current
+
+        if self.is_recursive(directory):
+            for subdirectory in subdirectories:
+                if subdirectory not in self.known:
+                    # A new folder: everything in it (and below) is new
+                    self.known[subdirectory] = {}
+                    self.watcher.addPath(subdirectory)
+                    self.rescan(subdirectory, added, removed, changed)
@@ -0,0 +1,197 @@
+"""Timing spans, per-stage latency histograms and counters.
+
+Off unless SRT_VIEWER_INSTRUMENTATION=1 or the diagnostics panel turns it
+on. While off, span() hands back one shared no-op context manager and
+count() returns at once, so instrumented code pays a function call.
+Holds no Qt objects; any thread may record.
+"""
+import json
+import os
+import threading
+import time
+from bisect import bisect_left
+from collections import deque
+from contextlib import nullcontext
+from functools import wraps
+
+import settings
+
+# Upper bounds of the histogram buckets, in milliseconds
+BUCKETS_MS = (0.05, 0.1, 0.25, 0.5, 1, 2, 4, 8, 16, 32, 64, 128, 256, 512, 1024, 2048, 4096, float("inf"))
+STALL_STAGE = "gui.stall"
+
+NO_SPAN = nullcontext()
+
+enabled = settings.INSTRUMENTATION
+_lock = threading.Lock()
+_histograms = {}
+_counters = {}
+_events = deque(maxlen=settings.INSTRUMENTATION_MAX_EVENTS)
+_thread_names = {}
+_gauges = {}
+_origin_ns = time.perf_counter_ns()
+
+class Histogram:
+    """Bucketed latencies of one stage; percentiles are bucket upper bounds."""
+    __slots__ = ("buckets", "count", "total_ms", "max_ms")
+
+    def __init__(self):
+        self.buckets = [0] * len(BUCKETS_MS)
+        self.count = 0
+        self.total_ms = 0.0
+        self.max_ms = 0.0
+
+    def add(self, ms):
+        self.buckets[bisect_left(BUCKETS_MS, ms)] += 1
+        self.count += 1
+        self.total_ms += ms
+        if ms > self.max_ms:
+            self.max_ms = ms
+
+    def percentile(self, fraction):
+        rank = fraction * self.count
+        seen = 0
+        for bound, n in zip(BUCKETS_MS, self.buckets):
+            seen += n
+            if n and seen >= rank:
+                return min(bound, self.max_ms)
+        return self.max_ms
+
+    def summary(self):
+        return {
+            "count": self.count,
+            "total_ms": round(self.total_ms, 3),
+            "mean_ms": round(self.total_ms / self.count, 3) if self.count else 0.0,
+            "p50_ms": round(self.percentile(0.5), 3),
+            "p95_ms": round(self.percentile(0.95), 3),
+            "p99_ms": round(self.percentile(0.99), 3),
+            "max_ms": round(self.max_ms, 3),
+            "buckets": {("inf" if bound == float("inf") else str(bound)): n
+                        for bound, n in zip(BUCKETS_MS, self.buckets) if n},
+        }
+
+class Span:
+    __slots__ = ("stage", "args", "start_ns")
+
+    def __init__(self, stage, args):
+        self.stage = stage
+        self.args = args
+
+    def __enter__(self):
+        self.start_ns = time.perf_counter_ns()
+        return self
+
+    def __exit__(self, *exc):
+        record(self.stage, self.start_ns, time.perf_counter_ns() - self.start_ns, self.args)
+        return False
+
+def set_enabled(on):
+    global enabled
+    enabled = bool(on)
+
+def span(stage, **args):
+    """Context manager timing the enclosed block as one `stage` span."""
+    if not enabled:
+        return NO_SPAN
+    return Span(stage, args)
+
+def timed(stage):
+    """Decorator form of span() for whole functions and slots."""
+    def decorate(function):
+        @wraps(function)
+        def wrapper(*args, **kwargs):
+            if not enabled:
+                return function(*args, **kwargs)
+            with Span(stage, None):
+                return function(*args, **kwargs)
+        return wrapper
+    return decorate
+
+def record(stage, start_ns, duration_ns, args=None):
+    """Adds a finished span; start_ns is on the perf_counter_ns clock."""
+    if not enabled:
+        return
+    thread = threading.get_ident()
+    with _lock:
+        histogram = _histograms.get(stage)
+        if histogram is None:
+            histogram = _histograms[stage] = Histogram()
+        histogram.add(duration_ns / 1e6)
+        _events.append((stage, thread, start_ns, duration_ns, args))
+        if thread not in _thread_names:
+            _thread_names[thread] = threading.current_thread().name
+
+def count(name, n=1):
+    if not enabled:
+        return
+    with _lock:
+        _counters[name] = _counters.get(name, 0) + n
+
+def register_gauge(name, function):
+    """`function()` returns a dict of values, read only when a snapshot is taken."""
+    _gauges[name] = function
+
+def unregister_gauge(name):
+    _gauges.pop(name, None)
+
+def reset():
+    global _origin_ns
+    with _lock:
+        _histograms.clear()
+        _counters.clear()
+        _events.clear()
+        _thread_names.clear()
+        _origin_ns = time.perf_counter_ns()
+
+def snapshot():
+    """Histogram summaries, counters and gauges as plain JSON-able dicts."""
+    with _lock:
+        stages = {stage: histogram.summary() for stage, histogram in sorted(_histograms.items())}
+        counters = dict(sorted(_counters.items()))
+        events = len(_events)
+    gauges = {}
+    for name, function in list(_gauges.items()):
+        try:
+            gauges[name] = function()
+        except Exception as e:
+            gauges[name] = {"error": str(e)}
+    return {
+        "enabled": enabled,
+        "stages": stages,
+        "counters": counters,
+        "gauges": gauges,
+        "stalls": stages.get(STALL_STAGE, {}).get("count", 0),
+        "events_recorded": events,
+    }
+
+def chrome_trace():
+    """The recorded spans in Chrome's trace event format (chrome://tracing, Perfetto)."""
+    pid = os.getpid()
+    with _lock:
+        events = list(_events)
+        names = dict(_thread_names)
+        origin = _origin_ns
+    trace = [{"name": "thread_name", "ph": "M", "pid": pid, "tid": thread, "args": {"name": name}}
+             for thread, name in names.items()]
+    for stage, thread, start_ns, duration_ns, args in events:
+        event = {
+            "name": stage,
+            "cat": stage.split(".", 1)[0],
+            "ph": "X",
+            "ts": (start_ns - origin) / 1000,
+            "dur": duration_ns / 1000,
+            "pid": pid,
+            "tid": thread,
+        }
+        if args:
+            event["args"] = args
+        trace.append(event)
+    return {"traceEvents": trace, "displayTimeUnit": "ms"}
+
+def export_json(path):
+    with open(path, "w", encoding="utf-8") as f:
+        json.dump(snapshot(), f, ensure_ascii=False, indent=2)
+
+def export_chrome_trace(path):
+    with open(path, "w", encoding="utf-8") as f:
+        json.dump(chrome_trace(), f, ensure_ascii=False)
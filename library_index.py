@@ -0,0 +1,213 @@
+import os
+import sqlite3
+import threading
+import time
+
+import settings
+from utils import list_subtitle_directory
+
+class LibraryIndex:
+    """Persistent index of every SRT under the registered library roots.
+
+    Directories are stored with their mtime; a refresh stats each known
+    directory once and only re-lists those whose mtime changed (entries
+    were added, removed or renamed in them). Unchanged subtrees cost one
+    stat per directory and no listing.
+    """
+
+    def __init__(self, path=None):
+        if path is None:
+            path = os.path.join(settings.CACHE_DIR, "library.sqlite3")
+        os.makedirs(os.path.dirname(path), exist_ok=True)
+        self._lock = threading.Lock()
+        self._conn = sqlite3.connect(path, check_same_thread=False)
+        self._conn.execute("PRAGMA journal_mode=WAL")
+        self._conn.execute("PRAGMA synchronous=NORMAL")
+        self._conn.executescript(
+            "CREATE TABLE IF NOT EXISTS roots ("
+            " id INTEGER PRIMARY KEY, path TEXT UNIQUE NOT NULL, recursive INTEGER NOT NULL, added_at REAL NOT NULL);"
+            "CREATE TABLE IF NOT EXISTS directories ("
+            " path TEXT PRIMARY KEY, root_id INTEGER NOT NULL, parent TEXT, mtime_ns INTEGER NOT NULL);"
+            "CREATE TABLE IF NOT EXISTS files ("
+            " path TEXT PRIMARY KEY, directory TEXT NOT NULL, root_id INTEGER NOT NULL,"
+            " video_id TEXT NOT NULL, mtime REAL NOT NULL, filename_title TEXT, sidecar_path TEXT);"
+            "CREATE INDEX IF NOT EXISTS files_directory ON files (directory);"
+            "CREATE INDEX IF NOT EXISTS directories_root ON directories (root_id);"
+        )
+        self._conn.commit()
+
+    def roots(self):
+        """[(path, recursive)] in the order they were added."""
+        with self._lock:
+            return [(path, bool(recursive)) for path, recursive in self._conn.execute(
+                "SELECT path, recursive FROM roots ORDER BY id")]
+
+    def add_root(self, path, recursive=False):
+        path = os.path.abspath(path)
+        with self._lock:
+            with self._conn:
+                self._conn.execute(
+                    "INSERT INTO roots (path, recursive, added_at) VALUES (?, ?, ?)"
+                    " ON CONFLICT(path) DO UPDATE SET recursive = excluded.recursive",
+                    (path, int(recursive), time.time())
+                )
+        return path
+
+    def remove_root(self, path):
+        with self._lock:
+            with self._conn:
+                row = self._conn.execute("SELECT id FROM roots WHERE path = ?", (path,)).fetchone()
+                if row is None:
+                    return
+                self._conn.execute("DELETE FROM files WHERE root_id = ?", row)
+                self._conn.execute("DELETE FROM directories WHERE root_id = ?", row)
+                self._conn.execute("DELETE FROM roots WHERE id = ?", row)
+
+    def directories(self):
+        with self._lock:
+            return [path for (path,) in self._conn.execute("SELECT path FROM directories")]
+
+    def recursive_roots(self):
+        return [path for path, recursive in self.roots() if recursive]
+
+    def records(self):
+        """Every known file, one per video_id: the copy in the earliest added
+        root wins, then the lexically first path."""
+        with self._lock:
+            rows = self._conn.execute(
+                "SELECT f.path, f.directory, f.video_id, f.mtime, f.filename_title, f.sidecar_path"
+                " FROM files f JOIN roots r ON r.id = f.root_id ORDER BY r.id, f.path"
+            ).fetchall()
+        records = []
+        seen = set()
+        for path, directory, video_id, mtime, filename_title, sidecar_path in rows:
+            if video_id in seen:
+                continue
+            seen.add(video_id)
+            records.append({
+                "title": "Loading...",
+                "video_id": video_id,
+                "path": path,
+                "directory": directory,
+                "mtime": mtime,
+                "filename_title": filename_title,
+                "sidecar_path": sidecar_path,
+            })
+        return records
+
+    def refresh(self, cancelled=lambda: False):
+        """Brings the index up to date with the disk.
+
+        Yields ("added", records) for each re-listed directory as it goes,
+        then a final ("removed", records) with the files that disappeared.
+        A directory reachable from several roots belongs to the earliest
+        added one and is listed once; duplicate videos across roots are not
+        filtered here.
+        """
+        with self._lock:
+            known = {path: (root_id, mtime_ns, parent) for path, root_id, mtime_ns, parent in
+                     self._conn.execute("SELECT path, root_id, mtime_ns, parent FROM directories")}
+        children = {}
+        for path, (_, _, parent) in known.items():
+            if parent is not None:
+                children.setdefault(parent, []).append(path)
+
+        removed = []
+        # Directory -> its subdirectories, for every directory an earlier root walked
+        claimed = {}
+        for root_id, root, recursive in self._root_rows():
+            pending = [root]
+            while pending:
+                if cancelled():
+                    return
+                directory = pending.pop()
+                if directory in claimed:
+                    # Already walked for an earlier root; only descend through it
+                    if recursive:
+                        pending.extend(claimed[directory])
+                    continue
+                try:
+                    mtime_ns = os.stat(directory).st_mtime_ns
+                except OSError:
+                    continue
+                previous = known.get(directory)
+                if previous is not None and previous[:2] == (root_id, mtime_ns):
+                    claimed[directory] = children.get(directory, ())
+                    if recursive:
+                        pending.extend(claimed[directory])
+                    continue
+
+                try:
+                    records, subdirectories = list_subtitle_directory(directory)
+                except OSError as e:
+                    print(f"Error scanning {directory}: {e}")
+                    # Keep what was known about it until it can be listed
+                    claimed[directory] = ()
+                    continue
+                claimed[directory] = subdirectories
+                parent = None if directory == root else os.path.dirname(directory)
+                added, gone = self._replace_directory(root_id, directory, parent, mtime_ns, records)
+                removed.extend(gone)
+                if recursive:
+                    pending.extend(subdirectories)
+                if added:
+                    yield "added", added
+
+        vanished = [path for path in known if path not in claimed]
+        if vanished:
+            removed.extend(self._drop_directories(vanished))
+
+        # A removed copy may leave another copy of the same video behind
+        if removed:
+            remaining = {record["video_id"]: record for record in self.records()}
+            replacements = [remaining[r["video_id"]] for r in removed
+                            if r["video_id"] in remaining and remaining[r["video_id"]]["path"] != r["path"]]
+            yield "removed", removed
+            if replacements:
+                yield "added", replacements
+
+    def _root_rows(self):
+        with self._lock:
+            return self._conn.execute("SELECT id, path, recursive FROM roots ORDER BY id").fetchall()
+
+    def _replace_directory(self, root_id, directory, parent, mtime_ns, records):
+        """Stores a fresh listing; returns (new records, records that vanished)."""
+        with self._lock:
+            with self._conn:
+                old = {path: (video_id, mtime) for path, video_id, mtime in self._conn.execute(
+                    "SELECT path, video_id, mtime FROM files WHERE directory = ?", (directory,))}
+                self._conn.execute(
+                    "INSERT OR REPLACE INTO directories (path, root_id, parent, mtime_ns) VALUES (?, ?, ?, ?)",
+                    (directory, root_id, parent, mtime_ns)
+                )
+                self._conn.execute("DELETE FROM files WHERE directory = ?", (directory,))
+                self._conn.executemany(
+                    "INSERT OR REPLACE INTO files"
+                    " (path, directory, root_id, video_id, mtime, filename_title, sidecar_path)"
+                    " VALUES (?, ?, ?, ?, ?, ?, ?)",
+                    [(r["path"], directory, root_id, r["video_id"], r["mtime"],
+                      r["filename_title"], r["sidecar_path"]) for r in records]
+                )
+        current = {record["path"] for record in records}
+        added = [record for record in records if record["path"] not in old]
+        gone = [{"video_id": video_id, "path": path, "directory": directory, "mtime": mtime}
+                for path, (video_id, mtime) in old.items() if path not in current]
+        return added, gone
+
+    def _drop_directories(self, directories):
+        removed = []
+        with self._lock:
+            with self._conn:
+                for directory in directories:
+                    removed.extend(
+                        {"video_id": video_id, "path": path, "directory": directory, "mtime": mtime}
+                        for path, video_id, mtime in self._conn.execute(
+                            "SELECT path, video_id, mtime FROM files WHERE directory = ?", (directory,))
+                    )
+                    self._conn.execute("DELETE FROM files WHERE directory = ?", (directory,))
+                    self._conn.execute("DELETE FROM directories WHERE path = ?", (directory,))
+        return removed
+
+    def close(self):
+        with self._lock:
+            self._conn.close()
@@ -0,0 +1,112 @@
+import heapq
+import itertools
+import threading
+
+VISIBLE = 0
+PREFETCH = 1
+BACKGROUND = 2
+FILTERED_OUT = 3
+
+class LoadScheduler:
+    """Thread-safe priority queue of videos waiting to be fetched.
+
+    Every pending video has a base priority, (BACKGROUND, rank in the
+    current view order) or (FILTERED_OUT, ...) when the search hides it,
+    and may carry a temporary boost to VISIBLE / PREFETCH while it is on or
+    near the screen. Changing a priority pushes a new heap entry; stale
+    entries are skipped when popped.
+    """
+
+    def __init__(self):
+        self._heap = []
+        self._pending = {}
+        self._base = {}
+        self._boosted = {}
+        self._counter = itertools.count()
+        self._closed = False
+        self._condition = threading.Condition()
+
+    def __len__(self):
+        with self._condition:
+            return len(self._pending)
+
+    def _push(self, video_id, priority):
+        entry = (priority, next(self._counter), video_id)
+        self._pending[video_id] = (entry, self._pending[video_id][1])
+        heapq.heappush(self._heap, entry)
+
+    def add(self, videos):
+        """Queues videos behind everything already queued at the same level."""
+        with self._condition:
+            for video in videos:
+                video_id = video["video_id"]
+                if video_id in self._pending:
+                    continue
+                priority = (BACKGROUND, next(self._counter))
+                self._base[video_id] = priority
+                self._pending[video_id] = (None, video)
+                self._push(video_id, priority)
+            self._condition.notify_all()
+
+    def set_base_order(self, ordered_ids, hidden_ids=()):
+        """Re-ranks pending videos after a sort or filter change."""
+        with self._condition:
+            for rank, video_id in enumerate(ordered_ids):
+                self._set_base(video_id, (BACKGROUND, rank))
+            for rank, video_id in enumerate(hidden_ids):
+                self._set_base(video_id, (FILTERED_OUT, rank))
+
+    def _set_base(self, video_id, priority):
+        if video_id not in self._pending:
+            return
+        self._base[video_id] = priority
+        if video_id not in self._boosted:
+            self._push(video_id, priority)
+
+    def boost(self, priorities):
+        """Sets {video_id: (VISIBLE | PREFETCH, rank)} for the rows around the
+        viewport; videos boosted by the previous call fall back to their base."""
+        with self._condition:
+            for video_id in list(self._boosted):
+                if video_id not in priorities:
+                    del self._boosted[video_id]
+                    if video_id in self._pending:
+                        self._push(video_id, self._base[video_id])
+            for video_id, priority in priorities.items():
+                if video_id in self._pending and self._boosted.get(video_id) != priority:
+                    self._boosted[video_id] = priority
+                    self._push(video_id, priority)
+            self._condition.notify_all()
+
+    def take(self):
+        """Blocks for the most urgent video; None once closed and drained."""
+        with self._condition:
+            while True:
+                while self._heap:
+                    entry = heapq.heappop(self._heap)
+                    video_id = entry[2]
+                    current = self._pending.get(video_id)
+                    if current is None or current[0] is not entry:
+                        continue
+                    del self._pending[video_id]
+                    self._base.pop(video_id, None)
+                    self._boosted.pop(video_id, None)
+                    return current[1]
+                if self._closed:
+                    return None
+                self._condition.wait()
+
+    def close(self):
+        """No more videos will be added; also wakes idle workers to exit."""
+        with self._condition:
+            self._closed = True
+            self._condition.notify_all()
+
+    def clear(self):
+        with self._condition:
+            self._heap.clear()
+            self._pending.clear()
+            self._base.clear()
+            self._boosted.clear()
+            self._closed = True
+            self._condition.notify_all()
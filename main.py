@@ -1,12 +1,32 @@
 import sys
-from PyQt5.QtWidgets import QApplication
-from subtitle_viewer import SubtitleViewer
-from theme import get_black_white_theme
 
-if __name__ == "__main__":
+def run_viewer(profile_startup=False):
+    import startup_profile
+    if profile_startup:
+        startup_profile.start()
+    from PyQt5.QtWidgets import QApplication
+    startup_profile.mark("Qt imported")
+    from subtitle_viewer import SubtitleViewer
+    from theme import get_black_white_theme
+    startup_profile.mark("viewer imported")
+
     app = QApplication(sys.argv)
     app.setStyleSheet(get_black_white_theme())
+    startup_profile.mark("application created")
     viewer = SubtitleViewer()
+    startup_profile.mark("viewer created")
+    if profile_startup:
+        startup_profile.report_after_first_paint(viewer.list_view.viewport())
     viewer.show()
-    sys.exit(app.exec_())
-    
\ No newline at end of file
+    startup_profile.mark("window shown")
+    return app.exec_()
+
+if __name__ == "__main__":
+    if len(sys.argv) > 1 and sys.argv[1] == "prefetch":
+        # Headless; never imports Qt
+        from prefetch import main as prefetch
+        sys.exit(prefetch(sys.argv[2:]))
+    profile_startup = "--profile-startup" in sys.argv
+    if profile_startup:
+        sys.argv.remove("--profile-startup")
+    sys.exit(run_viewer(profile_startup))
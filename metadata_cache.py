@@ -0,0 +1,97 @@
+import os
+import sqlite3
+import threading
+import time
+
+import settings
+
+STATUS_OK = "ok"
+STATUS_MISSING = "missing"
+UNKNOWN_DATE = "Unknown Date"
+
+class MetadataCache:
+    """Persistent video_id -> (title, upload_date) store backed by SQLite.
+
+    Entries younger than their TTL are served without touching the network.
+    Videos that turned out to be dead or private are cached negatively with
+    a shorter TTL so they are not refetched on every open either.
+    """
+
+    def __init__(self, path=None, ttl=None, negative_ttl=None):
+        if path is None:
+            path = os.path.join(settings.CACHE_DIR, "metadata.sqlite3")
+        os.makedirs(os.path.dirname(path), exist_ok=True)
+        self.path = path
+        self.ttl = settings.METADATA_TTL if ttl is None else ttl
+        self.negative_ttl = settings.METADATA_NEGATIVE_TTL if negative_ttl is None else negative_ttl
+        self._lock = threading.Lock()
+        self._conn = sqlite3.connect(path, check_same_thread=False)
+        self._conn.execute("PRAGMA journal_mode=WAL")
+        self._conn.execute("PRAGMA synchronous=NORMAL")
+        self._conn.execute(
+            "CREATE TABLE IF NOT EXISTS videos ("
+            " video_id TEXT PRIMARY KEY,"
+            " title TEXT,"
+            " upload_date TEXT,"
+            " status TEXT NOT NULL,"
+            " first_fetched REAL NOT NULL,"
+            " last_fetched REAL NOT NULL)"
+        )
+        self._conn.commit()
+
+    def get(self, video_id, allow_stale=False):
+        """Return the cached entry as a dict, or None if absent or expired."""
+        with self._lock:
+            row = self._conn.execute(
+                "SELECT title, upload_date, status, last_fetched FROM videos WHERE video_id = ?",
+                (video_id,)
+            ).fetchone()
+        if row is None:
+            return None
+        title, upload_date, status, last_fetched = row
+        # Entries missing their date are retried as soon as dead videos are
+        ttl = self.ttl if status == STATUS_OK and upload_date != UNKNOWN_DATE else self.negative_ttl
+        if not allow_stale and time.time() - last_fetched > ttl:
+            return None
+        return {
+            "video_id": video_id,
+            "title": title,
+            "upload_date": upload_date,
+            "status": status,
+            "last_fetched": last_fetched,
+        }
+
+    def put(self, video_id, title, upload_date):
+        self._store(video_id, title, upload_date, STATUS_OK)
+
+    def put_missing(self, video_id):
+        """Remember that a video is unavailable (deleted, private, ...)."""
+        self._store(video_id, None, None, STATUS_MISSING)
+
+    def _store(self, video_id, title, upload_date, status):
+        now = time.time()
+        with self._lock:
+            self._conn.execute(
+                "INSERT INTO videos (video_id, title, upload_date, status, first_fetched, last_fetched)"
+                " VALUES (?, ?, ?, ?, ?, ?)"
+                " ON CONFLICT(video_id) DO UPDATE SET"
+                " title = excluded.title, upload_date = excluded.upload_date,"
+                " status = excluded.status, last_fetched = excluded.last_fetched",
+                (video_id, title, upload_date, status, now, now)
+            )
+            self._conn.commit()
+
+    def invalidate(self, video_ids=None):
+        """Drop entries so they are refetched; all entries if video_ids is None."""
+        with self._lock:
+            if video_ids is None:
+                self._conn.execute("DELETE FROM videos")
+            else:
+                self._conn.executemany(
+                    "DELETE FROM videos WHERE video_id = ?", [(v,) for v in video_ids]
+                )
+            self._conn.commit()
+
+    def close(self):
+        with self._lock:
+            self._conn.close()
@@ -0,0 +1,171 @@
+import json
+
+import instrumentation
+import settings
+from watch_page import fetch_watch_metadata
+
+class VideoUnavailableError(Exception):
+    """Raised when a source says the video is deleted or private."""
+
+class MetadataProvider:
+    """One source of video metadata.
+
+    fetch() returns a dict with whichever of "title" / "upload_date" it
+    knows, None when it has nothing, and raises VideoUnavailableError when
+    it can tell for certain the video is gone.
+    """
+    name = "base"
+    # What fetch() can answer; the chain skips a provider with nothing left to add
+    fields = ("title", "upload_date")
+    # Whether fetch() costs a request
+    remote = False
+
+    def fetch(self, video):
+        raise NotImplementedError
+
+class SidecarProvider(MetadataProvider):
+    """Reads the yt-dlp .info.json written next to the subtitle file."""
+    name = "sidecar"
+
+    def fetch(self, video):
+        path = video.get("sidecar_path")
+        if not path:
+            return None
+        try:
+            with open(path, encoding="utf-8") as f:
+                info = json.load(f)
+        except (OSError, ValueError):
+            return None
+        result = {}
+        title = info.get("title") or info.get("fulltitle")
+        if title:
+            result["title"] = title
+        upload_date = info.get("upload_date")
+        if upload_date and len(upload_date) == 8 and upload_date.isdigit():
+            result["upload_date"] = f"{upload_date[:4]}-{upload_date[4:6]}-{upload_date[6:]}"
+        return result or None
+
+class FilenameProvider(MetadataProvider):
+    """Uses the title embedded in the file name, e.g. "Title [id].srt"."""
+    name = "filename"
+    fields = ("title",)
+
+    def fetch(self, video):
+        title = video.get("filename_title")
+        return {"title": title} if title else None
+
+class OEmbedProvider(MetadataProvider):
+    """YouTube's oEmbed endpoint: a few hundred bytes of JSON, title only."""
+    name = "oembed"
+    fields = ("title",)
+    remote = True
+
+    def __init__(self, engine):
+        self.engine = engine
+
+    def fetch(self, video):
+        response = self.engine.get(
+            f"{settings.YOUTUBE_BASE_URL}/oembed",
+            params={"url": f"https://www.youtube.com/watch?v={video['video_id']}", "format": "json"}
+        )
+        if response.status_code == 404:
+            raise VideoUnavailableError(video["video_id"])
+        if not response.ok:
+            # 401/403: private or embedding disabled, let the page scrape decide
+            return None
+        with instrumentation.span("parse.oembed"):
+            title = response.json().get("title")
+        return {"title": title} if title else None
+
+class WatchPageProvider(MetadataProvider):
+    """Scrapes the watch page; the only source of the upload date online."""
+    name = "watch_page"
+    remote = True
+
+    def __init__(self, engine):
+        self.engine = engine
+
+    def fetch(self, video):
+        video_id = video["video_id"]
+        response = self.engine.get(f"{settings.YOUTUBE_BASE_URL}/watch?v={video_id}", stream=True)
+        if response.status_code == 404:
+            response.close()
+            raise VideoUnavailableError(video_id)
+        if not response.ok:
+            response.close()
+            response.raise_for_status()
+
+        # Streams the page, so this is download and scan together
+        with instrumentation.span("parse.watch_page"):
+            title, upload_date, _ = fetch_watch_metadata(response)
+
+        # Deleted and private videos still serve a page, titled just "YouTube"
+        if title == "YouTube" and upload_date is None:
+            raise VideoUnavailableError(video_id)
+
+        result = {}
+        if title:
+            result["title"] = title
+        if upload_date:
+            result["upload_date"] = upload_date
+        return result
+
+PROVIDER_TYPES = {
+    "sidecar": SidecarProvider,
+    "filename": FilenameProvider,
+    "oembed": OEmbedProvider,
+    "watch_page": WatchPageProvider,
+}
+
+def create_providers(engine, names=None):
+    """Instantiates providers by name, in order (settings.METADATA_PROVIDERS by default)."""
+    providers = []
+    for name in (settings.METADATA_PROVIDERS if names is None else names):
+        provider_type = PROVIDER_TYPES[name.strip()]
+        if provider_type in (OEmbedProvider, WatchPageProvider):
+            providers.append(provider_type(engine))
+        else:
+            providers.append(provider_type())
+    return providers
+
+class ProviderChain:
+    """Asks providers in order, merging their answers, until every required
+    field is known. Cheap local sources go first so most videos never reach
+    the network, and a request is skipped when a later provider that has to
+    be asked anyway would answer everything it could."""
+
+    def __init__(self, providers, required_fields=None):
+        self.providers = providers
+        self.required_fields = [f.strip() for f in (
+            settings.METADATA_REQUIRED_FIELDS if required_fields is None else required_fields)]
+
+    def resolve(self, video):
+        """(title, upload_date). A required field that stays unknown because
+        a provider failed raises that failure rather than returning a
+        placeholder, so the fetch is retried instead of cached."""
+        result = {}
+        last_error = None
+        for index, provider in enumerate(self.providers):
+            missing = {field for field in self.required_fields if field not in result}
+            if not missing:
+                break
+            if not missing & set(provider.fields):
+                continue
+            if provider.remote and not missing <= set(provider.fields) and any(
+                    missing <= set(later.fields) for later in self.providers[index + 1:]):
+                continue
+            try:
+                found = provider.fetch(video)
+            except VideoUnavailableError:
+                raise
+            except Exception as e:
+                # A broken source should not hide what the next one knows
+                last_error = e
+                continue
+            if found:
+                for key, value in found.items():
+                    result.setdefault(key, value)
+
+        if last_error is not None and any(field not in result for field in self.required_fields):
+            raise last_error
+        return result.get("title", "Unknown Title"), result.get("upload_date", "Unknown Date")
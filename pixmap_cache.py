@@ -0,0 +1,151 @@
+from collections import OrderedDict
+from PyQt5.QtGui import QPixmap, QImage
+from PyQt5.QtCore import Qt
+
+import instrumentation
+import settings
+
+# Thumbnail widths kept in memory. A request is served from the smallest
+# level at least as wide, and the painter scales that down to the exact size.
+LEVELS = (160, 240, 320, 480)
+
+def level_for(width):
+    for level in LEVELS:
+        if level >= width:
+            return level
+    return LEVELS[-1]
+
+def decode_thumbnail(data):
+    """Decodes a thumbnail JPEG into a QImage, cropping the letterbox bars
+    of the 4:3 variants (default, hqdefault, sddefault) to 16:9.
+
+    Only touches QImage, so it is safe on worker threads.
+    """
+    image = QImage()
+    with instrumentation.span("decode"):
+        if not image.loadFromData(data):
+            return None
+    width, height = image.width(), image.height()
+    if width * 3 == height * 4:
+        cropped = width * 9 // 16
+        image = image.copy(0, (height - cropped) // 2, width, cropped)
+    return image
+
+def pixmap_bytes(pixmap):
+    return pixmap.width() * pixmap.height() * max(pixmap.depth(), 8) // 8
+
+class PixmapCache:
+    """LRU cache of scaled thumbnails for every video, bounded in bytes.
+
+    Entries are keyed by (video_id, level). The catalog keeps only the
+    encoded JPEG bytes, so an evicted entry is rebuilt by decoding those again.
+    Entries scaled with FastTransformation are listed in fast_keys until a
+    smooth one replaces them.
+    """
+
+    def __init__(self, budget_bytes=None):
+        self.budget_bytes = settings.PIXMAP_CACHE_BYTES if budget_bytes is None else budget_bytes
+        self.entries = OrderedDict()
+        self.fast_keys = set()
+        self.used_bytes = 0
+        self.hits = 0
+        self.misses = 0
+
+    def __contains__(self, key):
+        return key in self.entries
+
+    def has_smooth(self, video_id, level):
+        key = (video_id, level)
+        return key in self.entries and key not in self.fast_keys
+
+    def get(self, video_id, level):
+        key = (video_id, level)
+        pixmap = self.entries.get(key)
+        if pixmap is None:
+            self.misses += 1
+            return None
+        self.hits += 1
+        self.entries.move_to_end(key)
+        return pixmap
+
+    def put(self, video_id, level, pixmap, fast=False):
+        key = (video_id, level)
+        if fast:
+            self.fast_keys.add(key)
+        else:
+            self.fast_keys.discard(key)
+        old = self.entries.pop(key, None)
+        if old is not None:
+            self.used_bytes -= pixmap_bytes(old)
+        self.entries[key] = pixmap
+        self.used_bytes += pixmap_bytes(pixmap)
+        while self.used_bytes > self.budget_bytes and len(self.entries) > 1:
+            evicted_key, evicted = self.entries.popitem(last=False)
+            self.fast_keys.discard(evicted_key)
+            self.used_bytes -= pixmap_bytes(evicted)
+
+    def discard(self, video_id):
+        for level in LEVELS:
+            pixmap = self.entries.pop((video_id, level), None)
+            self.fast_keys.discard((video_id, level))
+            if pixmap is not None:
+                self.used_bytes -= pixmap_bytes(pixmap)
+
+    def clear(self):
+        self.entries.clear()
+        self.fast_keys.clear()
+        self.used_bytes = 0
+
+    def nearest(self, video_id, level):
+        """Any cached level of video_id, preferring the closest at or above
+        `level`; used while resizing so no row has to be decoded again."""
+        above = [l for l in LEVELS if l >= level]
+        below = [l for l in reversed(LEVELS) if l < level]
+        for candidate in above + below:
+            pixmap = self.entries.get((video_id, candidate))
+            if pixmap is not None:
+                self.entries.move_to_end((video_id, candidate))
+                return pixmap
+        return None
+
+    def thumbnail(self, video_id, data, width, fast=False):
+        """The cached pixmap for video_id at width's level, built on a miss
+        from its encoded bytes `data`; None when the video has no image.
+
+        With `fast`, any cached level is accepted and a miss is scaled with
+        FastTransformation and marked fast, so the rescaler still replaces it
+        with a smooth one.
+        """
+        level = level_for(width)
+        pixmap = self.get(video_id, level)
+        if pixmap is not None:
+            return pixmap
+        if fast:
+            pixmap = self.nearest(video_id, level)
+            if pixmap is not None:
+                return pixmap
+        if not data:
+            return None
+        image = decode_thumbnail(data)
+        if image is None:
+            return None
+        return self.add_scaled(video_id, image, level, fast)
+
+    def add_scaled(self, video_id, image, level, fast=False):
+        """Scales a full-size QImage / QPixmap to `level` and caches it."""
+        with instrumentation.span("scale.fast" if fast else "scale"):
+            scaled = image.scaledToWidth(level, Qt.FastTransformation if fast else Qt.SmoothTransformation)
+        pixmap = QPixmap.fromImage(scaled) if isinstance(scaled, QImage) else scaled
+        self.put(video_id, level, pixmap, fast)
+        return pixmap
+
+    def stats(self):
+        lookups = self.hits + self.misses
+        return {
+            "entries": len(self.entries),
+            "used_bytes": self.used_bytes,
+            "budget_bytes": self.budget_bytes,
+            "hits": self.hits,
+            "misses": self.misses,
+            "hit_rate": self.hits / lookups if lookups else 0.0,
+        }
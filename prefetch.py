@@ -0,0 +1,148 @@
+"""Headless cache warm-up: `python main.py prefetch <folder> [--jobs N] [--json]`.
+
+Scans a folder the same way the viewer does and fetches every video's
+metadata and thumbnail into the persistent caches, without Qt, so the next
+time the viewer opens the folder it is served from disk.
+"""
+import argparse
+import json
+import os
+import sys
+import time
+from concurrent.futures import ThreadPoolExecutor
+
+import settings
+from fetch_engine import FetchEngine
+from metadata_cache import MetadataCache, STATUS_MISSING
+from metadata_providers import VideoUnavailableError
+from thumbnail_cache import ThumbnailCache
+from thumbnail_variants import THUMBNAIL_VARIANTS, thumbnail_url
+from utils import scan_subtitle_files
+from video_fetcher import VideoFetcher
+
+def prefetch_video(fetcher, video, variant):
+    """Fetches one video; returns its metadata / thumbnail outcome and latency.
+
+    Outcomes are "hit" (served fresh from cache), "miss" (fetched),
+    "stale" (cached but revalidated or refetched), "unavailable" or "failed".
+    """
+    video_id = video["video_id"]
+    started = time.perf_counter()
+    result = {"video_id": video_id, "metadata": None, "thumbnail": None}
+
+    cached = None if fetcher.force_refresh else fetcher.metadata_cache.get(video_id)
+    try:
+        fetcher.get_video_info(video)
+        result["metadata"] = "hit" if cached is not None else "miss"
+    except VideoUnavailableError:
+        result["metadata"] = "hit" if cached is not None and cached["status"] == STATUS_MISSING else "unavailable"
+    except Exception as e:
+        result["metadata"] = "failed"
+        result["error"] = str(e)
+
+    entry = fetcher.thumbnail_cache.lookup(thumbnail_url(video_id, variant))
+    try:
+        fetcher.fetch_thumbnail_bytes(video_id, variant)
+        if entry is None:
+            result["thumbnail"] = "miss"
+        else:
+            result["thumbnail"] = "hit" if entry["fresh"] and not fetcher.force_refresh else "stale"
+    except Exception as e:
+        result["thumbnail"] = "failed"
+        result.setdefault("error", str(e))
+
+    result["seconds"] = time.perf_counter() - started
+    return result
+
+def percentile(values, fraction):
+    if not values:
+        return 0.0
+    values = sorted(values)
+    return values[min(len(values) - 1, int(fraction * len(values)))]
+
+def summarize(results, scan_seconds, fetch_seconds, folder, jobs):
+    def counts(field):
+        tally = {}
+        for result in results:
+            tally[result[field]] = tally.get(result[field], 0) + 1
+        return tally
+
+    latencies = [result["seconds"] for result in results]
+    return {
+        "folder": folder,
+        "videos": len(results),
+        "jobs": jobs,
+        "metadata": counts("metadata"),
+        "thumbnail": counts("thumbnail"),
+        "failures": [
+            {"video_id": r["video_id"], "error": r.get("error", r["metadata"])}
+            for r in results if "failed" in (r["metadata"], r["thumbnail"])
+        ],
+        "timings": {
+            "scan_seconds": round(scan_seconds, 3),
+            "fetch_seconds": round(fetch_seconds, 3),
+            "per_video_p50": round(percentile(latencies, 0.5), 4),
+            "per_video_p95": round(percentile(latencies, 0.95), 4),
+            "per_video_max": round(max(latencies, default=0.0), 4),
+        },
+    }
+
+def print_report(report):
+    def line(label, tally):
+        parts = ", ".join(f"{key} {value}" for key, value in sorted(tally.items()))
+        print(f"  {label:<10} {parts or '-'}")
+
+    timings = report["timings"]
+    print(f"{report['folder']}: {report['videos']} videos, {report['jobs']} jobs")
+    line("metadata", report["metadata"])
+    line("thumbnail", report["thumbnail"])
+    print(f"  scan {timings['scan_seconds']:.2f}s, fetch {timings['fetch_seconds']:.2f}s, "
+          f"per video p50 {timings['per_video_p50'] * 1000:.0f}ms / p95 {timings['per_video_p95'] * 1000:.0f}ms")
+    for failure in report["failures"]:
+        print(f"  failed {failure['video_id']}: {failure['error']}")
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(prog="main.py prefetch", description="Warm the metadata and thumbnail caches for a folder of SRT files.")
+    parser.add_argument("folder")
+    parser.add_argument("--jobs", type=int, default=settings.FETCH_JOBS, help="parallel fetches (default %(default)s)")
+    parser.add_argument("--recursive", action="store_true", default=settings.SCAN_RECURSIVE, help="include subfolders")
+    parser.add_argument("--variant", choices=list(THUMBNAIL_VARIANTS), default="mqdefault",
+                        help="thumbnail size to fetch (default %(default)s)")
+    parser.add_argument("--force", action="store_true", help="ignore cached entries and fetch everything again")
+    parser.add_argument("--json", action="store_true", help="print the report as JSON")
+    args = parser.parse_args(argv)
+
+    if not os.path.isdir(args.folder):
+        parser.error(f"not a folder: {args.folder}")
+
+    started = time.perf_counter()
+    videos = [video for batch in scan_subtitle_files(args.folder, args.recursive) for video in batch]
+    scan_seconds = time.perf_counter() - started
+
+    engine = FetchEngine(jobs=args.jobs)
+    metadata_cache = MetadataCache()
+    thumbnail_cache = ThumbnailCache()
+    fetcher = VideoFetcher(engine, metadata_cache, thumbnail_cache, force_refresh=args.force)
+    started = time.perf_counter()
+    try:
+        with ThreadPoolExecutor(max_workers=engine.jobs) as pool:
+            results = list(pool.map(lambda video: prefetch_video(fetcher, video, args.variant), videos))
+    except KeyboardInterrupt:
+        engine.cancel()
+        raise
+    finally:
+        engine.close()
+        metadata_cache.close()
+        thumbnail_cache.close()
+    fetch_seconds = time.perf_counter() - started
+
+    report = summarize(results, scan_seconds, fetch_seconds, os.path.abspath(args.folder), engine.jobs)
+    if args.json:
+        json.dump(report, sys.stdout, ensure_ascii=False, indent=2)
+        print()
+    else:
+        print_report(report)
+    return 0
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,94 @@
+import unicodedata
+from collections import defaultdict
+
+# Katakana ァ..ヶ sit exactly 0x60 code points above their hiragana
+KATAKANA_TO_HIRAGANA = {code: code - 0x60 for code in range(0x30A1, 0x30F7)}
+
+def normalize(text):
+    """Folds text for matching: NFKC (full-width ASCII -> ASCII, half-width
+    kana -> full-width), case folding, and katakana -> hiragana."""
+    return unicodedata.normalize("NFKC", text).casefold().translate(KATAKANA_TO_HIRAGANA)
+
+def bigrams(text):
+    return {text[i:i + 2] for i in range(len(text) - 1)}
+
+class SearchIndex:
+    """Character n-gram inverted index over titles, keyed by any hashable.
+
+    Single characters and bigrams are indexed; a query intersects the
+    posting sets of its bigrams starting from the rarest, then confirms the
+    candidates with a substring check. Refining the previous query only
+    re-checks the previous results.
+    """
+
+    def __init__(self):
+        self.texts = {}
+        self.chars = defaultdict(set)
+        self.grams = defaultdict(set)
+        self.last_query = None
+        self.last_results = None
+
+    def __len__(self):
+        return len(self.texts)
+
+    def clear(self):
+        self.texts.clear()
+        self.chars.clear()
+        self.grams.clear()
+        self.last_query = None
+        self.last_results = None
+
+    def set(self, key, text):
+        text = normalize(text)
+        old = self.texts.get(key)
+        if old == text:
+            return
+        if old is not None:
+            self._unindex(key, old)
+        self.texts[key] = text
+        for char in set(text):
+            self.chars[char].add(key)
+        for gram in bigrams(text):
+            self.grams[gram].add(key)
+        self.last_query = None
+
+    def remove(self, key):
+        old = self.texts.pop(key, None)
+        if old is not None:
+            self._unindex(key, old)
+            self.last_query = None
+
+    def _unindex(self, key, text):
+        for char in set(text):
+            self.chars[char].discard(key)
+        for gram in bigrams(text):
+            self.grams[gram].discard(key)
+
+    def search(self, query):
+        """Keys whose text contains query; None for an empty query (no filter)."""
+        query = normalize(query)
+        if not query:
+            return None
+
+        if self.last_query is not None and self.last_query in query:
+            # Anything matching the longer query matched the previous one
+            candidates = self.last_results
+        elif len(query) == 1:
+            candidates = self.chars.get(query, set())
+        else:
+            postings = sorted((self.grams.get(gram, set()) for gram in bigrams(query)), key=len)
+            candidates = postings[0]
+            for posting in postings[1:]:
+                if not candidates:
+                    break
+                candidates = candidates & posting
+
+        if len(query) <= 2 and candidates is not self.last_results:
+            results = set(candidates)
+        else:
+            texts = self.texts
+            results = {key for key in candidates if query in texts[key]}
+
+        self.last_query = query
+        self.last_results = results
+        return results
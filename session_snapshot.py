@@ -0,0 +1,117 @@
+import ctypes
+import json
+import mmap
+import os
+from PyQt5 import sip
+from PyQt5.QtCore import Qt
+from PyQt5.QtGui import QImage
+
+import settings
+
+SNAPSHOT_VERSION = 2
+SNAPSHOT_FILE = "session.json"
+# Each atlas gets a fresh name, recorded in the snapshot written with it
+ATLAS_PREFIX = "atlas"
+ATLAS_SUFFIX = ".rgb"
+
+class ThumbnailAtlas:
+    """Fixed-size RGB888 thumbnail tiles packed into one memory-mapped file.
+
+    image() wraps a tile in a QImage pointing straight into the mapping,
+    so nothing is read, copied or decoded until a tile is painted. The
+    mapping is copy-on-write, which lets ctypes take its address; tiles are
+    never written to.
+    """
+
+    FORMAT = QImage.Format_RGB888
+
+    def __init__(self, path, width, height):
+        self.width = width
+        self.height = height
+        self.stride = width * 3
+        self.tile_bytes = self.stride * height
+        self._file = open(path, "rb")
+        self._map = mmap.mmap(self._file.fileno(), 0, access=mmap.ACCESS_COPY)
+        self._buffer = ctypes.c_char.from_buffer(self._map)
+        self._address = ctypes.addressof(self._buffer)
+        self.count = len(self._map) // self.tile_bytes
+
+    def image(self, index):
+        if not 0 <= index < self.count:
+            return None
+        pointer = sip.voidptr(self._address + index * self.tile_bytes)
+        return QImage(pointer, self.width, self.height, self.stride, self.FORMAT)
+
+    def close(self):
+        """Unmaps the file; every QImage from image() must be gone by now."""
+        del self._buffer
+        self._map.close()
+        self._file.close()
+
+    @classmethod
+    def write(cls, path, images, width, height):
+        """Writes QImages as tiles in order, scaled to width x height;
+        returns how many were written."""
+        count = 0
+        with open(path, "wb") as f:
+            for count, image in enumerate(images, 1):
+                tile = image.scaled(width, height, Qt.IgnoreAspectRatio, Qt.SmoothTransformation)
+                tile = tile.convertToFormat(cls.FORMAT)
+                bits = tile.constBits()
+                bits.setsize(tile.sizeInBytes())
+                data = bits.asstring()
+                if tile.bytesPerLine() == width * 3:
+                    f.write(data)
+                else:
+                    for y in range(height):
+                        start = y * tile.bytesPerLine()
+                        f.write(data[start:start + width * 3])
+        return count
+
+def save_session(snapshot, tiles, tile_size, directory=None):
+    """Writes the snapshot dict and its atlas. `tiles` yields the atlas
+    QImages in order and may fill in snapshot["tiles"] as it goes, since the
+    snapshot is serialized after the atlas. The snapshot is swapped in
+    atomically and names its atlas, so it never pairs with another one."""
+    directory = settings.SESSION_DIR if directory is None else directory
+    os.makedirs(directory, exist_ok=True)
+    atlas_file = f"{ATLAS_PREFIX}-{os.urandom(8).hex()}{ATLAS_SUFFIX}"
+    snapshot_path = os.path.join(directory, SNAPSHOT_FILE)
+    count = ThumbnailAtlas.write(os.path.join(directory, atlas_file), tiles, *tile_size)
+    snapshot = dict(snapshot, version=SNAPSHOT_VERSION, tile_size=list(tile_size),
+                    atlas=atlas_file, atlas_tiles=count)
+    with open(snapshot_path + ".tmp", "w", encoding="utf-8") as f:
+        json.dump(snapshot, f, ensure_ascii=False, separators=(",", ":"))
+    os.replace(snapshot_path + ".tmp", snapshot_path)
+    # Earlier atlases; one still mapped may not be removable on Windows and
+    # goes with the next save instead
+    for name in os.listdir(directory):
+        if name.startswith(ATLAS_PREFIX) and name.endswith(ATLAS_SUFFIX) and name != atlas_file:
+            try:
+                os.remove(os.path.join(directory, name))
+            except OSError:
+                pass
+
+def load_session(roots, directory=None):
+    """(snapshot dict, ThumbnailAtlas or None) for the given library roots,
+    or (None, None) when there is no usable snapshot for them."""
+    directory = settings.SESSION_DIR if directory is None else directory
+    try:
+        with open(os.path.join(directory, SNAPSHOT_FILE), encoding="utf-8") as f:
+            snapshot = json.load(f)
+    except (OSError, ValueError):
+        return None, None
+    if snapshot.get("version") != SNAPSHOT_VERSION or snapshot.get("roots") != roots:
+        return None, None
+    atlas = None
+    if snapshot["atlas_tiles"]:
+        try:
+            atlas = ThumbnailAtlas(os.path.join(directory, snapshot["atlas"]), *snapshot["tile_size"])
+        except (OSError, ValueError):
+            atlas = None
+        if atlas is not None and atlas.count != snapshot["atlas_tiles"]:
+            atlas.close()
+            atlas = None
+    if atlas is None:
+        snapshot["tiles"] = [-1] * len(snapshot["ids"])
+    return snapshot, atlas
@@ -0,0 +1,61 @@
+import os
+
+# All tunables can be overridden through environment variables so the viewer,
+# the benchmarks and cron jobs can point at different caches.
+
+APP_DIR = os.path.dirname(os.path.abspath(__file__))
+
+CACHE_DIR = os.environ.get("SRT_VIEWER_CACHE_DIR", os.path.join(APP_DIR, "cache"))
+
+# Metadata (title / upload date) is revalidated after this many seconds.
+METADATA_TTL = int(os.environ.get("SRT_VIEWER_METADATA_TTL", 30 * 24 * 3600))
+# Dead / private videos are retried after this many seconds.
+METADATA_NEGATIVE_TTL = int(os.environ.get("SRT_VIEWER_METADATA_NEGATIVE_TTL", 24 * 3600))
+
+THUMBNAIL_CACHE_DIR = os.environ.get(
+    "SRT_VIEWER_THUMBNAIL_CACHE_DIR", os.path.join(CACHE_DIR, "thumbnails"))
+THUMBNAIL_CACHE_MAX_BYTES = int(os.environ.get("SRT_VIEWER_THUMBNAIL_CACHE_MAX_BYTES", 512 * 1024 * 1024))
+# Cached thumbnails older than this are revalidated with a conditional request.
+THUMBNAIL_TTL = int(os.environ.get("SRT_VIEWER_THUMBNAIL_TTL", 7 * 24 * 3600))
+
+# Where metadata and thumbnails are fetched from; the benchmarks point these
+# at a local stand-in server
+YOUTUBE_BASE_URL = os.environ.get("SRT_VIEWER_YOUTUBE_BASE_URL", "https://www.youtube.com").rstrip("/")
+THUMBNAIL_BASE_URL = os.environ.get("SRT_VIEWER_THUMBNAIL_BASE_URL", "https://img.youtube.com").rstrip("/")
+
+# Concurrent fetching
+FETCH_JOBS = int(os.environ.get("SRT_VIEWER_FETCH_JOBS", 16))
+FETCH_TIMEOUT = float(os.environ.get("SRT_VIEWER_FETCH_TIMEOUT", 5))
+FETCH_RETRIES = int(os.environ.get("SRT_VIEWER_FETCH_RETRIES", 3))
+FETCH_BACKOFF = float(os.environ.get("SRT_VIEWER_FETCH_BACKOFF", 0.5))
+# Requests per second allowed against a single host (with a burst of the same size)
+FETCH_RATE_PER_HOST = float(os.environ.get("SRT_VIEWER_FETCH_RATE_PER_HOST", 20))
+
+# Ordered metadata sources, tried until the required fields are known.
+# Available: sidecar, filename, oembed, watch_page
+METADATA_PROVIDERS = os.environ.get(
+    "SRT_VIEWER_METADATA_PROVIDERS", "sidecar,filename,oembed,watch_page").split(",")
+# Later providers are asked until all of these are known; the watch page is
+# the only online source of the upload date, so drop it to save that request.
+METADATA_REQUIRED_FIELDS = os.environ.get(
+    "SRT_VIEWER_METADATA_REQUIRED_FIELDS", "title,upload_date").split(",")
+
+# Whether opening a folder also picks up SRTs in its subfolders by default
+SCAN_RECURSIVE = os.environ.get("SRT_VIEWER_SCAN_RECURSIVE", "0") == "1"
+# Whether loaded folders are watched for added / removed SRTs by default
+WATCH_FOLDERS = os.environ.get("SRT_VIEWER_WATCH_FOLDERS", "1") == "1"
+
+# Memory budget for decoded, scaled thumbnails shared by all rows
+PIXMAP_CACHE_BYTES = int(os.environ.get("SRT_VIEWER_PIXMAP_CACHE_BYTES", 64 * 1024 * 1024))
+
+# Session snapshot written on exit so the last library paints instantly on launch
+SESSION_DIR = os.environ.get("SRT_VIEWER_SESSION_DIR", os.path.join(CACHE_DIR, "session"))
+# Raw thumbnail tiles kept in the snapshot's atlas, nearest the last scroll position first
+SESSION_ATLAS_MAX_BYTES = int(os.environ.get("SRT_VIEWER_SESSION_ATLAS_MAX_BYTES", 128 * 1024 * 1024))
+
+# Timing spans and counters for the diagnostics panel (also toggled from the panel)
+INSTRUMENTATION = os.environ.get("SRT_VIEWER_INSTRUMENTATION", "0") == "1"
+# Most recent spans kept for trace export
+INSTRUMENTATION_MAX_EVENTS = int(os.environ.get("SRT_VIEWER_INSTRUMENTATION_MAX_EVENTS", 200000))
+# GUI event-loop delays longer than this are recorded as stalls
+STALL_THRESHOLD_MS = float(os.environ.get("SRT_VIEWER_STALL_THRESHOLD_MS", 16))
@@ -0,0 +1,71 @@
+import bisect
+import os
+from search_index import normalize
+from stat_fields import STAT_FIELDS
+from video_catalog import REMOVED
+
+# Each mode maps a catalog position to an ascending sort key built from the
+# typed columns. Unknown dates (day 0) sort last in both directions; video
+# ID, then position, break ties.
+SORT_KEYS = {
+    "date_newest": lambda c, p: (c.days[p] == 0, -c.days[p], c.ids[p], p),
+    "date_oldest": lambda c, p: (c.days[p] == 0, c.days[p], c.ids[p], p),
+    "length": lambda c, p: (c.title_lengths[p], c.ids[p], p),
+    "title": lambda c, p: (normalize(c.title(p)), c.ids[p], p),
+    "folder": lambda c, p: (normalize(os.path.dirname(c.paths[p] or "")),
+                            normalize(os.path.basename(c.paths[p] or "")), c.ids[p], p),
+}
+
+def stat_key(field):
+    """Largest first; videos whose subtitles are not analyzed yet sort last."""
+    return lambda c, p: (not c.analyzed[p], -c.stats[field][p], c.ids[p], p)
+
+SORT_KEYS.update({field: stat_key(field) for field in STAT_FIELDS})
+
+class SortEngine:
+    """One sorted order of a VideoCatalog per sort mode.
+
+    An order is built the first time its mode is used and from then on kept
+    sorted by bisect as videos are added, re-keyed or removed, so switching
+    modes or receiving metadata never re-sorts the library. Each order
+    remembers the key it filed a position under, so a position can be
+    moved after the catalog has already changed.
+    """
+
+    def __init__(self, catalog):
+        self.catalog = catalog
+        self.orders = {}
+
+    def clear(self):
+        self.orders = {}
+
+    def key(self, mode, position):
+        return SORT_KEYS[mode](self.catalog, position)
+
+    def set(self, position):
+        """Files a new position, or re-files one whose columns changed."""
+        self.remove(position)
+        for mode, (keys, positions, key_of) in self.orders.items():
+            key = key_of[position] = self.key(mode, position)
+            index = bisect.bisect_right(keys, key)
+            keys.insert(index, key)
+            positions.insert(index, position)
+
+    def remove(self, position):
+        for keys, positions, key_of in self.orders.values():
+            key = key_of.pop(position, None)
+            if key is None:
+                continue
+            index = bisect.bisect_left(keys, key)
+            del keys[index]
+            del positions[index]
+
+    def order(self, mode):
+        """Positions in `mode` order; the list is the engine's own, so copy
+        it before changing it."""
+        if mode not in self.orders:
+            status = self.catalog.status
+            key_of = {p: self.key(mode, p) for p in range(len(status)) if status[p] != REMOVED}
+            ordered = sorted(key_of, key=key_of.__getitem__)
+            self.orders[mode] = ([key_of[p] for p in ordered], ordered, key_of)
+        return self.orders[mode][1]
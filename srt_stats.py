@@ -0,0 +1,113 @@
+import os
+import re
+import sqlite3
+import threading
+import unicodedata
+
+import settings
+from stat_fields import STAT_FIELDS
+from subtitle_index import TAG_RE
+
+TIMING_RE = re.compile(
+    r"(\d+):(\d{2}):(\d{2})[,.](\d{1,3})\s*-->\s*(\d+):(\d{2}):(\d{2})[,.](\d{1,3})")
+KANJI_RE = re.compile(r"[㐀-䶿一-鿿豈-﫿]")
+# Tokenizer-free stand-in for words: runs of kanji, of katakana, of two or
+# more hiragana, and Latin words
+WORD_RE = re.compile(
+    r"[㐀-䶿一-鿿豈-﫿々]+|[ァ-ヺー]+|[ぁ-ゖー]{2,}|[a-z]+(?:'[a-z]+)?")
+
+def timing_ms(h, m, s, ms):
+    return ((int(h) * 60 + int(m)) * 60 + int(s)) * 1000 + int(ms.ljust(3, "0"))
+
+def analyze_srt(path):
+    """Statistics of one SRT file as a tuple in STAT_FIELDS order.
+
+    spoken_ms is the time covered by at least one cue (overlaps counted
+    once), chars counts non-space characters, kanji the distinct kanji, and
+    lines_per_minute the text lines over the span from first to last cue.
+    """
+    intervals = []
+    lines = 0
+    chars = 0
+    kanji = set()
+    words = set()
+    in_cue = False
+    with open(path, encoding="utf-8-sig", errors="replace") as f:
+        for line in f:
+            line = line.strip()
+            if not in_cue:
+                match = TIMING_RE.match(line)
+                if match:
+                    groups = match.groups()
+                    intervals.append((timing_ms(*groups[:4]), timing_ms(*groups[4:])))
+                    in_cue = True
+            elif line:
+                text = unicodedata.normalize("NFKC", TAG_RE.sub("", line)).casefold()
+                lines += 1
+                chars += len(text) - text.count(" ")
+                kanji.update(KANJI_RE.findall(text))
+                words.update(WORD_RE.findall(text))
+            else:
+                in_cue = False
+
+    spoken_ms = 0
+    covered_until = 0
+    for start, end in sorted(intervals):
+        start = max(start, covered_until)
+        if end > start:
+            spoken_ms += end - start
+            covered_until = end
+    span_ms = max((end for _, end in intervals), default=0) - min((start for start, _ in intervals), default=0)
+    lines_per_minute = lines * 60000 / span_ms if span_ms > 0 else 0.0
+    return (len(intervals), spoken_ms, chars, len(kanji), len(words), round(lines_per_minute, 2))
+
+def analyze_file(path):
+    """(path, stats or None); the unit of work sent to the process pool."""
+    try:
+        return path, analyze_srt(path)
+    except OSError:
+        return path, None
+
+class SrtStatsCache:
+    """Per-file statistics in SQLite, valid while the file's size and
+    mtime are unchanged."""
+
+    def __init__(self, path=None):
+        if path is None:
+            path = os.path.join(settings.CACHE_DIR, "srt_stats.sqlite3")
+        os.makedirs(os.path.dirname(path), exist_ok=True)
+        self._lock = threading.Lock()
+        self._conn = sqlite3.connect(path, check_same_thread=False)
+        self._conn.execute("PRAGMA journal_mode=WAL")
+        self._conn.execute("PRAGMA synchronous=NORMAL")
+        self._conn.execute(
+            "CREATE TABLE IF NOT EXISTS stats ("
+            " path TEXT PRIMARY KEY, size INTEGER NOT NULL, mtime REAL NOT NULL,"
+            " cues INTEGER NOT NULL, spoken_ms INTEGER NOT NULL, chars INTEGER NOT NULL,"
+            " kanji INTEGER NOT NULL, vocabulary INTEGER NOT NULL, lines_per_minute REAL NOT NULL)"
+        )
+        self._conn.commit()
+
+    def lookup(self, files):
+        """{path: stats} for the (path, size, mtime) entries still current."""
+        wanted = {path: (size, mtime) for path, size, mtime in files}
+        found = {}
+        with self._lock:
+            rows = self._conn.execute(f"SELECT path, size, mtime, {', '.join(STAT_FIELDS)} FROM stats")
+            for path, size, mtime, *stats in rows:
+                if wanted.get(path) == (size, mtime):
+                    found[path] = tuple(stats)
+        return found
+
+    def store(self, entries):
+        """Saves (path, size, mtime, stats) entries."""
+        with self._lock:
+            self._conn.executemany(
+                f"INSERT OR REPLACE INTO stats (path, size, mtime, {', '.join(STAT_FIELDS)})"
+                f" VALUES (?, ?, ?, {', '.join('?' * len(STAT_FIELDS))})",
+                [(path, size, mtime, *stats) for path, size, mtime, stats in entries]
+            )
+            self._conn.commit()
+
+    def close(self):
+        self._conn.close()
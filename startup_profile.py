@@ -0,0 +1,83 @@
+"""`python main.py --profile-startup`: where the time to the first paint goes.
+
+Times every module imported from then on (each with its own imports
+included, and on its own) and the phases marked with mark(), and prints
+both once the window has painted; phases marked later are printed as they
+happen. Until start() is called mark() does nothing, so the viewer can
+mark its phases unconditionally. Times are from main.py starting, not
+from the interpreter starting.
+"""
+import builtins
+import sys
+import time
+
+active = False
+_started = 0.0
+_phases = []
+# module -> (seconds including its imports, seconds of its own, nesting depth)
+_imports = {}
+_stack = []
+_reported = False
+_original_import = builtins.__import__
+
+def start():
+    global active, _started
+    active = True
+    _started = time.perf_counter()
+    builtins.__import__ = _timed_import
+    mark("main.py started")
+
+def _timed_import(name, globals=None, locals=None, fromlist=(), level=0):
+    if level or name in sys.modules:
+        return _original_import(name, globals, locals, fromlist, level)
+    _stack.append(0.0)
+    started = time.perf_counter()
+    try:
+        return _original_import(name, globals, locals, fromlist, level)
+    finally:
+        elapsed = time.perf_counter() - started
+        children = _stack.pop()
+        if _stack:
+            _stack[-1] += elapsed
+        _imports.setdefault(name, (elapsed, elapsed - children, len(_stack)))
+
+def mark(phase):
+    if not active:
+        return
+    now = time.perf_counter()
+    _phases.append((phase, now))
+    if _reported:
+        print(f"  {(now - _started) * 1000:8.1f} ms  {phase} (after first paint)")
+
+def report_after_first_paint(widget):
+    """Prints the report when `widget` first paints."""
+    from PyQt5.QtCore import QObject, QEvent
+
+    class FirstPaint(QObject):
+        def eventFilter(self, watched, event):
+            if event.type() == QEvent.Paint:
+                watched.removeEventFilter(self)
+                mark("first paint")
+                report()
+            return False
+
+    widget._first_paint_filter = FirstPaint(widget)
+    widget.installEventFilter(widget._first_paint_filter)
+
+def report(top=15):
+    global _reported
+    _reported = True
+    builtins.__import__ = _original_import
+    print("Startup phases (ms since main.py started, ms since the previous phase):")
+    previous = _started
+    for phase, at in _phases:
+        print(f"  {(at - _started) * 1000:8.1f} ms  {(at - previous) * 1000:7.1f} ms  {phase}")
+        previous = at
+
+    top_level = sum(total for total, _, depth in _imports.values() if depth == 0)
+    print(f"Imports: {len(_imports)} modules, {top_level * 1000:.1f} ms; slowest by own time:")
+    print(f"  {'own':>8}  {'total':>8}  module")
+    slowest = sorted(_imports.items(), key=lambda item: item[1][1], reverse=True)[:top]
+    for name, (total, own, depth) in slowest:
+        print(f"  {own * 1000:6.1f} ms  {total * 1000:6.1f} ms  {name}")
+    sys.stdout.flush()
@@ -0,0 +1,3 @@
+# Per-video subtitle statistics, in the order srt_stats.analyze_srt returns
+# them. Kept apart so the catalog and sort orders do not import the analyzer.
+STAT_FIELDS = ("cues", "spoken_ms", "chars", "kanji", "vocabulary", "lines_per_minute")
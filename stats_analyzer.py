@@ -0,0 +1,98 @@
+import multiprocessing
+import os
+import time
+from concurrent.futures import ProcessPoolExecutor
+from concurrent.futures.process import BrokenProcessPool
+from PyQt5.QtCore import QThread, pyqtSignal
+import instrumentation
+from srt_stats import analyze_file
+
+class StatsAnalyzer(QThread):
+    """Computes subtitle statistics for a list of videos in the background.
+
+    Files whose size and mtime match the stats cache are answered from it
+    in one pass; the rest are parsed on a process pool using every core
+    and written back. Results are emitted in batches of (video_id, stats).
+    """
+    stats_ready = pyqtSignal(list)
+
+    def __init__(self, stats_cache, video_data, workers=None, pool_threshold=64, batch_size=256):
+        super().__init__()
+        self.stats_cache = stats_cache
+        self.video_data = video_data
+        self.workers = workers or os.cpu_count() or 1
+        # Fewer misses than this are parsed here; starting a pool costs more
+        self.pool_threshold = pool_threshold
+        self.batch_size = batch_size
+        self._cancelled = False
+
+    def cancel(self):
+        self._cancelled = True
+
+    def run(self):
+        with instrumentation.span("stats.lookup"):
+            ids_of = {}
+            files = []
+            for video in self.video_data:
+                try:
+                    stat = os.stat(video["path"])
+                except OSError:
+                    continue
+                ids_of.setdefault(video["path"], []).append(video["video_id"])
+                files.append((video["path"], stat.st_size, stat.st_mtime))
+            cached = self.stats_cache.lookup(files)
+        instrumentation.count("stats_cache.hit", len(cached))
+        instrumentation.count("stats_cache.miss", len(files) - len(cached))
+        hits = [(video_id, stats) for path, stats in cached.items() for video_id in ids_of[path]]
+        for start in range(0, len(hits), self.batch_size):
+            self.stats_ready.emit(hits[start:start + self.batch_size])
+
+        missing = {path: (size, mtime) for path, size, mtime in files if path not in cached}
+        if not missing or self._cancelled:
+            return
+        with instrumentation.span("stats.analyze", files=len(missing)):
+            self.analyze(missing, ids_of)
+
+    def analyze(self, missing, ids_of):
+        paths = list(missing)
+        if len(paths) < self.pool_threshold or self.workers < 2:
+            self.collect(map(analyze_file, paths), missing, ids_of)
+            return
+        # Forking a process that runs Qt threads is unsafe; spawn instead
+        pool = ProcessPoolExecutor(self.workers, mp_context=multiprocessing.get_context("spawn"))
+        done = set()
+        try:
+            chunksize = max(1, min(64, len(paths) // (self.workers * 4)))
+            self.collect(pool.map(analyze_file, paths, chunksize=chunksize), missing, ids_of, done)
+        except BrokenProcessPool:
+            # Workers could not start (e.g. a frozen build); finish here
+            rest = [path for path in paths if path not in done]
+            self.collect(map(analyze_file, rest), missing, ids_of)
+        finally:
+            pool.shutdown(wait=not self._cancelled, cancel_futures=True)
+
+    def collect(self, results, missing, ids_of, done=None):
+        """Stores and emits (path, stats) results in batches as they arrive."""
+        batch = []
+        entries = []
+        flushed = time.monotonic()
+        for path, stats in results:
+            if self._cancelled:
+                return
+            if done is not None:
+                done.add(path)
+            if stats is None:
+                continue
+            entries.append((path, *missing[path], stats))
+            batch.extend((video_id, stats) for video_id in ids_of[path])
+            if len(batch) >= self.batch_size or time.monotonic() - flushed > 0.25:
+                self.flush(batch, entries)
+                batch, entries = [], []
+                flushed = time.monotonic()
+        self.flush(batch, entries)
+
+    def flush(self, batch, entries):
+        if entries:
+            self.stats_cache.store(entries)
+        if batch:
+            self.stats_ready.emit(batch)
@@ -0,0 +1,211 @@
+import os
+import re
+import sqlite3
+import threading
+from array import array
+from collections import defaultdict
+
+import settings
+from search_index import normalize, bigrams
+
+TIMING_RE = re.compile(r"(\d+):(\d{2}):(\d{2})[,.](\d{1,3})\s*-->")
+TAG_RE = re.compile(r"<[^>]+>|\{\\[^}]*\}")
+
+def parse_srt_cues(path):
+    """Yields (start_ms, text) for each cue, reading the file line by line."""
+    start_ms = None
+    lines = []
+    with open(path, encoding="utf-8-sig", errors="replace") as f:
+        for line in f:
+            line = line.strip()
+            if start_ms is None:
+                match = TIMING_RE.match(line)
+                if match:
+                    h, m, s, ms = match.groups()
+                    start_ms = ((int(h) * 60 + int(m)) * 60 + int(s)) * 1000 + int(ms.ljust(3, "0"))
+            elif line:
+                lines.append(TAG_RE.sub("", line))
+            else:
+                if lines:
+                    yield start_ms, " ".join(lines)
+                start_ms = None
+                lines = []
+    if start_ms is not None and lines:
+        yield start_ms, " ".join(lines)
+
+def cue_terms(text):
+    """Index terms of a normalized cue: every character and every bigram."""
+    terms = bigrams(text)
+    terms.update(text)
+    terms.discard(" ")
+    return terms
+
+def format_timestamp(start_ms):
+    seconds = start_ms // 1000
+    hours, rest = divmod(seconds, 3600)
+    minutes, seconds = divmod(rest, 60)
+    return f"{hours}:{minutes:02d}:{seconds:02d}" if hours else f"{minutes}:{seconds:02d}"
+
+def timestamped_url(video_id, start_ms):
+    return f"https://www.youtube.com/watch?v={video_id}&t={start_ms // 1000}s"
+
+class SubtitleIndex:
+    """Persistent inverted index over subtitle text.
+
+    Terms are single characters and character bigrams of the normalized
+    cue text, which works for Japanese without a tokenizer. Each posting row
+    holds, for one (term, file), the packed list of cue numbers containing
+    the term. Files whose size and mtime are unchanged are not re-read.
+    """
+
+    def __init__(self, path=None):
+        if path is None:
+            path = os.path.join(settings.CACHE_DIR, "subtitles.sqlite3")
+        os.makedirs(os.path.dirname(path), exist_ok=True)
+        self._lock = threading.Lock()
+        self._conn = sqlite3.connect(path, check_same_thread=False)
+        self._conn.execute("PRAGMA journal_mode=WAL")
+        self._conn.execute("PRAGMA synchronous=NORMAL")
+        # Postings are inserted all over the term B-tree; a bigger page cache
+        # keeps that from turning into random disk I/O
+        self._conn.execute("PRAGMA cache_size=-65536")
+        self._conn.executescript(
+            "CREATE TABLE IF NOT EXISTS files ("
+            " id INTEGER PRIMARY KEY, path TEXT UNIQUE NOT NULL, video_id TEXT NOT NULL,"
+            " size INTEGER NOT NULL, mtime REAL NOT NULL);"
+            "CREATE TABLE IF NOT EXISTS cues ("
+            " file_id INTEGER NOT NULL, seq INTEGER NOT NULL, start_ms INTEGER NOT NULL, text TEXT NOT NULL,"
+            " PRIMARY KEY (file_id, seq)) WITHOUT ROWID;"
+            "CREATE TABLE IF NOT EXISTS postings ("
+            " term TEXT NOT NULL, file_id INTEGER NOT NULL, cues BLOB NOT NULL,"
+            " PRIMARY KEY (term, file_id)) WITHOUT ROWID;"
+            "CREATE INDEX IF NOT EXISTS postings_file ON postings (file_id);"
+        )
+        self._conn.commit()
+
+    def is_current(self, path, size, mtime):
+        with self._lock:
+            row = self._conn.execute("SELECT size, mtime FROM files WHERE path = ?", (path,)).fetchone()
+        return row is not None and row[0] == size and row[1] == mtime
+
+    def index_file(self, path, video_id, commit=True):
+        """(Re)indexes one SRT file; returns False if it was already current.
+
+        Pass commit=False when indexing many files and call commit() every
+        so often; a transaction per file spends most of its time syncing.
+        """
+        stat = os.stat(path)
+        if self.is_current(path, stat.st_size, stat.st_mtime):
+            return False
+
+        cues = []
+        postings = defaultdict(lambda: array("I"))
+        for seq, (start_ms, text) in enumerate(parse_srt_cues(path)):
+            cues.append((seq, start_ms, text))
+            for term in cue_terms(normalize(text)):
+                postings[term].append(seq)
+
+        with self._lock:
+            try:
+                self._remove(path)
+                file_id = self._conn.execute(
+                    "INSERT INTO files (path, video_id, size, mtime) VALUES (?, ?, ?, ?)",
+                    (path, video_id, stat.st_size, stat.st_mtime)
+                ).lastrowid
+                self._conn.executemany(
+                    "INSERT INTO cues (file_id, seq, start_ms, text) VALUES (?, ?, ?, ?)",
+                    [(file_id, seq, start_ms, text) for seq, start_ms, text in cues]
+                )
+                self._conn.executemany(
+                    "INSERT INTO postings (term, file_id, cues) VALUES (?, ?, ?)",
+                    [(term, file_id, postings[term].tobytes()) for term in sorted(postings)]
+                )
+            except Exception:
+                self._conn.rollback()
+                raise
+            if commit:
+                self._conn.commit()
+        return True
+
+    def commit(self):
+        with self._lock:
+            self._conn.commit()
+
+    def _remove(self, path):
+        row = self._conn.execute("SELECT id FROM files WHERE path = ?", (path,)).fetchone()
+        if row is None:
+            return
+        self._conn.execute("DELETE FROM postings WHERE file_id = ?", row)
+        self._conn.execute("DELETE FROM cues WHERE file_id = ?", row)
+        self._conn.execute("DELETE FROM files WHERE id = ?", row)
+
+    def remove_file(self, path):
+        with self._lock:
+            with self._conn:
+                self._remove(path)
+
+    def prune(self, folder_path, existing_paths):
+        """Forgets indexed files under folder_path that are no longer present."""
+        prefix = os.path.join(folder_path, "")
+        existing = set(existing_paths)
+        with self._lock:
+            stale = [path for (path,) in self._conn.execute(
+                "SELECT path FROM files WHERE substr(path, 1, ?) = ?", (len(prefix), prefix))
+                if path not in existing]
+            with self._conn:
+                for path in stale:
+                    self._remove(path)
+        return len(stale)
+
+    def search(self, query, limit=500):
+        """Cues containing query as [(video_id, start_ms, text)], at most `limit`."""
+        query = normalize(query).strip()
+        if not query:
+            return []
+        terms = cue_terms(query) if len(query) > 1 else {query}
+        # Bigrams imply their characters, so only bigrams matter for longer queries
+        if len(query) > 1:
+            terms = {term for term in terms if len(term) == 2} or terms
+
+        with self._lock:
+            counts = sorted(
+                (self._conn.execute("SELECT COUNT(*) FROM postings WHERE term = ?", (term,)).fetchone()[0], term)
+                for term in terms
+            )
+            if not counts or counts[0][0] == 0:
+                return []
+
+            candidates = None
+            for _, term in counts:
+                found = {}
+                rows = self._conn.execute("SELECT file_id, cues FROM postings WHERE term = ?", (term,))
+                for file_id, blob in rows:
+                    if candidates is not None and file_id not in candidates:
+                        continue
+                    seqs = array("I")
+                    seqs.frombytes(blob)
+                    seqs = set(seqs)
+                    if candidates is not None:
+                        seqs &= candidates[file_id]
+                    if seqs:
+                        found[file_id] = seqs
+                candidates = found
+                if not candidates:
+                    return []
+
+            hits = []
+            for file_id, seqs in candidates.items():
+                video_id = self._conn.execute("SELECT video_id FROM files WHERE id = ?", (file_id,)).fetchone()[0]
+                for seq in sorted(seqs):
+                    start_ms, text = self._conn.execute(
+                        "SELECT start_ms, text FROM cues WHERE file_id = ? AND seq = ?", (file_id, seq)
+                    ).fetchone()
+                    if query in normalize(text):
+                        hits.append((video_id, start_ms, text))
+                        if len(hits) >= limit:
+                            return hits
+        return hits
+
+    def close(self):
+        with self._lock:
+            self._conn.close()
@@ -0,0 +1,87 @@
+from PyQt5.QtWidgets import QDialog, QVBoxLayout, QLineEdit, QTreeWidget, QTreeWidgetItem, QLabel
+from PyQt5.QtCore import Qt, QThread, QTimer, pyqtSignal
+from subtitle_index import format_timestamp, timestamped_url
+
+class SubtitleIndexer(QThread):
+    """Indexes the subtitle text of a folder in the background."""
+    progress = pyqtSignal(int, int)
+
+    def __init__(self, subtitle_index, video_data, prune_roots=None):
+        super().__init__()
+        self.subtitle_index = subtitle_index
+        self.video_data = video_data
+        self.prune_roots = prune_roots
+        self._cancelled = False
+
+    def cancel(self):
+        self._cancelled = True
+
+    def run(self):
+        total = len(self.video_data)
+        for done, video in enumerate(self.video_data, 1):
+            if self._cancelled:
+                break
+            try:
+                self.subtitle_index.index_file(video["path"], video["video_id"], commit=False)
+            except (OSError, UnicodeError) as e:
+                print(f"Error indexing {video['path']}: {e}")
+            if done % 50 == 0 or done == total:
+                self.subtitle_index.commit()
+                self.progress.emit(done, total)
+        self.subtitle_index.commit()
+        if self.prune_roots and not self._cancelled:
+            paths = [video["path"] for video in self.video_data]
+            for root in self.prune_roots:
+                self.subtitle_index.prune(root, paths)
+
+class SubtitleSearchDialog(QDialog):
+    """Searches the spoken text of every subtitle and lists the hits per
+    video; double-clicking a hit opens the video at that timestamp."""
+
+    def __init__(self, subtitle_index, title_for, font, parent=None):
+        super().__init__(parent)
+        self.subtitle_index = subtitle_index
+        self.title_for = title_for
+        self.setWindowTitle("字幕検索")
+        self.resize(700, 600)
+
+        layout = QVBoxLayout(self)
+        self.query_input = QLineEdit()
+        self.query_input.setFont(font)
+        self.query_input.setPlaceholderText("字幕の中を検索...")
+        self.query_input.setClearButtonEnabled(True)
+        layout.addWidget(self.query_input)
+
+        self.results = QTreeWidget()
+        self.results.setFont(font)
+        self.results.setHeaderHidden(True)
+        self.results.itemActivated.connect(self.open_hit)
+        layout.addWidget(self.results)
+
+        self.summary_label = QLabel("")
+        layout.addWidget(self.summary_label)
+
+        self.search_timer = QTimer(self)
+        self.search_timer.setSingleShot(True)
+        self.search_timer.setInterval(150)
+        self.search_timer.timeout.connect(self.run_search)
+        self.query_input.textChanged.connect(lambda _: self.search_timer.start())
+
+    def run_search(self):
+        self.results.clear()
+        hits = self.subtitle_index.search(self.query_input.text())
+        videos = {}
+        for video_id, start_ms, text in hits:
+            parent = videos.get(video_id)
+            if parent is None:
+                parent = videos[video_id] = QTreeWidgetItem(self.results, [self.title_for(video_id)])
+                parent.setData(0, Qt.UserRole, (video_id, 0))
+            item = QTreeWidgetItem(parent, [f"{format_timestamp(start_ms)}  {text}"])
+            item.setData(0, Qt.UserRole, (video_id, start_ms))
+        self.results.expandAll()
+        self.summary_label.setText(f"動画: {len(videos)} | ヒット: {len(hits)}")
+
+    def open_hit(self, item, column=0):
+        video_id, start_ms = item.data(0, Qt.UserRole)
+        import webbrowser
+        webbrowser.open(timestamped_url(video_id, start_ms))
@@ -1,14 +1,35 @@
 import os
-import webbrowser
-import re
+from array import array
+import time
+from collections import deque
+from functools import partial
 from PyQt5.QtWidgets import (
     QMainWindow, QVBoxLayout, QLabel, QPushButton, QFileDialog,
-    QScrollArea, QWidget, QHBoxLayout, QToolButton, QSlider, QStatusBar, 
-    QLineEdit, QShortcut, QMenu, QAction)
-from PyQt5.QtGui import QPixmap, QFontDatabase, QFont, QIcon, QKeySequence
-from PyQt5.QtCore import Qt, QPoint, QEvent
-from thumbnail_loader import ThumbnailLoader
-from utils import load_subtitle_files
+    QListView, QWidget, QHBoxLayout, QSlider, QStatusBar, 
+    QLineEdit, QShortcut, QMenu, QAction, QCheckBox, QAbstractItemView)
+from PyQt5.QtGui import QFontDatabase, QFont, QIcon, QKeySequence, QPixmap
+from PyQt5.QtCore import Qt, QEvent, QPoint, QTimer
+import instrumentation
+import startup_profile
+from diagnostics_panel import DiagnosticsPanel, EventLoopMonitor
+from load_scheduler import VISIBLE, PREFETCH
+from pixmap_cache import LEVELS, PixmapCache, level_for, decode_thumbnail
+from session_snapshot import load_session, save_session
+from search_index import SearchIndex
+from sort_engine import SortEngine
+from stat_fields import STAT_FIELDS
+from subtitle_index import SubtitleIndex, format_timestamp
+from subtitle_search import SubtitleIndexer, SubtitleSearchDialog
+from video_catalog import VideoCatalog, LOADING, LOADED, FAILED, VARIANTS, NO_VARIANT
+from thumbnail_variants import THUMBNAIL_VARIANTS, thumbnail_variant
+from thumbnail_rescaler import ThumbnailRescaler
+from video_list import VideoListModel, VideoItemDelegate, VIDEO_ROLE
+from folder_scanner import LibraryScanner
+from folder_watcher import FolderWatcher
+from library_index import LibraryIndex
+from metadata_cache import MetadataCache
+from thumbnail_cache import ThumbnailCache
+import settings
 
 class SubtitleViewer(QMainWindow):
     def __init__(self):
@@ -16,7 +37,46 @@ class SubtitleViewer(QMainWindow):
         self.setWindowTitle("SRT Thumbnail + Title Viewer")
         self.setGeometry(100, 100, 800, 1000)
         self.setWindowIcon(QIcon("icon2.png"))
-        self.video_widgets = {}
+        self.library = LibraryIndex()
+        self.metadata_cache = MetadataCache()
+        self.thumbnail_cache = ThumbnailCache()
+        startup_profile.mark("caches opened")
+        self.thumbnail_loader = None
+        self.retired_loaders = []
+        # Fetches larger variants for rows already loaded, after a zoom in
+        self.thumbnail_upgrader = None
+        self.pending_upgrades = set()
+        self.thumbnail_variant = "mqdefault"
+        # Decoded QImages waiting to become pixmaps on the GUI thread
+        self.pending_images = deque()
+        # Loader results waiting for the next frame
+        self.pending_results = deque()
+        self.folder_scanner = None
+        self.scanned_videos = []
+        self.scan_in_progress = False
+        self.folder_watcher = None
+        self.watching = False
+        self.incremental_ids = set()
+        # Videos shown from the session snapshot rather than loaded this run
+        self.restored_ids = set()
+        self.subtitle_queue = []
+        self.subtitle_prune_roots = None
+        # Roots removed since the last finished scan; their subtitles are
+        # pruned along with the remaining roots' once it finishes
+        self.removed_roots = []
+        self.subtitle_index = SubtitleIndex()
+        self.subtitle_indexer = None
+        self.subtitle_search_dialog = None
+        # Opened with the first analysis, off the startup path
+        self.stats_cache = None
+        self.stats_analyzer = None
+        self.stats_queue = []
+        self.diagnostics_panel = None
+        self.loop_monitor = EventLoopMonitor(parent=self)
+        if instrumentation.enabled:
+            self.loop_monitor.start()
+        # How many screenfuls above and below the viewport to prefetch
+        self.prefetch_screens = 2
         self.thumbnail_size = (320, 180)
         self.base_font_size = 14
         self.current_font_size = self.base_font_size
@@ -28,38 +88,50 @@ class SubtitleViewer(QMainWindow):
 
         self.search_shortcut = QShortcut(QKeySequence("⌘+F"), self)
         self.search_shortcut.activated.connect(self.focus_search)
+        self.subtitle_search_shortcut = QShortcut(QKeySequence("⌘+Shift+F"), self)
+        self.subtitle_search_shortcut.activated.connect(self.open_subtitle_search)
+        self.diagnostics_shortcut = QShortcut(QKeySequence("⌘+Shift+D"), self)
+        self.diagnostics_shortcut.activated.connect(self.toggle_diagnostics)
 
         self.setFocus()
+        startup_profile.mark("viewer ui built")
+
+        # Started once the window has painted, the font first so restored
+        # rows are laid out once with it
+        self.after_first_paint = [self.load_preferred_font]
+        if self.library.roots():
+            self.after_first_paint.append(lambda: self.load_library(restore_session=True))
 
     def focus_search(self):
         self.search_input.setFocus()
         self.search_input.selectAll()
 
     def setup_font(self):
-        from PyQt5.QtGui import QFontDatabase, QFont
-        import os
-        import platform
-
+        """Starts on a fallback font; the Japanese font is looked up or
+        registered by load_preferred_font once the window has painted."""
         self.base_font_size = 13
         self.title_font_size = 16 
 
         self.custom_font = QFont("Helvetica", self.base_font_size) #basic fallback
+        self.custom_font.setWeight(QFont.Medium)
 
+    def load_preferred_font(self):
+        import platform
+
+        family = None
         if platform.system() == "Darwin":
             print("Running on macOS, attempting to load system Japanese fonts...")
             japanese_fonts = ["Hiragino Sans", "Hiragino Kaku Gothic Pro", "Apple SD Gothic Neo"]
-            found_font = False
             font_db = QFontDatabase()
             available_families = font_db.families()
 
             for font_name in japanese_fonts:
                 if font_name in available_families:
-                    self.custom_font = QFont(font_name, self.base_font_size)
+                    family = font_name
                     print(f"Using macOS system font: {font_name}")
-                    found_font = True
                     break
 
-            if not found_font:
+            if family is None:
                 print("Warning: No suitable Japanese system font found on macOS. Using default.")
 
         else:
@@ -72,9 +144,8 @@ class SubtitleViewer(QMainWindow):
                 if font_id != -1:
                     font_families = QFontDatabase.applicationFontFamilies(font_id)
                     if font_families:
-                        font_family = font_families[0]
-                        self.custom_font = QFont(font_family, self.base_font_size)
-                        print(f"Successfully loaded custom font: {font_family}")
+                        family = font_families[0]
+                        print(f"Successfully loaded custom font: {family}")
                     else:
                         print(f"Warning: Custom font '{os.path.basename(font_path)}' loaded (id={font_id}) but reported no families. Using default.")
                 else:
@@ -82,8 +153,23 @@ class SubtitleViewer(QMainWindow):
             else:
                 print(f"Warning: Custom font file not found at {font_path}. Using default.")
 
-        self.custom_font.setWeight(QFont.Medium)
-                
+        if family:
+            self.apply_font(family)
+        startup_profile.mark("font loaded")
+
+    def apply_font(self, family):
+        """Moves every widget still on the fallback family to `family`,
+        keeping each widget's own point size."""
+        fallback = self.custom_font.family()
+        self.custom_font.setFamily(family)
+        for widget in self.findChildren(QWidget):
+            font = widget.font()
+            if font.family() == fallback:
+                font.setFamily(family)
+                widget.setFont(font)
+        self.delegate.font = self.custom_font
+        self.list_view.doItemsLayout()
+
     def setup_ui(self):
         self.main_layout = QVBoxLayout()
         top_row = QHBoxLayout()
@@ -92,6 +178,25 @@ class SubtitleViewer(QMainWindow):
         select_button.setFont(self.custom_font)
         select_button.clicked.connect(self.select_folder)
         top_row.addWidget(select_button)
+
+        self.library_button = QPushButton("ライブラリ ▼")
+        self.library_button.setFont(self.custom_font)
+        self.library_menu = QMenu(self)
+        self.library_menu.aboutToShow.connect(self.populate_library_menu)
+        self.library_button.setMenu(self.library_menu)
+        top_row.addWidget(self.library_button)
+
+        self.recursive_checkbox = QCheckBox("サブフォルダー")
+        self.recursive_checkbox.setFont(self.custom_font)
+        self.recursive_checkbox.setToolTip("追加するフォルダーのサブフォルダーも読み込む")
+        self.recursive_checkbox.setChecked(settings.SCAN_RECURSIVE)
+        top_row.addWidget(self.recursive_checkbox)
+
+        self.watch_checkbox = QCheckBox("監視")
+        self.watch_checkbox.setFont(self.custom_font)
+        self.watch_checkbox.setToolTip("フォルダーの変更を監視して自動で追加・削除")
+        self.watch_checkbox.setChecked(settings.WATCH_FOLDERS)
+        top_row.addWidget(self.watch_checkbox)
         
         self.sort_button = QPushButton("並び替え ▼")
         self.sort_button.setFont(self.custom_font)
@@ -101,8 +206,19 @@ class SubtitleViewer(QMainWindow):
         self.sort_actions["date_newest"] = QAction("アップロード日 (新しい順)", self)
         self.sort_actions["date_oldest"] = QAction("アップロード日 (古い順)", self)
         self.sort_actions["length"] = QAction("タイトルの長さ (短い順)", self)
+        self.sort_actions["title"] = QAction("タイトル (五十音順)", self)
+        self.sort_actions["folder"] = QAction("フォルダー", self)
+        # Subtitle statistics, filled in by the analyzer
+        self.sort_actions["cues"] = QAction("字幕の数 (多い順)", self)
+        self.sort_actions["spoken_ms"] = QAction("発話時間 (長い順)", self)
+        self.sort_actions["chars"] = QAction("文字数 (多い順)", self)
+        self.sort_actions["kanji"] = QAction("漢字の種類 (多い順)", self)
+        self.sort_actions["vocabulary"] = QAction("語彙数 (多い順)", self)
+        self.sort_actions["lines_per_minute"] = QAction("1分あたりの行数 (多い順)", self)
         
         for key, action in self.sort_actions.items():
+            if key == STAT_FIELDS[0]:
+                sort_menu.addSeparator()
             sort_menu.addAction(action)
             action.triggered.connect(lambda checked=False, k=key: self.sort_videos(k))
         
@@ -112,6 +228,18 @@ class SubtitleViewer(QMainWindow):
         
         self.sort_button.setMenu(sort_menu)
         top_row.addWidget(self.sort_button)
+
+        refresh_button = QPushButton("再取得")
+        refresh_button.setFont(self.custom_font)
+        refresh_button.setToolTip("キャッシュを無視して情報を再取得")
+        refresh_button.clicked.connect(self.refresh_metadata)
+        top_row.addWidget(refresh_button)
+        
+        subtitle_search_button = QPushButton("字幕検索")
+        subtitle_search_button.setFont(self.custom_font)
+        subtitle_search_button.setToolTip("字幕の内容を検索「⌘+Shift+F」")
+        subtitle_search_button.clicked.connect(self.open_subtitle_search)
+        top_row.addWidget(subtitle_search_button)
         
         top_row.addStretch()
         
@@ -120,18 +248,84 @@ class SubtitleViewer(QMainWindow):
         self.search_input.setPlaceholderText("検索...　「⌘+F」")
         self.search_input.setClearButtonEnabled(True)
         self.search_input.setFixedWidth(220)
-        self.search_input.textChanged.connect(self.filter_videos)
+        self.search_input.textChanged.connect(lambda _: self.search_timer.start())
         top_row.addWidget(self.search_input)
         
         self.main_layout.addLayout(top_row)
 
-        self.scroll_area = QScrollArea()
-        self.scroll_area.setWidgetResizable(True)
-        self.scroll_content = QWidget()
-        self.scroll_layout = QVBoxLayout(self.scroll_content)
-        self.scroll_layout.setAlignment(Qt.AlignCenter)
-        self.scroll_area.setWidget(self.scroll_content)
-        self.main_layout.addWidget(self.scroll_area)
+        self.catalog = VideoCatalog()
+        self.model = VideoListModel(self.catalog, self)
+        self.sort_engine = SortEngine(self.catalog)
+        self.sorted_positions = []
+        self.sort_rank = array("I")
+        self.search_index = SearchIndex()
+
+        # Keystrokes are coalesced; the filter runs once typing pauses
+        self.search_timer = QTimer(self)
+        self.search_timer.setSingleShot(True)
+        self.search_timer.setInterval(120)
+        self.search_timer.timeout.connect(self.filter_videos)
+        self.pixmap_cache = PixmapCache()
+        instrumentation.register_gauge("pixmap_cache", self.pixmap_cache.stats)
+        self.delegate = VideoItemDelegate(self.custom_font, self.pixmap_cache, self)
+        self.list_view = QListView()
+        self.list_view.setModel(self.model)
+        self.list_view.setItemDelegate(self.delegate)
+        self.list_view.setUniformItemSizes(True)
+        # Lay rows out in batches so showing 50k rows never blocks a keystroke
+        self.list_view.setLayoutMode(QListView.Batched)
+        self.list_view.setBatchSize(500)
+        self.list_view.setVerticalScrollMode(QListView.ScrollPerPixel)
+        self.list_view.verticalScrollBar().setSingleStep(20)
+        self.list_view.setSelectionMode(QListView.NoSelection)
+        self.list_view.setMouseTracking(True)
+        self.list_view.viewport().installEventFilter(self)
+        self.list_view.verticalScrollBar().valueChanged.connect(self.hide_date_overlay)
+        self.main_layout.addWidget(self.list_view)
+
+        # Scrolling re-prioritizes thumbnail loads once it settles
+        self.priority_timer = QTimer(self)
+        self.priority_timer.setSingleShot(True)
+        self.priority_timer.setInterval(50)
+        self.priority_timer.timeout.connect(self.update_load_priorities)
+        # Re-ranking every pending load is O(N), so it waits for the filter to settle
+        self.load_order_timer = QTimer(self)
+        self.load_order_timer.setSingleShot(True)
+        self.load_order_timer.setInterval(300)
+        self.load_order_timer.timeout.connect(self.update_load_order)
+        # Slider drags and window resizes only relayout until the gesture ends
+        self.resize_timer = QTimer(self)
+        self.resize_timer.setSingleShot(True)
+        self.resize_timer.setInterval(150)
+        self.resize_timer.timeout.connect(self._update_sizes)
+        self.thumbnail_rescaler = None
+        # Turns decoded thumbnails into pixmaps a batch per frame
+        self.image_timer = QTimer(self)
+        self.image_timer.setSingleShot(True)
+        self.image_timer.setInterval(16)
+        self.image_timer.timeout.connect(self.apply_pending_images)
+        # Loader results are applied at most once per frame, within a time budget
+        self.result_timer = QTimer(self)
+        self.result_timer.setSingleShot(True)
+        self.result_timer.setInterval(16)
+        self.result_timer.timeout.connect(self.apply_results)
+
+        # Re-sorts by a statistic at most this often while results stream in
+        self.stats_sort_timer = QTimer(self)
+        self.stats_sort_timer.setSingleShot(True)
+        self.stats_sort_timer.setInterval(1000)
+        self.stats_sort_timer.timeout.connect(self.resort_by_stats)
+        self.list_view.verticalScrollBar().valueChanged.connect(lambda _: self.priority_timer.start())
+
+        # One overlay shared by every row, moved onto whichever thumbnail is hovered
+        self.date_overlay = QLabel(self.list_view.viewport())
+        self.date_overlay.setObjectName("dateOverlay")
+        self.date_overlay.setAlignment(Qt.AlignCenter)
+        self.date_overlay.setMinimumWidth(200)
+        self.date_overlay.setContentsMargins(8, 6, 8, 6)
+        self.date_overlay.hide()
+        self.date_overlay.setAttribute(Qt.WA_TransparentForMouseEvents)
+        self.hovered_video_id = None
 
         self.slider_layout = QHBoxLayout()
         self.size_slider = QSlider(Qt.Horizontal)
@@ -139,7 +333,7 @@ class SubtitleViewer(QMainWindow):
         self.size_slider.setMaximum(400)
         self.size_slider.setValue(320)
         self.size_slider.setFixedWidth(200)
-        self.size_slider.valueChanged.connect(self._update_sizes)
+        self.size_slider.valueChanged.connect(self.resize_thumbnails)
         self.slider_layout.addWidget(self.size_slider, alignment=Qt.AlignCenter)
         self.main_layout.addLayout(self.slider_layout)
 
@@ -159,121 +353,554 @@ class SubtitleViewer(QMainWindow):
         if folder_path:
             self.load_folder_contents(folder_path)
 
-    def load_folder_contents(self, folder_path):
-        """Loads video data from the specified folder path."""
+    def populate_library_menu(self):
+        self.library_menu.clear()
+        add_action = self.library_menu.addAction("フォルダーを追加...")
+        add_action.triggered.connect(self.select_folder)
+        roots = self.library.roots()
+        if roots:
+            self.library_menu.addSeparator()
+        for path, recursive in roots:
+            label = f"{path}{' (サブフォルダー含む)' if recursive else ''} を削除"
+            action = self.library_menu.addAction(label)
+            action.triggered.connect(lambda checked=False, p=path: self.remove_library_root(p))
+
+    def remove_library_root(self, path):
+        self.library.remove_root(path)
+        self.removed_roots.append(path)
+        self.load_library()
+
+    def refresh_metadata(self):
+        """Reloads the library, bypassing the metadata cache."""
+        self.load_library(force_refresh=True)
+
+    def load_folder_contents(self, folder_path, force_refresh=False):
+        """Adds the folder to the library and shows the merged library."""
         if folder_path:
-            self.video_widgets.clear()
-            self.search_input.clear()
-            try:
-                video_data = load_subtitle_files(folder_path)
-                if video_data:
-                    self.display_videos(video_data)
-                    self.update_status_label()
-                else:
-                    self.update_status_label()
-            except Exception as e:
-                print(f"Error processing folder {folder_path}: {e}")
-                self.update_status_label()
+            self.library.add_root(folder_path, self.recursive_checkbox.isChecked())
+            self.load_library(force_refresh)
+
+    def load_library(self, force_refresh=False, restore_session=False):
+        """Shows every library root as one list.
+
+        Known files come straight from the library index; the disk is then
+        checked on a worker thread and only changes are applied. With
+        restore_session, the list saved on exit is painted first and only
+        videos it did not hold are loaded."""
+        self.stop_thumbnail_loader()
+        self.stop_folder_scanner()
+        self.stop_folder_watcher()
+        self.stop_subtitle_indexer()
+        self.stop_stats_analyzer()
+        self.search_input.clear()
+        snapshot, atlas = load_session(self.library_roots()) if restore_session else (None, None)
+        if snapshot is not None:
+            self.display_snapshot(snapshot, atlas)
+        else:
+            self.display_videos([])
+            self.restored_ids = set()
+        self.scanned_videos = []
+        self.incremental_ids.clear()
+        self.scan_in_progress = True
+        # A watched library keeps its loader open for files added later
+        self.watching = self.watch_checkbox.isChecked()
+        self.load_thumbnails([], force_refresh)
+
+        scanner = LibraryScanner(self.library)
+        scanner.batch_found.connect(lambda batch, s=scanner: self.add_scanned_videos(batch, s))
+        scanner.files_removed.connect(self.remove_watched_files)
+        scanner.scan_finished.connect(lambda directories, s=scanner: self.finish_folder_scan(s, directories))
+        self.folder_scanner = scanner
+        scanner.start()
+        startup_profile.mark("library load started")
+
+    def stop_folder_scanner(self):
+        if self.folder_scanner is not None:
+            self.folder_scanner.cancel()
+            self.folder_scanner.wait()
+            self.folder_scanner = None
+
+    def new_records(self, records):
+        """Records of videos not in the catalog yet, keeping the first file of each video_id."""
+        seen = set()
+        new = []
+        for record in records:
+            video_id = record["video_id"]
+            if video_id in seen or video_id in self.catalog.position_of:
+                continue
+            seen.add(video_id)
+            new.append(record)
+        return new
+
+    @instrumentation.timed("gui.add_videos")
+    def add_scanned_videos(self, batch, scanner):
+        if scanner is not self.folder_scanner:
+            return  # batch from a scan that was replaced
+        if self.restored_ids:
+            self.scanned_videos.extend(v for v in batch if v["video_id"] in self.restored_ids)
+        batch = self.new_records(batch)
+        if not batch:
+            return
+        filtering = bool(self.search_input.text())
+        start = self.model.append_videos(batch, show=not filtering)
+        # Titles are indexed once loaded, not as the "Loading..." placeholder
+        for position in range(start, len(self.catalog)):
+            self.sort_engine.set(position)
+            self.sort_rank.append(len(self.sorted_positions))
+            self.sorted_positions.append(position)
+        self.scanned_videos.extend(batch)
+        if filtering:
+            self.search_timer.start()
+        if self.thumbnail_loader is not None:
+            self.thumbnail_loader.add_videos(batch)
+            self.priority_timer.start()
+        self.update_status_label()
+
+    def finish_folder_scan(self, scanner, directories):
+        if scanner is not self.folder_scanner:
+            return
+        self.scan_in_progress = False
+        # Drop records whose file went away during the refresh
+        live = []
+        for record in self.scanned_videos:
+            position = self.model.position(record["video_id"])
+            if position is not None and self.catalog.paths[position] == record["path"]:
+                live.append(record)
+        self.scanned_videos = live
+
+        if self.watching:
+            self.folder_watcher = FolderWatcher(self.library.recursive_roots(), self)
+            self.folder_watcher.files_added.connect(self.add_watched_files)
+            self.folder_watcher.files_removed.connect(self.remove_watched_files)
+            self.folder_watcher.files_changed.connect(self.queue_subtitle_indexing)
+            self.folder_watcher.files_changed.connect(self.queue_stats_analysis)
+            self.folder_watcher.watch(directories, live)
+        elif self.thumbnail_loader is not None:
+            self.thumbnail_loader.finish_adding()
+        roots = [path for path, _ in self.library.roots()] + self.removed_roots
+        self.removed_roots = []
+        self.queue_subtitle_indexing(live, prune_roots=roots)
+        self.queue_stats_analysis(live)
+        if not self.catalog.count(LOADING) and self.catalog.count(LOADED):
+            # Every load finished before the scan did
+            self.sort_videos(self.current_sort)
+        self.update_status_label()
+
+    def stop_folder_watcher(self):
+        if self.folder_watcher is not None:
+            self.folder_watcher.stop()
+            self.folder_watcher.deleteLater()
+            self.folder_watcher = None
+
+    def add_watched_files(self, records):
+        """Inserts new SRTs at their sorted place and fetches only those."""
+        records = self.new_records(records)
+        if not records:
+            return
+        filtering = bool(self.search_input.text())
+        for record in records:
+            position = self.model.append_videos([record], show=False)
+            self.sort_engine.set(position)
+            self.sort_rank.append(0)
+            self.incremental_ids.add(record["video_id"])
+            self.insert_sorted(position, show=not filtering)
+        self.update_sort_ranks()
+        if filtering:
+            self.search_timer.start()
+        if self.thumbnail_loader is not None:
+            self.thumbnail_loader.add_videos(records)
+            self.priority_timer.start()
+        self.queue_subtitle_indexing(records)
+        self.queue_stats_analysis(records)
+        self.update_status_label()
+
+    def remove_watched_files(self, records):
+        for record in records:
+            position = self.model.position(record["video_id"])
+            if position is None or self.catalog.paths[position] != record["path"]:
+                continue
+            position = self.model.remove_video(record["video_id"])
+            self.search_index.remove(position)
+            self.sorted_positions.remove(position)
+            self.sort_engine.remove(position)
+            self.incremental_ids.discard(record["video_id"])
+            self.pixmap_cache.discard(record["video_id"])
+            self.subtitle_index.remove_file(record["path"])
+        self.update_sort_ranks()
+        self.hide_date_overlay()
+        self.update_status_label()
 
+    @instrumentation.timed("gui.display")
     def display_videos(self, video_data):
-        for i in range(self.scroll_layout.count() - 1, -1,):
-            self.scroll_layout.itemAt(i).widget().deleteLater()
-        self.video_widgets.clear()
+        self.hide_date_overlay()
+        self.pixmap_cache.clear()
+        self.pending_images.clear()
+        self.pending_results.clear()
+        self.model.set_videos(video_data)
+        self.sorted_positions = list(range(len(self.catalog)))
+        self.sort_rank = array("I", self.sorted_positions)
+        self.search_index.clear()
+        self.sort_engine.clear()
+        self.update_status_label()
 
-        title_width = int(self.thumbnail_size[0] * 1.1)
-        
-        for video in video_data:
-            video_widget = QWidget()
-            video_layout = QHBoxLayout(video_widget)
-
-            title_label = QLabel(video["title"])
-            title_label.setFont(self.custom_font)
-            title_label.setWordWrap(True)
-            title_label.setFixedWidth(title_width)
-            video_layout.addWidget(title_label)
-
-            thumbnail_container = QWidget()
-            thumbnail_layout = QVBoxLayout(thumbnail_container)
-            thumbnail_layout.setAlignment(Qt.AlignCenter)
-
-            link_button = QToolButton()
-            link_button.setObjectName("linkButton")
-            link_button.setText("🔗")
-            link_button.clicked.connect(lambda _, vid=video["video_id"]: 
-                                     webbrowser.open(f"https://www.youtube.com/watch?v={vid}"))
-            thumbnail_layout.addWidget(link_button, alignment=Qt.AlignCenter)
-
-            thumbnail_label = QLabel()
-            placeholder = QPixmap(*self.thumbnail_size)
-            placeholder.fill(Qt.gray)
-            thumbnail_label.setPixmap(placeholder)
-            thumbnail_label.setFixedSize(*self.thumbnail_size)
-            thumbnail_label.installEventFilter(self)
-            thumbnail_layout.addWidget(thumbnail_label, alignment=Qt.AlignCenter)
-            
-            date_overlay = QLabel(self.scroll_area.viewport())
-            date_overlay.setObjectName("dateOverlay")
-            date_overlay.setAlignment(Qt.AlignCenter)
-            date_overlay.setMinimumWidth(200)
-            date_overlay.setText("アップロード日: 読み込み中...")
-            date_overlay.setContentsMargins(8, 6, 8, 6)
-            date_overlay.adjustSize()
-            date_overlay.hide()
-            date_overlay.setAttribute(Qt.WA_TransparentForMouseEvents)
-
-            video_layout.addWidget(thumbnail_container)
-            self.scroll_layout.addWidget(video_widget)
-            self.video_widgets[video["video_id"]] = {
-                "thumbnail_label": thumbnail_label,
-                "title_label": title_label,
-                "date_overlay": date_overlay,
-                "original_pixmap": None,
-                "scaled_pixmaps": {},
-                "status": "loading"
-            }
+    def library_roots(self):
+        return [[path, recursive] for path, recursive in self.library.roots()]
+
+    @instrumentation.timed("gui.restore_session")
+    def display_snapshot(self, snapshot, atlas):
+        """Shows the list saved by save_session, already loaded and in order,
+        painting thumbnails from the memory-mapped atlas."""
+        self.display_videos([
+            {"video_id": video_id, "path": path, "title": title}
+            for video_id, path, title in zip(snapshot["ids"], snapshot["paths"], snapshot["titles"])
+        ])
+        catalog = self.catalog
+        catalog.atlas = atlas
+        catalog.days = array("i", snapshot["days"])
+        catalog.tiles = array("i", snapshot["tiles"])
+        for position in range(len(catalog)):
+            catalog.set_status(position, LOADED)
+            self.search_index.set(position, catalog.title(position))
+        self.restored_ids = set(catalog.ids)
+        self.current_sort = snapshot["sort"]
+        for key, action in self.sort_actions.items():
+            action.setChecked(key == self.current_sort)
+        top = self.model.position(snapshot["top"])
+        if top is not None:
+            self.list_view.scrollTo(self.model.index(top), QAbstractItemView.PositionAtTop)
         self.update_status_label()
 
+    @instrumentation.timed("gui.save_session")
+    def save_session(self):
+        """Writes the loaded videos in display order, plus atlas tiles for
+        the rows nearest the current scroll position, for the next launch."""
+        catalog = self.catalog
+        roots = self.library_roots()
+        order = [p for p in self.sorted_positions if catalog.status[p] == LOADED]
+        if not roots or not order:
+            return
+        level = level_for(int(self.thumbnail_size[0] * self.list_view.devicePixelRatioF()))
+        tile_size = (level, level * 9 // 16)
+        max_tiles = settings.SESSION_ATLAS_MAX_BYTES // (tile_size[0] * tile_size[1] * 3)
+        first, _ = self.visible_row_range()
+        top = self.model.rows[first] if self.model.rows else order[0]
+        start = order.index(top) if top in order else 0
+        tiles = [-1] * len(order)
+
+        def tile_images():
+            count = 0
+            for index in list(range(start, len(order))) + list(range(start - 1, -1, -1)):
+                if count >= max_tiles:
+                    return
+                image = self.session_tile(order[index], level)
+                if image is not None:
+                    tiles[index] = count
+                    count += 1
+                    yield image
+
+        snapshot = {
+            "roots": roots,
+            "sort": self.current_sort,
+            "top": catalog.ids[top],
+            "ids": [catalog.ids[p] for p in order],
+            "paths": [catalog.paths[p] for p in order],
+            "titles": [catalog.title(p) for p in order],
+            "days": [catalog.days[p] for p in order],
+            "tiles": tiles,
+        }
+        try:
+            save_session(snapshot, tile_images(), tile_size)
+        except OSError as e:
+            print(f"Error saving session: {e}")
+
+    def session_tile(self, position, level):
+        video_id = self.catalog.ids[position]
+        pixmap = self.pixmap_cache.entries.get((video_id, level))
+        if pixmap is not None:
+            return pixmap.toImage()
+        if self.catalog.thumbnails[position]:
+            return decode_thumbnail(self.catalog.thumbnails[position])
+        return self.catalog.tile(position)
+
     def mark_thumbnail_failed(self, video_id):
-        if video_id in self.video_widgets:
-            self.video_widgets[video_id]["status"] = "failed"
-            self.update_status_label()
+        self.queue_result({"video_id": video_id, "thumbnail": None})
+
+    def queue_subtitle_indexing(self, video_data, prune_roots=None):
+        """Indexes the given files after whatever the indexer is working on.
+        With prune_roots, files indexed under those roots but absent from
+        video_data are dropped afterwards."""
+        self.subtitle_queue.extend(video_data)
+        if prune_roots is not None:
+            self.subtitle_prune_roots = prune_roots
+        if self.subtitle_indexer is None or not self.subtitle_indexer.isRunning():
+            self.start_subtitle_indexer()
+
+    def start_subtitle_indexer(self):
+        if not self.subtitle_queue and not self.subtitle_prune_roots:
+            return
+        self.subtitle_indexer = SubtitleIndexer(
+            self.subtitle_index, self.subtitle_queue, self.subtitle_prune_roots)
+        self.subtitle_queue = []
+        self.subtitle_prune_roots = None
+        self.subtitle_indexer.finished.connect(self.start_subtitle_indexer)
+        self.subtitle_indexer.start()
+
+    def stop_subtitle_indexer(self):
+        self.subtitle_queue = []
+        self.subtitle_prune_roots = None
+        if self.subtitle_indexer is not None:
+            self.subtitle_indexer.finished.disconnect(self.start_subtitle_indexer)
+            self.subtitle_indexer.cancel()
+            self.subtitle_indexer.wait()
+            self.subtitle_indexer = None
+
+    def queue_stats_analysis(self, video_data):
+        """Analyzes the given files' subtitles after the current batch."""
+        self.stats_queue.extend(video_data)
+        if self.stats_analyzer is None or not self.stats_analyzer.isRunning():
+            self.start_stats_analyzer()
+
+    def start_stats_analyzer(self):
+        if not self.stats_queue:
+            return
+        from srt_stats import SrtStatsCache
+        from stats_analyzer import StatsAnalyzer
+        if self.stats_cache is None:
+            self.stats_cache = SrtStatsCache()
+        self.stats_analyzer = StatsAnalyzer(self.stats_cache, self.stats_queue)
+        self.stats_queue = []
+        self.stats_analyzer.stats_ready.connect(self.apply_stats)
+        self.stats_analyzer.finished.connect(self.start_stats_analyzer)
+        self.stats_analyzer.start()
+
+    def stop_stats_analyzer(self):
+        self.stats_queue = []
+        self.stats_sort_timer.stop()
+        if self.stats_analyzer is not None:
+            self.stats_analyzer.stats_ready.disconnect(self.apply_stats)
+            self.stats_analyzer.finished.disconnect(self.start_stats_analyzer)
+            self.stats_analyzer.cancel()
+            self.stats_analyzer.wait()
+            self.stats_analyzer = None
+
+    @instrumentation.timed("gui.apply_stats")
+    def apply_stats(self, results):
+        for video_id, stats in results:
+            position = self.model.position(video_id)
+            if position is not None:
+                self.catalog.set_stats(position, stats)
+                self.sort_engine.set(position)
+        if self.current_sort in STAT_FIELDS and not self.stats_sort_timer.isActive():
+            self.stats_sort_timer.start()
+
+    def resort_by_stats(self):
+        if self.current_sort in STAT_FIELDS:
+            self.sort_videos(self.current_sort)
+
+    def open_subtitle_search(self):
+        if self.subtitle_search_dialog is None:
+            self.subtitle_search_dialog = SubtitleSearchDialog(
+                self.subtitle_index, self.title_for, self.custom_font, self)
+        self.subtitle_search_dialog.show()
+        self.subtitle_search_dialog.raise_()
+        self.subtitle_search_dialog.query_input.setFocus()
+
+    def toggle_diagnostics(self):
+        if self.diagnostics_panel is None:
+            self.diagnostics_panel = DiagnosticsPanel(self.custom_font, self.loop_monitor, self)
+        if self.diagnostics_panel.isVisible():
+            self.diagnostics_panel.hide()
+        else:
+            self.diagnostics_panel.show()
+            self.diagnostics_panel.raise_()
 
-    def load_thumbnails(self, video_data):
-        self.thumbnail_loader = ThumbnailLoader(video_data)
+    def title_for(self, video_id):
+        position = self.model.position(video_id)
+        if position is None or self.catalog.status[position] != LOADED:
+            return video_id
+        return self.catalog.title(position)
+
+    def stop_thumbnail_loader(self):
+        """Cancels the running load, keeping the thread alive until it exits."""
+        loader = self.thumbnail_loader
+        if loader is None:
+            return
+        self.thumbnail_loader = None
+        loader.thumbnail_loaded.disconnect(self.update_thumbnail)
+        loader.thumbnail_failed.disconnect(self.mark_thumbnail_failed)
+        loader.cancel()
+        if loader.isRunning():
+            self.retired_loaders.append(loader)
+            loader.finished.connect(lambda l=loader: self.retired_loaders.remove(l))
+
+    def stop_thumbnail_upgrader(self):
+        upgrader = self.thumbnail_upgrader
+        if upgrader is None:
+            return
+        self.thumbnail_upgrader = None
+        self.pending_upgrades.clear()
+        upgrader.thumbnail_loaded.disconnect(self.upgrade_thumbnail)
+        upgrader.thumbnail_failed.disconnect(self.upgrade_failed)
+        upgrader.cancel()
+        if upgrader.isRunning():
+            self.retired_loaders.append(upgrader)
+            upgrader.finished.connect(lambda l=upgrader: self.retired_loaders.remove(l))
+
+    def wanted_variant(self):
+        # Nothing wider than the largest cache level is ever painted
+        width = int(self.thumbnail_size[0] * self.list_view.devicePixelRatioF())
+        return thumbnail_variant(min(width, LEVELS[-1]))
+
+    def load_thumbnails(self, video_data, force_refresh=False):
+        self.stop_thumbnail_loader()
+        self.stop_thumbnail_upgrader()
+        # Imported on first use: it brings in requests and the metadata
+        # providers, which the window does not need to appear
+        from thumbnail_loader import ThumbnailLoader
+        self.thumbnail_variant = self.wanted_variant()
+        self.thumbnail_loader = ThumbnailLoader(
+            video_data, self.metadata_cache, force_refresh, self.thumbnail_cache,
+            variant=self.thumbnail_variant)
         self.thumbnail_loader.thumbnail_loaded.connect(self.update_thumbnail)
         self.thumbnail_loader.thumbnail_failed.connect(self.mark_thumbnail_failed)
+        self.update_load_order()
         self.thumbnail_loader.start()
 
     def update_thumbnail(self, video):
-        widget = self.video_widgets[video["video_id"]]
-        if video["thumbnail"] and not video["thumbnail"].isNull():
-            widget["original_pixmap"] = video["thumbnail"]
-            scaled_thumbnail = video["thumbnail"].scaled(
-                self.thumbnail_size[0], self.thumbnail_size[1], 
-                Qt.KeepAspectRatio, Qt.SmoothTransformation
-            )
-            widget["scaled_pixmaps"][self.thumbnail_size] = scaled_thumbnail
-            widget["thumbnail_label"].setPixmap(scaled_thumbnail)
-            widget["thumbnail_label"].setFixedSize(self.thumbnail_size[0], self.thumbnail_size[1])
-            widget["title_label"].setText(video["title"])
-            
-            widget["date_overlay"].setText(f"アップロード日: {video['upload_date']}")
-            widget["date_overlay"].adjustSize()
-            
-            widget["status"] = "loaded"
-            
-            if all(w["status"] != "loading" for w in self.video_widgets.values()):
-                self.sort_videos(self.current_sort)
-        else:
-            widget["status"] = "failed"
+        self.queue_result(video)
+
+    def queue_result(self, video):
+        self.pending_results.append(video)
+        if not self.result_timer.isActive():
+            self.result_timer.start()
+
+    @instrumentation.timed("gui.apply_results")
+    def apply_results(self, budget=0.008):
+        """Applies buffered loader results for up to `budget` seconds, then
+        refreshes the status once and leaves the rest to the next frame."""
+        deadline = time.perf_counter() + budget
+        loaded_in_order = False
+        indexed = False
+        while self.pending_results and time.perf_counter() < deadline:
+            video = self.pending_results.popleft()
+            position = self.model.position(video["video_id"])
+            if position is None or self.catalog.status[position] != LOADING:
+                continue  # result from a load that was cancelled
+            if video["thumbnail"] is None or video["thumbnail"].isNull():
+                self.catalog.set_status(position, FAILED)
+                continue
+            self.set_thumbnail(position, video)
+            self.catalog.set_title(position, video["title"])
+            self.catalog.set_upload_date(position, video["upload_date"])
+            self.catalog.set_status(position, LOADED)
+            self.search_index.set(position, video["title"])
+            indexed = True
+            self.sort_engine.set(position)
+            self.model.video_changed(video["video_id"])
+
+            if video["video_id"] in self.incremental_ids:
+                # Added while watching: move it to where its metadata sorts
+                self.incremental_ids.discard(video["video_id"])
+                self.reposition(position)
+            else:
+                loaded_in_order = True
+        if indexed and self.search_input.text() and not self.search_timer.isActive():
+            # Newly titled rows may match the current search
+            self.search_timer.start()
+        if self.pending_results:
+            self.result_timer.start()
+        elif loaded_in_order and not self.scan_in_progress and not self.catalog.count(LOADING):
+            self.sort_videos(self.current_sort)
         self.update_status_label()
 
+    def set_thumbnail(self, position, video):
+        self.catalog.set_thumbnail(position, video["thumbnail_data"], video["thumbnail_variant"])
+        self.pixmap_cache.discard(video["video_id"])
+        self.pending_images.append((video["video_id"], video["thumbnail"]))
+        if not self.image_timer.isActive():
+            self.image_timer.start()
+
+    @instrumentation.timed("gui.apply_images")
+    def apply_pending_images(self, batch_size=32):
+        """Seeds the pixmap cache at the painted level from decoded images,
+        a batch per frame, so rows need no second decode."""
+        level = level_for(int(self.thumbnail_size[0] * self.list_view.devicePixelRatioF()))
+        for _ in range(min(batch_size, len(self.pending_images))):
+            video_id, image = self.pending_images.popleft()
+            if self.model.position(video_id) is not None:
+                self.pixmap_cache.add_scaled(video_id, image, level)
+        self.list_view.viewport().update()
+        if self.pending_images:
+            self.image_timer.start()
+
+    def upgrade_thumbnails(self, first, last, window):
+        """Refetches rows around the viewport whose thumbnail variant is
+        smaller than the one the current size needs."""
+        # Variant codes are ordered by size
+        wanted = VARIANTS.index(self.thumbnail_variant)
+        level = level_for(int(self.thumbnail_size[0] * self.list_view.devicePixelRatioF()))
+        catalog = self.catalog
+        rows = self.model.rows
+        upgrades = []
+        for row in range(max(0, first - window), min(len(rows), last + window + 1)):
+            position = rows[row]
+            if catalog.status[position] != LOADED or catalog.ids[position] in self.pending_upgrades:
+                continue
+            if catalog.variants[position] == NO_VARIANT:
+                # Restored from the session: its bytes are only fetched (from
+                # the disk cache) once the atlas tile no longer covers the size
+                if catalog.tile(position) is not None and catalog.atlas.width >= level:
+                    continue
+            elif catalog.variants[position] >= wanted:
+                continue
+            upgrades.append({"video_id": catalog.ids[position]})
+        if not upgrades:
+            return
+        if self.thumbnail_upgrader is None:
+            from thumbnail_loader import ThumbnailLoader
+            self.thumbnail_upgrader = ThumbnailLoader(
+                (), None, False, self.thumbnail_cache, jobs=4, thumbnail_only=True)
+            self.thumbnail_upgrader.thumbnail_loaded.connect(self.upgrade_thumbnail)
+            self.thumbnail_upgrader.thumbnail_failed.connect(self.upgrade_failed)
+            self.thumbnail_upgrader.start()
+        self.thumbnail_upgrader.set_variant(self.thumbnail_variant)
+        self.pending_upgrades.update(video["video_id"] for video in upgrades)
+        self.thumbnail_upgrader.add_videos(upgrades)
+
+    def upgrade_thumbnail(self, video):
+        self.pending_upgrades.discard(video["video_id"])
+        position = self.model.position(video["video_id"])
+        if position is not None and not video["thumbnail"].isNull():
+            self.set_thumbnail(position, video)
+
+    def upgrade_failed(self, video_id):
+        # The smaller variant stays; the row is retried when it scrolls back
+        self.pending_upgrades.discard(video_id)
+
     def update_status_label(self):
-        loaded = sum(1 for w in self.video_widgets.values() if w["status"] == "loaded")
-        loading = sum(1 for w in self.video_widgets.values() if w["status"] == "loading")
-        failed = sum(1 for w in self.video_widgets.values() if w["status"] == "failed")
+        counts = self.catalog.status_counts
+        loaded, loading, failed = counts[LOADED], counts[LOADING], counts[FAILED]
         self.status_label.setText(f"読み込みました: {loaded} | 読み込み中: {loading} | 失敗: {failed}")
+        self.update_cache_tooltip()
+
+    def update_cache_tooltip(self):
+        stats = self.pixmap_cache.stats()
+        self.status_label.setToolTip(
+            f"サムネイルキャッシュ: {stats['used_bytes'] / 1048576:.1f} / {stats['budget_bytes'] / 1048576:.0f} MB"
+            f" | {stats['entries']} 枚 | ヒット率: {stats['hit_rate']:.0%}")
 
+    @instrumentation.timed("gui.resize_tick")
+    def resize_thumbnails(self, new_width):
+        """Cheap per-tick part of a resize: relayout and repaint the visible
+        rows from whatever is cached; _update_sizes runs once it settles."""
+        self.thumbnail_size = (new_width, int(new_width * 9 / 16))
+        self.stop_thumbnail_rescaler()
+        self.delegate.fast = True
+        self.delegate.set_thumbnail_size(self.thumbnail_size)
+        self.list_view.doItemsLayout()
+        self.resize_timer.start()
+
+    @instrumentation.timed("gui.update_sizes")
     def _update_sizes(self, new_width=None):
         if new_width is None:
             new_width = self.size_slider.value()
@@ -281,136 +908,304 @@ class SubtitleViewer(QMainWindow):
         new_height = int(new_width * 9 / 16)
         self.thumbnail_size = (new_width, new_height)
         
-        title_width = int(new_width * 1.1)
-        
         font_scale = new_width / 320
         new_font_size = max(10, min(20, int(self.base_font_size * font_scale)))
         if new_font_size != self.current_font_size:
             self.current_font_size = new_font_size
             self.custom_font.setPointSize(new_font_size)
+
+        self.delegate.font = self.custom_font
+        self.delegate.set_thumbnail_size(self.thumbnail_size)
+        # Item sizes are uniform and cached by the view, so force a relayout
+        self.list_view.doItemsLayout()
+
+        overlay = self.date_overlay
+        overlay.setFont(self.custom_font)
+        margin_scale = font_scale * 1.2  
+        overlay.setContentsMargins(
+            int(8 * margin_scale),
+            int(6 * margin_scale),
+            int(8 * margin_scale),
+            int(6 * margin_scale)
+        )
+        overlay.setMinimumWidth(max(200, int(new_width * 0.7)))
+        overlay.setMaximumWidth(int(new_width * 1.2))
+        overlay.adjustSize()
+        variant = self.wanted_variant()
+        if THUMBNAIL_VARIANTS[variant] > THUMBNAIL_VARIANTS[self.thumbnail_variant]:
+            # Zoomed in past what was fetched: pending loads and visible
+            # rows move to the larger variant; zooming out keeps it
+            self.thumbnail_variant = variant
+            if self.thumbnail_loader is not None:
+                self.thumbnail_loader.set_variant(variant)
+        self.priority_timer.start()
+        self.rescale_thumbnails()
+
+    def stop_thumbnail_rescaler(self):
+        if self.thumbnail_rescaler is not None:
+            self.thumbnail_rescaler.cancel()
+            self.thumbnail_rescaler.images_ready.disconnect()
+            self.thumbnail_rescaler.finished.disconnect()
+            self.thumbnail_rescaler.wait()
+            self.thumbnail_rescaler = None
+
+    def rescale_thumbnails(self):
+        """Smooth-scales the thumbnails at and around the viewport to the
+        settled size in the background; rows further away rescale on paint.
+
+        Painting stays fast, from whatever level is cached, until the
+        rescaler has delivered, so the GUI thread never smooth-scales the
+        whole viewport itself.
+        """
+        self.stop_thumbnail_rescaler()
+        if not self.model.rows:
+            self.finish_rescale()
+            return
+        level = level_for(int(self.thumbnail_size[0] * self.list_view.devicePixelRatioF()))
+        first, last = self.visible_row_range()
+        window = (last - first + 1) * self.prefetch_screens
+        rows = list(range(first, last + 1))
+        rows += range(last + 1, min(len(self.model.rows), last + 1 + window))
+        rows += range(first - 1, max(-1, first - 1 - window), -1)
+        jobs = []
+        catalog = self.catalog
+        for row in rows:
+            position = self.model.rows[row]
+            data = catalog.thumbnails[position]
+            if data and not self.pixmap_cache.has_smooth(catalog.ids[position], level):
+                jobs.append((catalog.ids[position], data))
+        if not jobs:
+            self.finish_rescale()
+            return
+        rescaler = self.thumbnail_rescaler = ThumbnailRescaler(jobs, level)
+        rescaler.images_ready.connect(self.apply_rescaled_thumbnails)
+        rescaler.finished.connect(partial(self.finish_rescale, rescaler))
+        rescaler.start()
+
+    def finish_rescale(self, rescaler=None):
+        if rescaler is not self.thumbnail_rescaler:
+            return  # replaced by a newer resize
+        self.thumbnail_rescaler = None
+        self.delegate.fast = False
+        self.list_view.viewport().update()
+
+    @instrumentation.timed("gui.apply_rescaled")
+    def apply_rescaled_thumbnails(self, images):
+        for video_id, level, image in images:
+            if self.model.position(video_id) is not None:
+                self.pixmap_cache.put(video_id, level, QPixmap.fromImage(image))
+        self.list_view.viewport().update()
+
+    @instrumentation.timed("gui.filter")
+    def filter_videos(self, search_text=None):
+        if search_text is None:
+            search_text = self.search_input.text()
+        self.hide_date_overlay()
+        matches = self.search_index.search(search_text)
         
-        for widget in self.video_widgets.values():
-            if widget["original_pixmap"]:
-                if self.thumbnail_size not in widget["scaled_pixmaps"]:
-                    widget["scaled_pixmaps"][self.thumbnail_size] = widget["original_pixmap"].scaled(
-                        new_width, new_height, Qt.KeepAspectRatio, Qt.SmoothTransformation
-                    )
-                scaled_pixmap = widget["scaled_pixmaps"][self.thumbnail_size]
-            else:
-                scaled_pixmap = QPixmap(new_width, new_height)
-                scaled_pixmap.fill(Qt.gray)
-            
-            widget["thumbnail_label"].setPixmap(scaled_pixmap)
-            widget["thumbnail_label"].setFixedSize(new_width, new_height)
-            widget["title_label"].setFont(self.custom_font)
-            widget["title_label"].setFixedWidth(title_width)
-            
-            overlay = widget["date_overlay"]
-            overlay.setFont(self.custom_font)
-            
-            margin_scale = font_scale * 1.2  
-            overlay.setContentsMargins(
-                int(8 * margin_scale),
-                int(6 * margin_scale),
-                int(8 * margin_scale),
-                int(6 * margin_scale)
-            )
-            
-            overlay.setMinimumWidth(max(200, int(new_width * 0.7)))
-            overlay.setMaximumWidth(int(new_width * 1.2))
-            overlay.adjustSize()
-
-    def filter_videos(self, search_text):
-        search_text = search_text.lower()
-        
-        if not search_text:
-            for _, widget_data in self.video_widgets.items():
-                widget_data["title_label"].parentWidget().setVisible(True)
+        if matches is None:
+            self.model.set_rows(self.sorted_positions)
+            self.load_order_timer.start()
             self.update_status_label()
             return
         
-        showing = 0
-        hidden = 0
+        rows = sorted(matches, key=self.sort_rank.__getitem__)
+        self.model.set_rows(rows)
+        self.load_order_timer.start()
         
-        for _, widget_data in self.video_widgets.items():
-            title = widget_data["title_label"].text().lower()
-            if search_text in title:
-                widget_data["title_label"].parentWidget().setVisible(True)
-                showing += 1
-            else:
-                widget_data["title_label"].parentWidget().setVisible(False)
-                hidden += 1
-        
-        self.status_label.setText(f"表示中: {showing} | 非表示: {hidden}")
+        self.status_label.setText(f"表示中: {len(rows)} | 非表示: {len(self.catalog.position_of) - len(rows)}")
+
+    @instrumentation.timed("gui.load_order")
+    def update_load_order(self):
+        """Queues pending loads in display order, filtered-out rows last."""
+        if self.thumbnail_loader is None:
+            return
+        ids = self.catalog.ids
+        loading = set(self.catalog.with_status(LOADING))
+        if not loading:
+            return
+        shown = set(self.model.rows)
+        ordered = [ids[p] for p in self.model.rows if p in loading]
+        hidden = [ids[p] for p in self.sorted_positions if p in loading and p not in shown]
+        self.thumbnail_loader.set_base_order(ordered, hidden)
+        self.priority_timer.start()
+
+    def visible_row_range(self):
+        rect = self.list_view.viewport().rect()
+        x = rect.center().x()
+        top = self.list_view.indexAt(QPoint(x, rect.top()))
+        bottom = self.list_view.indexAt(QPoint(x, rect.bottom()))
+        first = top.row() if top.isValid() else 0
+        if bottom.isValid():
+            return first, bottom.row()
+        # Past the last row, or the batched relayout has not reached the
+        # viewport yet: estimate from the uniform row height
+        row_height = max(1, self.list_view.sizeHintForRow(first)) if self.model.rowCount() else 1
+        return first, min(self.model.rowCount() - 1, first + rect.height() // row_height)
+
+    @instrumentation.timed("gui.load_priorities")
+    def update_load_priorities(self):
+        """Boosts loads for rows on screen, then a window around them."""
+        if not self.model.rows:
+            return
+        catalog = self.catalog
+        rows = self.model.rows
+        first, last = self.visible_row_range()
+        window = (last - first + 1) * self.prefetch_screens
+        self.upgrade_thumbnails(first, last, window)
+        if self.thumbnail_loader is None:
+            return
+        priorities = {}
+
+        def boost(row, priority):
+            position = rows[row]
+            if catalog.status[position] == LOADING:
+                priorities[catalog.ids[position]] = priority
+
+        for row in range(first, last + 1):
+            boost(row, (VISIBLE, row - first))
+        for distance in range(1, window + 1):
+            if last + distance < len(rows):
+                boost(last + distance, (PREFETCH, distance))
+            if first - distance >= 0:
+                boost(first - distance, (PREFETCH, distance))
+        self.thumbnail_loader.boost(priorities)
+
+    def hide_date_overlay(self):
+        self.date_overlay.hide()
+        self.hovered_video_id = None
+        if self.delegate.hovered_link is not None:
+            self.delegate.hovered_link = None
+            self.list_view.viewport().update()
+
+    def update_hover(self, pos):
+        index = self.list_view.indexAt(pos)
+        if not index.isValid():
+            self.hide_date_overlay()
+            return
+        position = index.data(VIDEO_ROLE)
+        video_id = self.catalog.ids[position]
+        _, link_rect, thumbnail_rect = self.delegate.layout(self.list_view.visualRect(index))
+
+        hovered_link = video_id if link_rect.contains(pos) else None
+        if hovered_link != self.delegate.hovered_link:
+            self.delegate.hovered_link = hovered_link
+            self.list_view.viewport().update()
+        self.list_view.viewport().setCursor(Qt.PointingHandCursor if hovered_link else Qt.ArrowCursor)
+
+        if not thumbnail_rect.contains(pos):
+            self.date_overlay.hide()
+            self.hovered_video_id = None
+            return
+        if self.hovered_video_id == video_id:
+            return
+        self.hovered_video_id = video_id
+        overlay = self.date_overlay
+        text = f"アップロード日: {self.catalog.upload_date(position) or '読み込み中...'}"
+        stats = self.catalog.stats_of(position)
+        if stats is not None:
+            text += (f"\n字幕: {stats['cues']} | 発話: {format_timestamp(stats['spoken_ms'])}"
+                     f"\n文字数: {stats['chars']} | 漢字: {stats['kanji']} | 語彙: {stats['vocabulary']}"
+                     f"\n1分あたり: {stats['lines_per_minute']:.1f} 行")
+        overlay.setText(text)
+        overlay.adjustSize()
+        overlay.move(
+            thumbnail_rect.x() + (thumbnail_rect.width() - overlay.width()) // 2,
+            thumbnail_rect.y() + thumbnail_rect.height() // 3
+        )
+        overlay.raise_()
+        overlay.show()
 
     def eventFilter(self, watched, event):
-        if event.type() == QEvent.Enter:
-            for video_id, data in self.video_widgets.items():
-                if watched == data["thumbnail_label"]:
-                    overlay = data["date_overlay"]
-                    global_pos = watched.mapToGlobal(QPoint(0, 0))
-                    viewport_pos = self.scroll_area.viewport().mapFromGlobal(global_pos)
-                    overlay.adjustSize()  
-                    overlay.move(
-                        viewport_pos.x() + (watched.width() - overlay.width()) // 2,
-                        viewport_pos.y() + watched.height() // 3
-                    )
-                    overlay.raise_()
-                    overlay.show()
-                    break
-        
-        elif event.type() == QEvent.Leave:
-            for video_id, data in self.video_widgets.items():
-                if watched == data["thumbnail_label"]:
-                    data["date_overlay"].hide()
-                    break
+        if watched is self.list_view.viewport():
+            if event.type() == QEvent.MouseMove:
+                self.update_hover(event.pos())
+            elif event.type() == QEvent.Leave:
+                self.hide_date_overlay()
+            elif event.type() == QEvent.Paint and self.after_first_paint:
+                tasks, self.after_first_paint = self.after_first_paint, []
+                for task in tasks:
+                    QTimer.singleShot(0, task)
         
         return super().eventFilter(watched, event)
 
+    @instrumentation.timed("gui.sort")
     def sort_videos(self, sort_key):
-        if not self.video_widgets:
+        if not self.catalog.position_of:
             return
         
         for key, action in self.sort_actions.items():
             action.setChecked(key == sort_key)
         
         self.current_sort = sort_key
-        
-        videos = []
-        for video_id, widget_data in self.video_widgets.items():
-            title = widget_data["title_label"].text()
-            upload_date = widget_data["date_overlay"].text().replace("アップロード日: ", "")
-            videos.append({
-                "video_id": video_id,
-                "title": title,
-                "upload_date": upload_date,
-                "widget": widget_data["title_label"].parentWidget()
-            })
-        
-        if sort_key == "date_newest":
-            videos.sort(key=lambda x: x["upload_date"], reverse=True)
-        elif sort_key == "date_oldest":
-            videos.sort(key=lambda x: x["upload_date"])
-        elif sort_key == "length":
-            videos.sort(key=lambda x: len(x["title"]))
-        
-        for i in reversed(range(self.scroll_layout.count())):
-            self.scroll_layout.takeAt(i)
-        
-        for video in videos:
-            self.scroll_layout.addWidget(video["widget"])
+        # The engine keeps every used order sorted, so this is only a copy
+        self.sorted_positions = list(self.sort_engine.order(sort_key))
+        self.update_sort_ranks()
+        self.filter_videos()
+
+    def update_sort_ranks(self):
+        self.sort_rank = array("I", [0]) * len(self.catalog)
+        for rank, position in enumerate(self.sorted_positions):
+            self.sort_rank[position] = rank
+
+    def sorted_insertion_point(self, position):
+        """Binary search for where `position` belongs in sorted_positions.
+
+        sorted_positions may still be in scan order while videos load, so
+        this searches it directly rather than asking the engine."""
+        key = partial(self.sort_engine.key, self.current_sort)
+        target = key(position)
+        low, high = 0, len(self.sorted_positions)
+        while low < high:
+            middle = (low + high) // 2
+            if target < key(self.sorted_positions[middle]):
+                high = middle
+            else:
+                low = middle + 1
+        return low
+
+    def insert_sorted(self, position, show=True):
+        index = self.sorted_insertion_point(position)
+        self.sorted_positions.insert(index, position)
+        if show:
+            self.model.insert_row(index, position)
+
+    def reposition(self, position):
+        """Moves one video to its sorted place after its key changed."""
+        self.sorted_positions.remove(position)
+        index = self.sorted_insertion_point(position)
+        self.sorted_positions.insert(index, position)
+        self.update_sort_ranks()
+        if self.search_input.text():
+            self.search_timer.start()
+        elif self.model.hide_row(position):
+            # Unfiltered, the view rows mirror sorted_positions
+            self.model.insert_row(index, position)
 
     def resizeEvent(self, event):
-        if not self.resizing and self.video_widgets:
+        if not self.resizing and self.catalog.position_of:
             self.resizing = True
             new_thumb_width = max(200, min(400, int(self.width() * 0.35)))
             self.size_slider.blockSignals(True)
             self.size_slider.setValue(new_thumb_width)
             self.size_slider.blockSignals(False)
-            self._update_sizes(new_thumb_width)
+            self.resize_thumbnails(new_thumb_width)
             self.resizing = False
         super().resizeEvent(event)
 
+    def closeEvent(self, event):
+        self.stop_thumbnail_loader()
+        self.stop_thumbnail_upgrader()
+        self.stop_thumbnail_rescaler()
+        self.stop_folder_scanner()
+        self.stop_folder_watcher()
+        self.stop_subtitle_indexer()
+        self.stop_stats_analyzer()
+        for loader in self.retired_loaders:
+            loader.wait(2000)
+        self.save_session()
+        super().closeEvent(event)
+
     def dragEnterEvent(self, event):
         mime_data = event.mimeData()
         if mime_data.hasUrls():
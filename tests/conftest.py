@@ -0,0 +1,42 @@
+import os
+import sys
+import tempfile
+
+ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+sys.path[:0] = [ROOT, os.path.join(ROOT, "benchmarks")]
+os.environ.setdefault("QT_QPA_PLATFORM", "offscreen")
+# Before settings is imported, so no test touches the real caches
+os.environ["SRT_VIEWER_CACHE_DIR"] = tempfile.mkdtemp(prefix="srt-viewer-tests-")
+
+import pytest
+
+import settings
+
+@pytest.fixture
+def fake_youtube(monkeypatch):
+    from fake_youtube import FakeYouTube
+    fake = FakeYouTube().start()
+    monkeypatch.setattr(settings, "YOUTUBE_BASE_URL", fake.base_url)
+    monkeypatch.setattr(settings, "THUMBNAIL_BASE_URL", fake.base_url)
+    yield fake
+    fake.stop()
+
+@pytest.fixture(scope="session")
+def qapp():
+    from PyQt5.QtWidgets import QApplication
+    return QApplication.instance() or QApplication([])
+
+@pytest.fixture
+def viewer(qapp, fake_youtube, monkeypatch, tmp_path_factory):
+    # A fresh library and caches for every viewer
+    cache_dir = str(tmp_path_factory.mktemp("cache"))
+    monkeypatch.setattr(settings, "CACHE_DIR", cache_dir)
+    monkeypatch.setattr(settings, "THUMBNAIL_CACHE_DIR", os.path.join(cache_dir, "thumbnails"))
+    monkeypatch.setattr(settings, "SESSION_DIR", os.path.join(cache_dir, "session"))
+    monkeypatch.setattr(settings, "WATCH_FOLDERS", False)
+    from subtitle_viewer import SubtitleViewer
+    viewer = SubtitleViewer()
+    viewer.show()
+    qapp.processEvents()
+    yield viewer
+    viewer.close()
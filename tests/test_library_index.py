@@ -0,0 +1,51 @@
+import pytest
+
+import library_index
+from library_index import LibraryIndex
+
+SRT = "1\n00:00:01,000 --> 00:00:02,000\nこんにちは\n"
+
+def make_library(tmp_path):
+    parent = tmp_path / "library"
+    child = parent / "child"
+    child.mkdir(parents=True)
+    (parent / "[abcdefghijk].srt").write_text(SRT, encoding="utf-8")
+    (child / "[lmnopqrstuv].srt").write_text(SRT, encoding="utf-8")
+    return parent, child
+
+@pytest.mark.parametrize("child_first", [False, True])
+def test_overlapping_roots_list_shared_directories_once(tmp_path, monkeypatch, child_first):
+    parent, child = make_library(tmp_path)
+    index = LibraryIndex(str(tmp_path / "library.sqlite3"))
+    roots = [(str(parent), True), (str(child), False)]
+    for path, recursive in reversed(roots) if child_first else roots:
+        index.add_root(path, recursive)
+    added = [r["video_id"] for kind, records in index.refresh() if kind == "added" for r in records]
+    assert sorted(added) == ["abcdefghijk", "lmnopqrstuv"]
+
+    listed = []
+    original = library_index.list_subtitle_directory
+    def spy(directory):
+        listed.append(directory)
+        return original(directory)
+    monkeypatch.setattr(library_index, "list_subtitle_directory", spy)
+    assert list(index.refresh()) == []
+    assert listed == []
+    assert sorted(r["video_id"] for r in index.records()) == ["abcdefghijk", "lmnopqrstuv"]
+
+    (child / "[wxyzABCDEFG].srt").write_text(SRT, encoding="utf-8")
+    added = [r["video_id"] for kind, records in index.refresh() if kind == "added" for r in records]
+    assert added == ["wxyzABCDEFG"]
+    assert listed == [str(child)]
+
+def test_removing_a_root_prunes_its_subtitles(viewer, tmp_path):
+    from bench_app import wait_until
+    parent, child = make_library(tmp_path)
+    viewer.library.add_root(str(child))
+    viewer.library.add_root(str(parent))
+    viewer.load_library()
+    subtitle_hits = lambda: {video_id for video_id, _, _ in viewer.subtitle_index.search("こんにちは")}
+    assert wait_until(lambda: subtitle_hits() == {"abcdefghijk", "lmnopqrstuv"}, 10)
+
+    viewer.remove_library_root(str(parent))
+    assert wait_until(lambda: subtitle_hits() == {"lmnopqrstuv"}, 10)
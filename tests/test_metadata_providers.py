@@ -0,0 +1,41 @@
+import pytest
+import requests
+
+import settings
+from fetch_engine import FetchEngine
+from metadata_cache import MetadataCache
+from metadata_providers import ProviderChain, create_providers
+from video_fetcher import VideoFetcher
+
+VIDEO_ID = "abcdefghijk"
+
+def test_default_chain_reaches_watch_page_for_date(fake_youtube):
+    # The watch page has to be asked for the date anyway, so oEmbed is skipped
+    chain = ProviderChain(create_providers(FetchEngine(retries=0)))
+    title, upload_date = chain.resolve({"video_id": VIDEO_ID})
+    assert title == fake_youtube.title(VIDEO_ID)
+    assert upload_date == fake_youtube.upload_date(VIDEO_ID)
+    assert fake_youtube.stats == {200: 1}
+
+def test_title_only_chain_stops_at_oembed(fake_youtube):
+    chain = ProviderChain(create_providers(FetchEngine(retries=0)), required_fields=["title"])
+    title, upload_date = chain.resolve({"video_id": VIDEO_ID})
+    assert title == fake_youtube.title(VIDEO_ID)
+    assert upload_date == "Unknown Date"
+    assert fake_youtube.stats == {200: 1}
+
+def test_filename_title_skips_oembed(fake_youtube):
+    chain = ProviderChain(create_providers(FetchEngine(retries=0)))
+    title, upload_date = chain.resolve({"video_id": VIDEO_ID, "filename_title": "From the file"})
+    assert title == "From the file"
+    assert upload_date == fake_youtube.upload_date(VIDEO_ID)
+    assert fake_youtube.stats == {200: 1}
+
+def test_network_error_is_raised_and_not_cached(monkeypatch, tmp_path):
+    # Nothing listens on the discard port
+    monkeypatch.setattr(settings, "YOUTUBE_BASE_URL", "http://127.0.0.1:9")
+    cache = MetadataCache(str(tmp_path / "metadata.sqlite3"))
+    fetcher = VideoFetcher(FetchEngine(retries=0), cache)
+    with pytest.raises(requests.ConnectionError):
+        fetcher.get_video_info({"video_id": VIDEO_ID, "filename_title": "From the file"})
+    assert cache.get(VIDEO_ID, allow_stale=True) is None
@@ -0,0 +1,19 @@
+import pytest
+
+from pixmap_cache import PixmapCache, level_for
+
+@pytest.fixture
+def jpeg(qapp):
+    from fake_youtube import make_jpeg
+    return make_jpeg(320, 180)
+
+def test_fast_scale_is_not_smooth_until_replaced(jpeg):
+    from pixmap_cache import decode_thumbnail
+    cache = PixmapCache()
+    level = level_for(240)
+    assert cache.thumbnail("abcdefghijk", jpeg, 240, fast=True) is not None
+    assert ("abcdefghijk", level) in cache
+    assert not cache.has_smooth("abcdefghijk", level)
+
+    cache.add_scaled("abcdefghijk", decode_thumbnail(jpeg), level)
+    assert cache.has_smooth("abcdefghijk", level)
@@ -0,0 +1,41 @@
+import os
+
+import pytest
+
+import session_snapshot
+from session_snapshot import load_session, save_session
+
+ROOTS = [["/library", False]]
+
+def solid(color):
+    from PyQt5.QtGui import QColor, QImage
+    image = QImage(16, 9, QImage.Format_RGB888)
+    image.fill(QColor(color))
+    return image
+
+def save(directory, color):
+    snapshot = {"roots": ROOTS, "ids": ["abcdefghijk"], "tiles": [0]}
+    save_session(snapshot, [solid(color)], (16, 9), str(directory))
+
+def test_interrupted_save_keeps_the_old_snapshot_and_atlas(qapp, tmp_path, monkeypatch):
+    save(tmp_path, "red")
+    replace = os.replace
+    def crash(source, destination):
+        if destination.endswith(session_snapshot.SNAPSHOT_FILE):
+            raise OSError("interrupted")
+        replace(source, destination)
+    # The new atlas is complete, but the snapshot naming it never lands
+    monkeypatch.setattr(session_snapshot.os, "replace", crash)
+    with pytest.raises(OSError):
+        save(tmp_path, "blue")
+    monkeypatch.undo()
+
+    snapshot, atlas = load_session(ROOTS, str(tmp_path))
+    assert atlas.image(0).pixelColor(0, 0).name() == "#ff0000"
+    atlas.close()
+
+    save(tmp_path, "green")
+    snapshot, atlas = load_session(ROOTS, str(tmp_path))
+    assert atlas.image(0).pixelColor(0, 0).name() == "#008000"
+    atlas.close()
+    assert [name for name in os.listdir(tmp_path) if name.endswith(".rgb")] == [snapshot["atlas"]]
@@ -0,0 +1,20 @@
+from bench_app import wait_until
+from video_catalog import LOADING
+
+SRT = "1\n00:00:01,000 --> 00:00:02,000\nこんにちは\n"
+
+def test_duplicate_ids_in_one_folder_keep_first_file(viewer, tmp_path):
+    for name in ("[abcdefghijk].srt", "Title [abcdefghijk].srt"):
+        (tmp_path / name).write_text(SRT, encoding="utf-8")
+    viewer.load_folder_contents(str(tmp_path))
+    assert wait_until(lambda: not viewer.scan_in_progress and viewer.catalog.count(LOADING) == 0, 10)
+    assert list(viewer.catalog.ids) == ["abcdefghijk"]
+    assert viewer.model.rowCount() == 1
+
+def test_search_ignores_loading_placeholder(viewer, fake_youtube, tmp_path):
+    (tmp_path / "[lmnopqrstuv].srt").write_text(SRT, encoding="utf-8")
+    viewer.load_folder_contents(str(tmp_path))
+    assert wait_until(lambda: len(viewer.catalog) == 1, 10)
+    assert not viewer.search_index.search("loading")
+    assert wait_until(lambda: viewer.catalog.count(LOADING) == 0, 10)
+    assert viewer.search_index.search(fake_youtube.title("lmnopqrstuv")) == {0}
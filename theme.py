@@ -38,7 +38,7 @@ def get_black_white_theme():
             border-radius: 6px;
             padding: 4px;
         }
-        QScrollArea {
+        QScrollArea, QListView {
             background-color: transparent;
             border: none;
         }
@@ -0,0 +1,152 @@
+import hashlib
+import os
+import sqlite3
+import threading
+import time
+
+import settings
+
+class ThumbnailCache:
+    """Content-addressed disk cache for raw thumbnail bytes.
+
+    Blobs are stored under their SHA-256 digest, so identical images fetched
+    through different URLs share one file. An SQLite index maps each URL to
+    its blob plus the ETag / Last-Modified validators needed to revalidate it,
+    and evicts least recently used blobs once the cache exceeds max_bytes.
+    """
+
+    def __init__(self, directory=None, max_bytes=None, ttl=None):
+        self.directory = settings.THUMBNAIL_CACHE_DIR if directory is None else directory
+        self.max_bytes = settings.THUMBNAIL_CACHE_MAX_BYTES if max_bytes is None else max_bytes
+        self.ttl = settings.THUMBNAIL_TTL if ttl is None else ttl
+        self.blob_dir = os.path.join(self.directory, "blobs")
+        os.makedirs(self.blob_dir, exist_ok=True)
+
+        self._lock = threading.Lock()
+        self._conn = sqlite3.connect(os.path.join(self.directory, "index.sqlite3"), check_same_thread=False)
+        self._conn.execute("PRAGMA journal_mode=WAL")
+        self._conn.execute("PRAGMA synchronous=NORMAL")
+        self._conn.execute(
+            "CREATE TABLE IF NOT EXISTS urls ("
+            " url TEXT PRIMARY KEY,"
+            " digest TEXT NOT NULL,"
+            " etag TEXT,"
+            " last_modified TEXT,"
+            " validated_at REAL NOT NULL)"
+        )
+        self._conn.execute(
+            "CREATE TABLE IF NOT EXISTS blobs ("
+            " digest TEXT PRIMARY KEY,"
+            " size INTEGER NOT NULL,"
+            " last_access REAL NOT NULL)"
+        )
+        self._conn.execute("CREATE INDEX IF NOT EXISTS blobs_last_access ON blobs (last_access)")
+        self._conn.commit()
+        self.total_bytes = self._conn.execute("SELECT COALESCE(SUM(size), 0) FROM blobs").fetchone()[0]
+
+    def _blob_path(self, digest):
+        return os.path.join(self.blob_dir, digest[:2], digest + ".jpg")
+
+    def lookup(self, url):
+        """Return {"data", "etag", "last_modified", "fresh"} for url, or None."""
+        with self._lock:
+            row = self._conn.execute(
+                "SELECT digest, etag, last_modified, validated_at FROM urls WHERE url = ?", (url,)
+            ).fetchone()
+            if row is None:
+                return None
+            digest, etag, last_modified, validated_at = row
+            try:
+                with open(self._blob_path(digest), "rb") as f:
+                    data = f.read()
+            except OSError:
+                self._conn.execute("DELETE FROM urls WHERE url = ?", (url,))
+                self._forget_blob(digest)
+                self._conn.commit()
+                return None
+            self._conn.execute("UPDATE blobs SET last_access = ? WHERE digest = ?", (time.time(), digest))
+            self._conn.commit()
+        return {
+            "data": data,
+            "etag": etag,
+            "last_modified": last_modified,
+            "fresh": time.time() - validated_at <= self.ttl,
+        }
+
+    @staticmethod
+    def validators(entry):
+        """Conditional request headers for a stale entry returned by lookup()."""
+        headers = {}
+        if entry:
+            if entry["etag"]:
+                headers["If-None-Match"] = entry["etag"]
+            if entry["last_modified"]:
+                headers["If-Modified-Since"] = entry["last_modified"]
+        return headers
+
+    def mark_revalidated(self, url):
+        """Record a 304 Not Modified answer for url."""
+        with self._lock:
+            self._conn.execute("UPDATE urls SET validated_at = ? WHERE url = ?", (time.time(), url))
+            self._conn.commit()
+
+    def store(self, url, data, etag=None, last_modified=None):
+        digest = hashlib.sha256(data).hexdigest()
+        path = self._blob_path(digest)
+        now = time.time()
+        with self._lock:
+            known = self._conn.execute("SELECT 1 FROM blobs WHERE digest = ?", (digest,)).fetchone()
+            if known is None or not os.path.exists(path):
+                os.makedirs(os.path.dirname(path), exist_ok=True)
+                tmp_path = f"{path}.{threading.get_ident()}.tmp"
+                with open(tmp_path, "wb") as f:
+                    f.write(data)
+                os.replace(tmp_path, path)
+                if known is None:
+                    self.total_bytes += len(data)
+            self._conn.execute(
+                "INSERT INTO blobs (digest, size, last_access) VALUES (?, ?, ?)"
+                " ON CONFLICT(digest) DO UPDATE SET last_access = excluded.last_access",
+                (digest, len(data), now)
+            )
+            previous = self._conn.execute("SELECT digest FROM urls WHERE url = ?", (url,)).fetchone()
+            self._conn.execute(
+                "INSERT OR REPLACE INTO urls (url, digest, etag, last_modified, validated_at)"
+                " VALUES (?, ?, ?, ?, ?)",
+                (url, digest, etag, last_modified, now)
+            )
+            if previous and previous[0] != digest:
+                self._drop_if_unreferenced(previous[0])
+            self._evict()
+            self._conn.commit()
+
+    def _drop_if_unreferenced(self, digest):
+        if self._conn.execute("SELECT 1 FROM urls WHERE digest = ? LIMIT 1", (digest,)).fetchone() is None:
+            self._forget_blob(digest)
+
+    def _forget_blob(self, digest):
+        row = self._conn.execute("SELECT size FROM blobs WHERE digest = ?", (digest,)).fetchone()
+        if row is None:
+            return
+        self._conn.execute("DELETE FROM blobs WHERE digest = ?", (digest,))
+        self.total_bytes -= row[0]
+        try:
+            os.remove(self._blob_path(digest))
+        except OSError:
+            pass
+
+    def _evict(self):
+        if self.total_bytes <= self.max_bytes:
+            return
+        # Trim a little below the cap so eviction does not run on every store
+        target = int(self.max_bytes * 0.9)
+        for digest, size in self._conn.execute(
+                "SELECT digest, size FROM blobs ORDER BY last_access").fetchall():
+            if self.total_bytes <= target:
+                break
+            self._conn.execute("DELETE FROM urls WHERE digest = ?", (digest,))
+            self._forget_blob(digest)
+
+    def close(self):
+        with self._lock:
+            self._conn.close()
@@ -1,58 +1,107 @@
-import requests
-from bs4 import BeautifulSoup
-import re
+import threading
 from PyQt5.QtCore import QThread, pyqtSignal
-from PyQt5.QtGui import QPixmap, QImage
-from datetime import datetime
+from PyQt5.QtGui import QImage
+import instrumentation
+from fetch_engine import FetchEngine, FetchCancelled
+from load_scheduler import LoadScheduler
+from pixmap_cache import decode_thumbnail
+from video_fetcher import VideoFetcher
 
 class ThumbnailLoader(QThread):
+    """Fetches metadata and thumbnails on a pool of worker threads.
+
+    Thumbnails are emitted as decoded QImages; the GUI thread turns them
+    into pixmaps. With `thumbnail_only`, metadata is skipped, which is how
+    already loaded rows are upgraded to a larger variant.
+    """
     thumbnail_loaded = pyqtSignal(dict)
     thumbnail_failed = pyqtSignal(str)
 
-    def __init__(self, video_data):
+    def __init__(self, video_data=(), metadata_cache=None, force_refresh=False, thumbnail_cache=None, jobs=None,
+                 variant="mqdefault", thumbnail_only=False):
         super().__init__()
-        self.video_data = video_data
+        self.variant = variant
+        self.thumbnail_only = thumbnail_only
+        self.engine = FetchEngine(jobs=jobs)
+        self.fetcher = VideoFetcher(self.engine, metadata_cache, thumbnail_cache, force_refresh)
+        self.scheduler = LoadScheduler()
+        self.scheduler.add(video_data)
+        self._cancelled = threading.Event()
+
+    def add_videos(self, video_data):
+        """Queues more videos, e.g. as a folder scan finds them."""
+        self.scheduler.add(video_data)
+
+    def finish_adding(self):
+        """Lets the workers exit once the queue drains."""
+        self.scheduler.close()
+
+    def cancel(self):
+        """Stops the load; videos not yet started are skipped and in-flight
+        requests give up at their next retry or rate-limit wait."""
+        self._cancelled.set()
+        self.scheduler.clear()
+        self.engine.cancel()
+
+    def set_variant(self, variant):
+        """Thumbnail variant for loads not yet started."""
+        self.variant = variant
+
+    def set_base_order(self, ordered_ids, hidden_ids=()):
+        self.scheduler.set_base_order(ordered_ids, hidden_ids)
+
+    def boost(self, priorities):
+        self.scheduler.boost(priorities)
 
     def run(self):
-        for video in self.video_data:
-            video_id = video["video_id"]
-            try:
-                title, upload_date = self.fetch_video_info(video_id)
-                thumbnail = self.fetch_thumbnail(video_id)
-                self.thumbnail_loaded.emit({
-                    "title": title, 
-                    "video_id": video_id, 
-                    "thumbnail": thumbnail,
-                    "upload_date": upload_date
-                })
-            except Exception:
+        # Workers pull from the scheduler rather than a fixed submission
+        # order, so priority changes apply to everything not yet started.
+        workers = [threading.Thread(target=self.work, daemon=True) for _ in range(self.engine.jobs)]
+        for worker in workers:
+            worker.start()
+        for worker in workers:
+            worker.join()
+        self.engine.close()
+
+    def work(self):
+        while True:
+            video = self.scheduler.take()
+            if video is None:
+                return
+            self.load_video(video)
+
+    @instrumentation.timed("load.video")
+    def load_video(self, video):
+        video_id = video["video_id"]
+        if self._cancelled.is_set():
+            return
+        try:
+            if self.thumbnail_only:
+                title = upload_date = None
+            else:
+                title, upload_date = self.fetcher.get_video_info(video)
+            data, variant, thumbnail = self.fetch_thumbnail(video_id)
+            if self._cancelled.is_set():
+                return
+            self.thumbnail_loaded.emit({
+                "title": title, 
+                "video_id": video_id, 
+                "thumbnail": thumbnail,
+                "thumbnail_data": data,
+                "thumbnail_variant": variant,
+                "upload_date": upload_date
+            })
+        except FetchCancelled:
+            pass
+        except Exception:
+            if not self._cancelled.is_set():
+                instrumentation.count("load.failed")
                 self.thumbnail_failed.emit(video_id)
-    
-    def fetch_video_info(self, video_id):
-        response = requests.get(f"https://www.youtube.com/watch?v={video_id}", timeout=5)
-        soup = BeautifulSoup(response.text, "html.parser")
-        
-        title_tag = soup.find("title")
-        title = title_tag.text.replace(" - YouTube", "").strip() if title_tag else "Unknown Title"
-        
-        upload_date = "Unknown Date"
-        scripts = soup.find_all("script")
-        for script in scripts:
-            if script.string and '"uploadDate":' in script.string:
-                date_match = re.search(r'"uploadDate":"([^"]+)"', script.string)
-                if date_match:
-                    upload_date = date_match.group(1)
-                    try:
-                        dt = datetime.fromisoformat(upload_date)
-                        upload_date = dt.strftime('%Y-%m-%d')
-                    except ValueError:
-                        pass
-                    break
-        
-        return title, upload_date
 
     def fetch_thumbnail(self, video_id):
-        response = requests.get(f"https://img.youtube.com/vi/{video_id}/mqdefault.jpg", timeout=5)
-        image = QImage()
-        image.loadFromData(response.content)
-        return QPixmap.fromImage(image)
\ No newline at end of file
+        """(bytes, variant, QImage); the image is null if it fails to decode."""
+        data, variant = self.fetcher.fetch_thumbnail_bytes(video_id, self.variant)
+        image = decode_thumbnail(data)
+        if image is None:
+            image = QImage()
+        return data, variant, image
@@ -0,0 +1,39 @@
+from PyQt5.QtCore import Qt, QThread, pyqtSignal
+import instrumentation
+from pixmap_cache import decode_thumbnail
+
+class ThumbnailRescaler(QThread):
+    """Smooth-scales thumbnails to a new cache level off the GUI thread.
+
+    Emits QImages only; the GUI thread turns them into pixmaps, since
+    QPixmap may not be created outside it.
+    """
+    images_ready = pyqtSignal(list)
+
+    def __init__(self, jobs, level, batch_size=16):
+        """`jobs` is a list of (video_id, encoded_bytes), nearest rows first."""
+        super().__init__()
+        self.jobs = jobs
+        self.level = level
+        self.batch_size = batch_size
+        self._cancelled = False
+
+    def cancel(self):
+        self._cancelled = True
+
+    def run(self):
+        batch = []
+        for video_id, data in self.jobs:
+            if self._cancelled:
+                return
+            image = decode_thumbnail(data)
+            if image is None:
+                continue
+            with instrumentation.span("scale"):
+                image = image.scaledToWidth(self.level, Qt.SmoothTransformation)
+            batch.append((video_id, self.level, image))
+            if len(batch) >= self.batch_size:
+                self.images_ready.emit(batch)
+                batch = []
+        if batch and not self._cancelled:
+            self.images_ready.emit(batch)
@@ -0,0 +1,22 @@
+import settings
+
+# YouTube thumbnail variants and their width once cropped to 16:9
+THUMBNAIL_VARIANTS = {
+    "default": 120,
+    "mqdefault": 320,
+    "hqdefault": 480,
+    "sddefault": 640,
+    "maxresdefault": 1280,
+}
+# Only generated for some uploads; hqdefault always exists
+OPTIONAL_VARIANTS = ("sddefault", "maxresdefault")
+
+def thumbnail_variant(width):
+    """The smallest variant at least `width` device pixels wide."""
+    for variant, variant_width in THUMBNAIL_VARIANTS.items():
+        if variant_width >= width:
+            return variant
+    return "maxresdefault"
+
+def thumbnail_url(video_id, variant="mqdefault"):
+    return f"{settings.THUMBNAIL_BASE_URL}/vi/{video_id}/{variant}.jpg"
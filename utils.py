@@ -1,12 +1,75 @@
 import os
 import re
 
-def load_subtitle_files(folder_path):
+SRT_PATTERN = re.compile(r"\[([a-zA-Z0-9_-]{11})\]\.srt$")
+SIDECAR_PATTERN = re.compile(r"\[([a-zA-Z0-9_-]{11})\](?:\.[\w-]+)?\.info\.json$")
+
+def list_subtitle_directory(directory):
+    """Video records for the SRT files directly in `directory`, plus the
+    paths of its subdirectories. Sidecars are matched within the directory."""
+    srt_entries = []
+    sidecars = {}
+    subdirectories = []
+    with os.scandir(directory) as entries:
+        for entry in entries:
+            name = entry.name
+            if name.endswith(".srt"):
+                match = SRT_PATTERN.search(name)
+                if match:
+                    srt_entries.append((entry, match))
+            elif name.endswith(".json"):
+                match = SIDECAR_PATTERN.search(name)
+                if match:
+                    sidecars[match.group(1)] = entry.path
+            elif entry.is_dir(follow_symlinks=False):
+                subdirectories.append(entry.path)
+
+    records = []
+    for entry, match in srt_entries:
+        try:
+            mtime = entry.stat().st_mtime
+        except OSError:
+            continue
+        video_id = match.group(1)
+        records.append({
+            "title": "Loading...",
+            "video_id": video_id,
+            "path": entry.path,
+            "directory": directory,
+            "mtime": mtime,
+            "filename_title": entry.name[:match.start()].strip(),
+            "sidecar_path": sidecars.get(video_id),
+        })
+    return records, subdirectories
+
+def scan_subtitle_files(folder_path, recursive=False, batch_size=500, visited=None):
+    """Yield lists of video records for the SRT files under folder_path.
+
+    Built on os.scandir so callers can start working after the first batch
+    instead of waiting for the whole tree. Every directory listed is
+    appended to `visited` when a list is given.
+    """
+    pending = [folder_path]
+    batch = []
+    while pending:
+        directory = pending.pop()
+        try:
+            records, subdirectories = list_subtitle_directory(directory)
+        except OSError as e:
+            print(f"Error scanning {directory}: {e}")
+            continue
+        if visited is not None:
+            visited.append(directory)
+        if recursive:
+            pending.extend(subdirectories)
+        for record in records:
+            batch.append(record)
+            if len(batch) >= batch_size:
+                yield batch
+                batch = []
+    if batch:
+        yield batch
+
+def load_subtitle_files(folder_path, recursive=False):
     """Extract YouTube video IDs from SRT files in a folder"""
-    video_data = []
-    for file in os.listdir(folder_path):
-        if file.endswith(".srt"):
-            match = re.search(r"\[([a-zA-Z0-9_-]{11})\]\.srt$", file)
-            if match:
-                video_data.append({"title": "Loading...", "video_id": match.group(1)})
-    return video_data
\ No newline at end of file
+    return [video for batch in scan_subtitle_files(folder_path, recursive) for video in batch]
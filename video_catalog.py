@@ -0,0 +1,175 @@
+import re
+import sys
+from array import array
+from datetime import date
+from stat_fields import STAT_FIELDS
+from thumbnail_variants import THUMBNAIL_VARIANTS
+
+# Status codes stored in the status column
+LOADING, LOADED, FAILED, REMOVED = range(4)
+STATUS_NAMES = ("loading", "loaded", "failed", "removed")
+
+# Thumbnail variants stored in the variant column, smallest first
+VARIANTS = tuple(THUMBNAIL_VARIANTS)
+NO_VARIANT = -1
+
+UNKNOWN_DATE = "Unknown Date"
+
+def day_of(upload_date):
+    """Day ordinal of an ISO upload date; 0 when unknown."""
+    if not upload_date:
+        return 0
+    try:
+        return date.fromisoformat(upload_date[:10]).toordinal()
+    except ValueError:
+        return 0
+
+class StringTable:
+    """Strings packed as UTF-8 into one buffer, referenced by index.
+
+    Only strings added with `shared=True` (the "Loading..." placeholder)
+    are deduplicated; a replaced string's bytes stay in the buffer.
+    """
+
+    def __init__(self):
+        self.data = bytearray()
+        self.offsets = array("Q")
+        self.shared = {}
+
+    def __len__(self):
+        return len(self.offsets)
+
+    def add(self, text, shared=False):
+        if shared and text in self.shared:
+            return self.shared[text]
+        ref = len(self.offsets)
+        self.offsets.append(len(self.data))
+        self.data += text.encode("utf-8")
+        if shared:
+            self.shared[text] = ref
+        return ref
+
+    def __getitem__(self, ref):
+        end = self.offsets[ref + 1] if ref + 1 < len(self.offsets) else len(self.data)
+        return self.data[self.offsets[ref]:end].decode("utf-8")
+
+class VideoCatalog:
+    """Every video of the library, one column per field, indexed by position.
+
+    Video IDs are interned, titles go through a string table, and the date,
+    status, title length and thumbnail variant are typed arrays, so a video
+    costs a few bytes per column instead of a dict. Positions are never
+    reused: a removed video keeps its slot with status REMOVED.
+    """
+
+    def __init__(self):
+        self.clear()
+
+    def clear(self):
+        if getattr(self, "atlas", None) is not None:
+            self.atlas.close()
+        # Restored from a session snapshot: tile index per position, or -1
+        self.atlas = None
+        self.tiles = array("i")
+        self.ids = []
+        self.paths = []
+        self.position_of = {}
+        self.titles = StringTable()
+        self.title_refs = array("I")
+        self.title_lengths = array("H")
+        self.days = array("i")
+        self.status = array("B")
+        self.variants = array("b")
+        self.thumbnails = []
+        # Subtitle statistics, one column per STAT_FIELDS entry; they are
+        # zero until `analyzed` is set for the position
+        self.analyzed = array("B")
+        self.stats = {field: array("f" if field == "lines_per_minute" else "I") for field in STAT_FIELDS}
+        self.status_counts = [0] * len(STATUS_NAMES)
+
+    def __len__(self):
+        return len(self.ids)
+
+    def append(self, video_data):
+        """Adds scanner records with status LOADING; returns the first new position."""
+        start = len(self.ids)
+        for video in video_data:
+            video_id = sys.intern(video["video_id"])
+            self.position_of[video_id] = len(self.ids)
+            self.ids.append(video_id)
+            self.paths.append(video.get("path"))
+            self.title_refs.append(self.titles.add(video["title"], shared=True))
+            self.title_lengths.append(min(len(video["title"]), 0xFFFF))
+            self.days.append(0)
+            self.status.append(LOADING)
+            self.variants.append(NO_VARIANT)
+            self.thumbnails.append(None)
+            self.tiles.append(-1)
+            self.analyzed.append(0)
+            for column in self.stats.values():
+                column.append(0)
+        self.status_counts[LOADING] += len(self.ids) - start
+        return start
+
+    def title(self, position):
+        return self.titles[self.title_refs[position]]
+
+    def set_title(self, position, title):
+        self.title_refs[position] = self.titles.add(title)
+        self.title_lengths[position] = min(len(title), 0xFFFF)
+
+    def upload_date(self, position):
+        """ISO date, UNKNOWN_DATE, or None while the video is still loading."""
+        if self.status[position] != LOADED:
+            return None
+        day = self.days[position]
+        return date.fromordinal(day).isoformat() if day else UNKNOWN_DATE
+
+    def set_upload_date(self, position, upload_date):
+        self.days[position] = day_of(upload_date)
+
+    def variant(self, position):
+        code = self.variants[position]
+        return None if code == NO_VARIANT else VARIANTS[code]
+
+    def set_thumbnail(self, position, data, variant):
+        self.thumbnails[position] = data
+        self.variants[position] = VARIANTS.index(variant)
+
+    def tile(self, position):
+        """The session atlas tile of the video as a QImage, or None."""
+        index = self.tiles[position]
+        return None if index < 0 or self.atlas is None else self.atlas.image(index)
+
+    def set_stats(self, position, stats):
+        """Stores a tuple in STAT_FIELDS order from the analyzer."""
+        for field, value in zip(STAT_FIELDS, stats):
+            self.stats[field][position] = value
+        self.analyzed[position] = 1
+
+    def stats_of(self, position):
+        """The video's statistics as a dict, or None until analyzed."""
+        if not self.analyzed[position]:
+            return None
+        return {field: self.stats[field][position] for field in STAT_FIELDS}
+
+    def set_status(self, position, status):
+        self.status_counts[self.status[position]] -= 1
+        self.status_counts[status] += 1
+        self.status[position] = status
+
+    def count(self, status):
+        return self.status_counts[status]
+
+    def with_status(self, status):
+        """Positions with `status`, found by scanning the status column as bytes."""
+        return [m.start() for m in re.finditer(re.escape(bytes([status])), memoryview(self.status))]
+
+    def remove(self, video_id):
+        """Marks the video removed and frees its thumbnail; returns its position."""
+        position = self.position_of.pop(video_id, None)
+        if position is None:
+            return None
+        self.set_status(position, REMOVED)
+        self.thumbnails[position] = None
+        return position
@@ -0,0 +1,85 @@
+import requests
+
+import instrumentation
+from metadata_cache import STATUS_MISSING
+from metadata_providers import ProviderChain, VideoUnavailableError, create_providers
+from thumbnail_variants import OPTIONAL_VARIANTS, thumbnail_url
+
+class VideoFetcher:
+    """Fetches titles, upload dates and thumbnail bytes through the caches.
+
+    Holds no Qt objects, so it can be driven from any worker thread.
+    Metadata comes from an ordered provider chain; pass `providers` to
+    replace the default one (e.g. with a local fake).
+    """
+
+    def __init__(self, engine, metadata_cache=None, thumbnail_cache=None, force_refresh=False,
+                 providers=None):
+        self.engine = engine
+        self.chain = ProviderChain(create_providers(engine) if providers is None else providers)
+        self.metadata_cache = metadata_cache
+        self.thumbnail_cache = thumbnail_cache
+        self.force_refresh = force_refresh
+
+    def get_video_info(self, video):
+        """Title and upload date, served from the metadata cache when fresh."""
+        video_id = video["video_id"]
+        if self.metadata_cache is None:
+            return self.fetch_video_info(video)
+
+        if not self.force_refresh:
+            with instrumentation.span("cache.metadata"):
+                cached = self.metadata_cache.get(video_id)
+            if cached is not None:
+                instrumentation.count("metadata_cache.hit")
+                if cached["status"] == STATUS_MISSING:
+                    raise VideoUnavailableError(video_id)
+                return cached["title"], cached["upload_date"]
+            instrumentation.count("metadata_cache.miss")
+
+        try:
+            title, upload_date = self.fetch_video_info(video)
+        except VideoUnavailableError:
+            self.metadata_cache.put_missing(video_id)
+            raise
+        self.metadata_cache.put(video_id, title, upload_date)
+        return title, upload_date
+    
+    def fetch_video_info(self, video):
+        return self.chain.resolve(video)
+
+    def fetch_thumbnail_bytes(self, video_id, variant="mqdefault"):
+        """(bytes, variant) of the thumbnail, falling back to hqdefault when
+        a high-resolution variant does not exist for this video."""
+        try:
+            return self.fetch_cached_bytes(thumbnail_url(video_id, variant)), variant
+        except requests.HTTPError as e:
+            if variant not in OPTIONAL_VARIANTS or e.response is None or e.response.status_code != 404:
+                raise
+        return self.fetch_cached_bytes(thumbnail_url(video_id, "hqdefault")), "hqdefault"
+
+    def fetch_cached_bytes(self, url):
+        """Raw bytes, from the disk cache when fresh or still valid (304)."""
+        if self.thumbnail_cache is None:
+            response = self.engine.get(url)
+            response.raise_for_status()
+            return response.content
+
+        with instrumentation.span("cache.thumbnail"):
+            entry = self.thumbnail_cache.lookup(url)
+        if entry and entry["fresh"] and not self.force_refresh:
+            instrumentation.count("thumbnail_cache.hit")
+            return entry["data"]
+
+        response = self.engine.get(url, headers=self.thumbnail_cache.validators(entry))
+        if response.status_code == 304 and entry:
+            instrumentation.count("thumbnail_cache.revalidated")
+            self.thumbnail_cache.mark_revalidated(url)
+            return entry["data"]
+        instrumentation.count("thumbnail_cache.stale" if entry else "thumbnail_cache.miss")
+        response.raise_for_status()
+        self.thumbnail_cache.store(
+            url, response.content,
+            response.headers.get("ETag"), response.headers.get("Last-Modified")
+        )
+        return response.content
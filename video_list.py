@@ -0,0 +1,200 @@
+from PyQt5.QtWidgets import QStyledItemDelegate
+from PyQt5.QtGui import QColor, QPainter
+from PyQt5.QtCore import Qt, QAbstractListModel, QModelIndex, QRect, QSize, QEvent
+
+from video_catalog import VideoCatalog
+
+VIDEO_ROLE = Qt.UserRole + 1
+
+class VideoListModel(QAbstractListModel):
+    """Shows the videos of a VideoCatalog; the view only asks for the rows
+    it is about to paint.
+
+    `rows` maps view rows to catalog positions and is replaced wholesale
+    when sorting or filtering. VIDEO_ROLE yields the position.
+    """
+
+    def __init__(self, catalog=None, parent=None):
+        super().__init__(parent)
+        self.catalog = VideoCatalog() if catalog is None else catalog
+        self.rows = []
+        self._row_of = None
+
+    def rowCount(self, parent=QModelIndex()):
+        return 0 if parent.isValid() else len(self.rows)
+
+    def data(self, index, role=Qt.DisplayRole):
+        if not index.isValid():
+            return None
+        position = self.rows[index.row()]
+        if role == Qt.DisplayRole:
+            return self.catalog.title(position)
+        if role == VIDEO_ROLE:
+            return position
+        return None
+
+    def set_videos(self, video_data):
+        self.beginResetModel()
+        self.catalog.clear()
+        self.catalog.append(video_data)
+        self.rows = list(range(len(self.catalog)))
+        self._row_of = None
+        self.endResetModel()
+
+    def append_videos(self, video_data, show=True):
+        """Adds videos after the existing ones; `show` also appends their rows."""
+        video_data = list(video_data)
+        if show:
+            self.beginInsertRows(QModelIndex(), len(self.rows), len(self.rows) + len(video_data) - 1)
+        start = self.catalog.append(video_data)
+        if show:
+            self.rows.extend(range(start, len(self.catalog)))
+            self._row_of = None
+            self.endInsertRows()
+        return start
+
+    def insert_row(self, row, position):
+        """Shows the video at `position` as view row `row`."""
+        self.beginInsertRows(QModelIndex(), row, row)
+        self.rows.insert(row, position)
+        self._row_of = None
+        self.endInsertRows()
+
+    def remove_video(self, video_id):
+        """Forgets a video. Its catalog slot is kept (marked REMOVED)
+        so the positions of every other video stay valid."""
+        position = self.catalog.remove(video_id)
+        if position is None:
+            return None
+        self.hide_row(position)
+        return position
+
+    def hide_row(self, position):
+        """Removes the view row showing `position`; False if it had none."""
+        row = self.row_of.get(position)
+        if row is None:
+            return False
+        self.beginRemoveRows(QModelIndex(), row, row)
+        del self.rows[row]
+        self._row_of = None
+        self.endRemoveRows()
+        return True
+
+    def set_rows(self, rows):
+        """Shows the given catalog positions, in that order."""
+        self.beginResetModel()
+        self.rows = list(rows)
+        self._row_of = None
+        self.endResetModel()
+
+    @property
+    def row_of(self):
+        """position -> view row, built on first use after each reordering."""
+        if self._row_of is None:
+            self._row_of = {position: row for row, position in enumerate(self.rows)}
+        return self._row_of
+
+    def position(self, video_id):
+        """Catalog position of a live video, or None."""
+        return self.catalog.position_of.get(video_id)
+
+    def video_changed(self, video_id):
+        row = self.row_of.get(self.position(video_id))
+        if row is not None:
+            index = self.index(row)
+            self.dataChanged.emit(index, index)
+
+class VideoItemDelegate(QStyledItemDelegate):
+    """Paints one row: wrapped title on the left, link button and thumbnail
+    on the right, centred in the viewport like the old widget layout."""
+
+    SPACING = 12
+    MARGIN = 9
+    LINK_SIZE = 24
+
+    def __init__(self, font, pixmap_cache, parent=None):
+        super().__init__(parent)
+        self.font = font
+        self.pixmap_cache = pixmap_cache
+        # Set while the thumbnail size is being dragged: paint whatever level
+        # is cached with a cheap transform instead of decoding and smoothing
+        self.fast = False
+        self.thumbnail_size = (320, 180)
+        self.placeholder_color = QColor(Qt.gray)
+        self.hovered_link = None
+
+    def set_thumbnail_size(self, size):
+        self.thumbnail_size = size
+
+    def title_width(self):
+        return int(self.thumbnail_size[0] * 1.1)
+
+    def sizeHint(self, option, index):
+        width = self.title_width() + self.thumbnail_size[0] + self.SPACING + 2 * self.MARGIN
+        height = self.thumbnail_size[1] + self.LINK_SIZE + self.SPACING + 2 * self.MARGIN
+        return QSize(width, height)
+
+    def layout(self, rect):
+        """(title_rect, link_rect, thumbnail_rect) for an item rect."""
+        thumb_w, thumb_h = self.thumbnail_size
+        content_w = self.title_width() + self.SPACING + thumb_w
+        left = rect.left() + max(self.MARGIN, (rect.width() - content_w) // 2)
+        top = rect.top() + self.MARGIN
+        height = rect.height() - 2 * self.MARGIN
+
+        title_rect = QRect(left, top, self.title_width(), height)
+        thumb_left = left + self.title_width() + self.SPACING
+        link_rect = QRect(thumb_left + (thumb_w - self.LINK_SIZE) // 2, top, self.LINK_SIZE, self.LINK_SIZE)
+        thumbnail_rect = QRect(thumb_left, top + self.LINK_SIZE + self.SPACING, thumb_w, thumb_h)
+        return title_rect, link_rect, thumbnail_rect
+
+    def scaled_thumbnail(self, catalog, position, device_ratio=1.0):
+        """The cached pixmap whose level covers the thumbnail width in device
+        pixels; paint() scales it down to the exact rect."""
+        return self.pixmap_cache.thumbnail(
+            catalog.ids[position], catalog.thumbnails[position], int(self.thumbnail_size[0] * device_ratio), self.fast)
+
+    def paint(self, painter, option, index):
+        catalog = index.model().catalog
+        position = index.data(VIDEO_ROLE)
+        title_rect, link_rect, thumbnail_rect = self.layout(option.rect)
+        palette = option.palette
+        painter.save()
+
+        painter.setFont(self.font)
+        painter.setPen(palette.color(palette.Text))
+        painter.drawText(title_rect, Qt.AlignLeft | Qt.AlignVCenter | Qt.TextWordWrap, catalog.title(position))
+
+        hovered = catalog.ids[position] == self.hovered_link
+        painter.setPen(QColor(150, 150, 150, 204) if hovered else QColor(180, 180, 180, 153))
+        painter.setBrush(QColor(225, 225, 225, 230) if hovered else QColor(240, 240, 240, 204))
+        painter.drawRoundedRect(link_rect.adjusted(0, 0, -1, -1), 8, 8)
+        painter.setPen(palette.color(palette.Text))
+        painter.drawText(link_rect, Qt.AlignCenter, "🔗")
+
+        # Until its bytes are loaded, a restored video paints its session tile
+        pixmap = self.scaled_thumbnail(catalog, position, painter.device().devicePixelRatioF())
+        image = catalog.tile(position) if pixmap is None else pixmap
+        if image is None:
+            painter.fillRect(thumbnail_rect, self.placeholder_color)
+        else:
+            size = image.size().scaled(thumbnail_rect.size(), Qt.KeepAspectRatio)
+            target = QRect(0, 0, size.width(), size.height())
+            target.moveCenter(thumbnail_rect.center())
+            painter.setRenderHint(QPainter.SmoothPixmapTransform, not self.fast)
+            if pixmap is None:
+                painter.drawImage(target, image)
+            else:
+                painter.drawPixmap(target, pixmap)
+
+        painter.restore()
+
+    def editorEvent(self, event, model, option, index):
+        if event.type() == QEvent.MouseButtonRelease and event.button() == Qt.LeftButton:
+            _, link_rect, _ = self.layout(option.rect)
+            if link_rect.contains(event.pos()):
+                video_id = model.catalog.ids[index.data(VIDEO_ROLE)]
+                import webbrowser
+                webbrowser.open(f"https://www.youtube.com/watch?v={video_id}")
+                return True
+        return super().editorEvent(event, model, option, index)
@@ -0,0 +1,81 @@
+import html
+import re
+from datetime import datetime
+
+CHUNK_SIZE = 16 * 1024
+# Bytes kept between chunks so a marker split across two chunks is still found
+OVERLAP = 64
+# A <title> longer than this is treated as malformed rather than buffered forever
+MAX_FIELD = 8 * 1024
+
+TITLE_RE = re.compile(rb"<title[^>]*>(.*?)</title>", re.I | re.S)
+# Markers are located with bytes.find, which is far cheaper than letting a
+# regex try every offset of a megabyte page; the regexes only run at hits.
+UPLOAD_DATE_MARKER = b'uploadDate"'
+UPLOAD_DATE_RE = re.compile(rb'"uploadDate":"([^"]+)"|itemprop="uploadDate"\s+content="([^"]+)"')
+
+def normalize_upload_date(value):
+    try:
+        return datetime.fromisoformat(value).strftime('%Y-%m-%d')
+    except ValueError:
+        return value
+
+def scan_watch_page(chunks):
+    """Pull the title and upload date out of a watch page streamed as chunks.
+
+    Scans incrementally without building a DOM and stops consuming `chunks`
+    as soon as both fields are found. Returns (title, upload_date, bytes_read);
+    fields that never show up come back as None.
+    """
+    title = None
+    upload_date = None
+    buffer = b""
+    bytes_read = 0
+
+    for chunk in chunks:
+        if not chunk:
+            continue
+        bytes_read += len(chunk)
+        buffer += chunk
+        keep_from = max(0, len(buffer) - OVERLAP)
+
+        if title is None:
+            start = buffer.find(b"<title")
+            if start == -1:
+                start = buffer.find(b"<TITLE")
+            if start != -1:
+                match = TITLE_RE.match(buffer, start)
+                if match:
+                    raw = match.group(1).decode("utf-8", errors="replace")
+                    title = html.unescape(raw).replace(" - YouTube", "").strip()
+                elif len(buffer) - start < MAX_FIELD:
+                    keep_from = min(keep_from, start)
+
+        if upload_date is None:
+            position = buffer.find(UPLOAD_DATE_MARKER)
+            while position != -1:
+                # Back up to the start of either form of the marker
+                match_start = max(0, position - len('itemprop="'))
+                match = UPLOAD_DATE_RE.search(buffer, match_start, position + MAX_FIELD)
+                if match:
+                    raw = (match.group(1) or match.group(2)).decode("utf-8", errors="replace")
+                    upload_date = normalize_upload_date(raw)
+                    break
+                if len(buffer) - position < MAX_FIELD:
+                    keep_from = min(keep_from, match_start)
+                    break
+                position = buffer.find(UPLOAD_DATE_MARKER, position + 1)
+
+        if title is not None and upload_date is not None:
+            break
+        buffer = buffer[keep_from:]
+
+    return title, upload_date, bytes_read
+
+def fetch_watch_metadata(response):
+    """Streams a `requests` response (opened with stream=True) through
+    scan_watch_page and closes it as soon as the fields are known."""
+    try:
+        return scan_watch_page(response.iter_content(CHUNK_SIZE))
+    finally:
+        response.close()